@@ -1,99 +1,412 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional
-import asyncio # Library.add_book metodu async olduğu için gerekli
-
-# classes.py dosyasından Library ve Book sınıflarını içe aktarıyoruz.
-# Bu, kütüphane mantığını API katmanında yeniden kullanmamızı sağlar.
-from classes import Library, Book
-
-# FastAPI uygulamasını başlatır. Meta verileri (başlık, açıklama, sürüm) ayarlanır.
-app = FastAPI(
-    title="Kütüphane Yönetim API'si",
-    description="Kitap ekleme, listeleme, silme ve arama işlemleri için RESTful API.",
-    version="1.0.0"
-)
-
-# Library sınıfının bir örneğini oluştururuz.
-# Bu örnek, API'nin arka planda kitapları yönetmek için kullanacağı kütüphane nesnesidir.
-# 'library.json' dosyasını kullanarak kitap verilerini kalıcı hale getirir.
-library = Library()
-
-# Pydantic modeli: API'den alınacak ISBN verisini tanımlar.
-# Bu model, POST /books isteği için giriş verisinin yapısını doğrular.
-class ISBNInput(BaseModel):
-    """
-    POST /books isteği için ISBN giriş modeli.
-    isbn: Eklenecek kitabın ISBN numarası (ör: "978-0321765723").
-    """
-    isbn: str
-
-# Pydantic modeli: API'nin döndüreceği Book verisini tanımlar.
-# Bu model, Book nesnelerinin JSON'a nasıl dönüştürüleceğini tanımlar.
-class BookOutput(BaseModel):
-    """
-    API yanıtlarında kullanılacak kitap modeli.
-    """
-    title: str
-    author: str
-    isbn: str
-
-    class Config:
-        # FastAPI'nin Book sınıfının Pydantic modeli olarak kabul edilmesini sağlar.
-        # Bu sayede Book nesneleri doğrudan döndürülebilir ve JSON'a dönüştürülebilir.
-        from_attributes = True
-
-# GET /books endpoint'i
-@app.get("/books", response_model=List[BookOutput], summary="Tüm kitapları listele")
-async def get_all_books():
-    """
-    Kütüphanedeki tüm kitapların listesini JSON formatında döndürür.
-    """
-    # Library sınıfındaki 'books' özelliğini kullanarak tüm kitapları alır.
-    return library.books
-
-# POST /books endpoint'i
-@app.post("/books", response_model=BookOutput, status_code=201, summary="Yeni kitap ekle")
-async def add_new_book(isbn_input: ISBNInput):  # Endpoint adı add_new_book olarak düzeltildi
-    """
-    Yeni bir kitabı kütüphaneye ekler.
-    Open Library API'den ISBN numarasına göre kitap bilgilerini çeker (Aşama 2 mantığı).
-    """
-    try:
-        new_book = await library.add_book_from_api(isbn_input.isbn.strip())
-    except Exception as e:
-        # Ağ hatası, API hatası gibi beklenmedik durumlarda
-        raise HTTPException(
-            status_code=400,
-            detail=f"Kitap eklenemedi veya ISBN '{isbn_input.isbn}' ile kitap bulunamadı. Hata: {str(e)}"
-        )
-
-    if new_book is None:
-        # API kitap bulamadıysa veya duplicate ISBN varsa
-        raise HTTPException(
-            status_code=400,
-            detail=f"Kitap eklenemedi veya ISBN '{isbn_input.isbn}' ile kitap bulunamadı."
-        )
-
-    return new_book.to_dict()
-
-# DELETE /books/{isbn} endpoint'i
-@app.delete("/books/{isbn}", status_code=204, summary="Kitap sil")
-async def remove_book(isbn: str):
-    """
-    Belirtilen ISBN numarasına sahip kitabı kütüphaneden siler.
-    
-    Args:
-        isbn (str): Silinecek kitabın ISBN numarası.
-    
-    Raises:
-        HTTPException: Belirtilen ISBN ile kitap bulunamazsa (404 Not Found).
-    """
-    # Library sınıfındaki 'remove_book' metodunu çağırırız.
-    # Bu metod silme işleminin başarılı olup olmadığını kontrol eder.
-    if not library.remove_book(isbn.strip()):
-        # Eğer kitap bulunamazsa 'remove_book' False döndürür.
-        raise HTTPException(status_code=404, detail=f"ISBN '{isbn}' numaralı kitap kütüphanede bulunamadı.")
-    
-    return
-
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+import asyncio # Library.add_book metodu async olduğu için gerekli
+import json
+import math
+
+# classes.py dosyasından Library ve Book sınıflarını içe aktarıyoruz.
+# Bu, kütüphane mantığını API katmanında yeniden kullanmamızı sağlar.
+from classes import Library, Book
+from changes import Change
+from isbn import normalize_isbn
+from jobs import ImportJobQueue
+from openlibrary import CircuitOpenError
+
+# Library sınıfının bir örneğini oluştururuz.
+# Bu örnek, API'nin arka planda kitapları yönetmek için kullanacağı kütüphane nesnesidir.
+# 'library.json' dosyasını kullanarak kitap verilerini kalıcı hale getirir.
+library = Library()
+
+# Arka plan içe aktarma kuyruğu. İşler veri dosyasının yanındaki 'library.json.jobs.jsonl'
+# günlüğünde saklanır; sunucu yeniden başlatıldığında bekleyen ve yarıda kalan işler
+# kaldığı yerden devam eder.
+import_queue = ImportJobQueue(library)
+
+# Canlı değişiklik akışında, bağlantının açık kaldığını bildiren yorum satırının aralığı (saniye).
+# Yeni değişiklik olmasa da proxy'lerin boşta kalan bağlantıyı kapatmasını önler.
+SSE_HEARTBEAT = 15.0
+# POST /books/batch isteğinde kabul edilen en fazla işlem sayısı.
+MAX_BATCH_OPERATIONS = 10000
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Sunucu açılırken arama dizinini kurar ve içe aktarma işçilerini başlatır,
+    kapanırken işçileri durdurur.
+    """
+    library.build_search_index()
+    await import_queue.start()
+    yield
+    await import_queue.stop()
+
+# FastAPI uygulamasını başlatır. Meta verileri (başlık, açıklama, sürüm) ayarlanır.
+app = FastAPI(
+    title="Kütüphane Yönetim API'si",
+    description="Kitap ekleme, listeleme, silme ve arama işlemleri için RESTful API.",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Pydantic modeli: API'den alınacak ISBN verisini tanımlar.
+# Bu model, POST /books isteği için giriş verisinin yapısını doğrular.
+class ISBNInput(BaseModel):
+    """
+    POST /books isteği için ISBN giriş modeli.
+    isbn: Eklenecek kitabın ISBN-10 veya ISBN-13 numarası (ör: "978-0321765723").
+    """
+    isbn: str
+
+# Pydantic modeli: toplu işlemdeki tek bir ekleme veya silme işlemini tanımlar.
+class BatchOperation(BaseModel):
+    """
+    op: "add" (title, author ve isbn gerekli) veya "remove" (yalnızca isbn).
+    """
+    op: Literal["add", "remove"]
+    isbn: str
+    title: Optional[str] = None
+    author: Optional[str] = None
+
+# Pydantic modeli: POST /books/batch isteğini tanımlar.
+class BatchInput(BaseModel):
+    """operations: Sırayla uygulanacak işlemler (1-10000)."""
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+# Pydantic modeli: toplu işlemdeki tek bir işlemin sonucunu tanımlar.
+class BatchItemResult(BaseModel):
+    """
+    index: İşlemin istekteki sırası (0'dan başlar).
+    status: "ok" veya "error"; hata varsa error alanı nedeni açıklar.
+    """
+    index: int
+    op: str
+    isbn: str
+    status: str
+    error: Optional[str] = None
+
+# Pydantic modeli: POST /books/batch yanıtını tanımlar.
+class BatchOutput(BaseModel):
+    """applied: İşlemler uygulandıysa True; herhangi biri geçersizse hiçbiri uygulanmaz ve False."""
+    applied: bool
+    results: List[BatchItemResult]
+
+# Pydantic modeli: API'nin döndüreceği Book verisini tanımlar.
+# Bu model, Book nesnelerinin JSON'a nasıl dönüştürüleceğini tanımlar.
+class BookOutput(BaseModel):
+    """
+    API yanıtlarında kullanılacak kitap modeli.
+    """
+    title: str
+    author: str
+    isbn: str
+
+    class Config:
+        # FastAPI'nin Book sınıfının Pydantic modeli olarak kabul edilmesini sağlar.
+        # Bu sayede Book nesneleri doğrudan döndürülebilir ve JSON'a dönüştürülebilir.
+        from_attributes = True
+
+# Pydantic modeli: arama sonuçlarında döndürülecek kitap verisini tanımlar.
+class SearchResultOutput(BookOutput):
+    """
+    Arama sonuçlarında kullanılacak kitap modeli.
+    score: Bulanık aramada sorguya benzerlik puanı (0-1); tam eşleşme aramasında boştur.
+    """
+    score: Optional[float] = None
+
+# Pydantic modeli: arka plan içe aktarma işinin durumunu tanımlar.
+class JobOutput(BaseModel):
+    """
+    GET /jobs/{job_id} ve arka planda POST /books yanıtlarında kullanılacak iş modeli.
+    status: queued, running, succeeded veya failed.
+    position: Bekleyen işin kuyruktaki sırası (yalnızca queued durumunda).
+    book: İş başarıyla tamamlandıysa eklenen kitap.
+    """
+    id: str
+    isbn: str
+    status: str
+    position: Optional[int] = None
+    attempts: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    book: Optional[BookOutput] = None
+
+# Pydantic modeli: değişiklik günlüğündeki tek bir kaydı tanımlar.
+class ChangeOutput(BaseModel):
+    """
+    GET /changes yanıtındaki değişiklik modeli.
+    op: add (book dolu), remove veya clear (isbn boş).
+    """
+    seq: int
+    op: str
+    isbn: Optional[str] = None
+    book: Optional[BookOutput] = None
+    timestamp: float
+
+# Pydantic modeli: GET /changes yanıtını tanımlar.
+class ChangesOutput(BaseModel):
+    """
+    last_seq: Günlükteki son değişikliğin sıra numarası. changes listesi limit nedeniyle
+    kısaldıysa istemci son aldığı değişikliğin seq değeriyle tekrar istek atar.
+    """
+    last_seq: int
+    changes: List[ChangeOutput]
+
+# Pydantic modeli: Open Library sorgu önbelleğinin sayaçlarını tanımlar.
+class CacheStatsOutput(BaseModel):
+    """
+    GET /openlibrary/cache yanıt modeli.
+    negative_size / negative_hits: "Bulunamadı" sonuçlarının kayıt ve isabet sayıları;
+    bu isabetlerde Open Library'ye istek gönderilmez.
+    """
+    size: int
+    negative_size: int
+    maxsize: int
+    ttl: float
+    negative_ttl: float
+    hits: int
+    negative_hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+def job_output(job) -> dict:
+    """ImportJob nesnesini, kuyruktaki sırasıyla birlikte API yanıtına dönüştürür."""
+    return {**job.to_dict(), "position": import_queue.position(job)}
+
+# GET /books endpoint'i
+@app.get("/books", response_model=List[BookOutput], summary="Tüm kitapları listele")
+async def get_all_books(response: Response):
+    """
+    Kütüphanedeki tüm kitapların listesini JSON formatında döndürür.
+    X-Change-Seq başlığı, listenin hangi değişikliğe kadar güncel olduğunu bildirir;
+    istemciler sonraki değişiklikleri GET /changes?since=<X-Change-Seq> ile alabilir.
+    Liste, kütüphanenin değişmez bir sürümünden okunur; yanıt yazılırken yapılan
+    eklemeler ve silmeler listeyi bozmaz ve başlıkla liste her zaman aynı sürüme aittir.
+    """
+    snapshot = library.snapshot()
+    response.headers["X-Change-Seq"] = str(snapshot.version)
+    return snapshot
+
+# GET /books/search endpoint'i
+@app.get("/books/search", response_model=List[SearchResultOutput], summary="Başlık veya yazara göre kitap ara")
+async def search_books(q: str, fuzzy: bool = False, limit: int = Query(10, ge=1, le=100)):
+    """
+    Başlığında veya yazar adında arama terimi geçen kitapları döndürür.
+
+    Args:
+        q (str): Arama terimi.
+        fuzzy (bool): True ise yazım hatalarına toleranslı arama yapılır ve sonuçlar benzerlik puanına göre sıralanır.
+        limit (int): Bulanık aramada döndürülecek en fazla sonuç sayısı.
+    """
+    if fuzzy:
+        return [
+            {**book.to_dict(), "score": score}
+            for book, score in library.fuzzy_search_books(q.strip(), limit=limit)
+        ]
+    return [book.to_dict() for book in library.search_books(q.strip())]
+
+# POST /books endpoint'i
+@app.post("/books", response_model=BookOutput, status_code=201, summary="Yeni kitap ekle",
+          responses={202: {"model": JobOutput, "description": "İçe aktarma işi kuyruğa alındı"}})
+async def add_new_book(isbn_input: ISBNInput, background: bool = False):  # Endpoint adı add_new_book olarak düzeltildi
+    """
+    Yeni bir kitabı kütüphaneye ekler.
+    Open Library API'den ISBN numarasına göre kitap bilgilerini çeker (Aşama 2 mantığı).
+    Kontrol basamağı hatalı ISBN'ler Open Library'ye sorulmadan 422 ile reddedilir.
+
+    background=true ise Open Library yanıtı beklenmez: ISBN arka plan kuyruğuna
+    alınır ve 202 ile iş bilgisi döndürülür. İşin durumu GET /jobs/{id} ile izlenir.
+    """
+    if normalize_isbn(isbn_input.isbn) is None:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Geçersiz ISBN: '{isbn_input.isbn}'. ISBN-10 veya ISBN-13 olmalı ve kontrol basamağı doğru olmalıdır."
+        )
+
+    if background:
+        job = import_queue.enqueue(isbn_input.isbn)
+        if job is None:
+            raise HTTPException(
+                status_code=503,
+                detail="İçe aktarma kuyruğu dolu. Lütfen daha sonra tekrar deneyin.",
+                headers={"Retry-After": "30"}
+            )
+        return JSONResponse(status_code=202, content=job_output(job), headers={"Location": f"/jobs/{job.id}"})
+
+    try:
+        new_book = await library.add_book_from_api(isbn_input.isbn.strip())
+    except CircuitOpenError as e:
+        # Open Library art arda hata verdiği için istekler geçici olarak gönderilmiyor.
+        # Yarı açık devrede deneme isteği sürerken kalan süre 0 olabilir; en az 1 sn beklenir.
+        retry_after = max(1, math.ceil(e.retry_after))
+        raise HTTPException(
+            status_code=503,
+            detail=f"Open Library geçici olarak kullanılamıyor; ISBN '{isbn_input.isbn}' için {retry_after} sn sonra tekrar deneyin.",
+            headers={"Retry-After": str(retry_after)}
+        )
+    except Exception as e:
+        # Ağ hatası, API hatası gibi beklenmedik durumlarda
+        raise HTTPException(
+            status_code=400,
+            detail=f"Kitap eklenemedi veya ISBN '{isbn_input.isbn}' ile kitap bulunamadı. Hata: {str(e)}"
+        )
+
+    if new_book is None:
+        # API kitap bulamadıysa veya duplicate ISBN varsa
+        raise HTTPException(
+            status_code=400,
+            detail=f"Kitap eklenemedi veya ISBN '{isbn_input.isbn}' ile kitap bulunamadı."
+        )
+
+    return new_book.to_dict()
+
+# POST /books/batch endpoint'i
+@app.post("/books/batch", response_model=BatchOutput, summary="Toplu kitap ekle/sil",
+          responses={409: {"model": BatchOutput, "description": "En az bir işlem geçersiz; hiçbir işlem uygulanmadı"}})
+async def apply_batch(batch: BatchInput):
+    """
+    Elle girilen kitap eklemelerini ve ISBN ile silmeleri tek bir işlem olarak uygular.
+    Tüm işlemler önce doğrulanır; biri bile geçersizse (hatalı ISBN, zaten mevcut veya
+    bulunamayan kitap) hiçbir değişiklik yapılmaz ve 409 ile işlem başına sonuçlar döner.
+    Geçerliyse değişiklikler tek geçişte uygulanır ve veri dosyası bir kez kaydedilir.
+    """
+    applied, results = library.apply_batch([operation.model_dump() for operation in batch.operations])
+    content = {"applied": applied, "results": results}
+    if not applied:
+        if all(result["status"] == "ok" for result in results):
+            # İşlemler geçerli ama veri dosyası yazılamadı
+            raise HTTPException(status_code=500, detail="Toplu işlem kaydedilemedi; hiçbir değişiklik uygulanmadı.")
+        return JSONResponse(status_code=409, content=content)
+    return content
+
+# DELETE /books/{isbn} endpoint'i
+@app.delete("/books/{isbn}", status_code=204, summary="Kitap sil")
+async def remove_book(isbn: str):
+    """
+    Belirtilen ISBN numarasına sahip kitabı kütüphaneden siler.
+    
+    Args:
+        isbn (str): Silinecek kitabın ISBN numarası.
+    
+    Raises:
+        HTTPException: Belirtilen ISBN ile kitap bulunamazsa (404 Not Found).
+    """
+    # Library sınıfındaki 'remove_book' metodunu çağırırız.
+    # Bu metod silme işleminin başarılı olup olmadığını kontrol eder.
+    if not library.remove_book(isbn.strip()):
+        # Eğer kitap bulunamazsa 'remove_book' False döndürür.
+        raise HTTPException(status_code=404, detail=f"ISBN '{isbn}' numaralı kitap kütüphanede bulunamadı.")
+    
+    return
+
+# GET /jobs/{job_id} endpoint'i
+@app.get("/jobs/{job_id}", response_model=JobOutput, summary="İçe aktarma işinin durumunu getir")
+async def get_job(job_id: str):
+    """
+    Arka planda çalışan bir içe aktarma işinin durumunu döndürür.
+
+    Raises:
+        HTTPException: Belirtilen kimlikle iş bulunamazsa (404 Not Found).
+    """
+    job = import_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"'{job_id}' kimlikli iş bulunamadı.")
+    return job_output(job)
+
+# GET /openlibrary/cache endpoint'i
+@app.get("/openlibrary/cache", response_model=CacheStatsOutput, summary="Open Library önbellek sayaçlarını getir")
+async def get_openlibrary_cache():
+    """
+    Open Library sorgu önbelleğinin boyutunu ve isabet sayaçlarını döndürür.
+    Open Library'de bulunamayan veya başlığı olmayan ISBN'ler negative_ttl süresince,
+    yazar adları ttl süresince saklanır; bu sürede aynı sorgular ağa gitmeden yanıtlanır.
+    """
+    return library.openlibrary.cache.stats()
+
+def gone(since: int):
+    """İstenen değişiklikler artık saklanmıyorsa döndürülecek 410 hatası."""
+    return HTTPException(
+        status_code=410,
+        detail=f"{since} numarasından sonraki değişiklikler artık mevcut değil. GET /books ile kataloğu yeniden indirin."
+    )
+
+# GET /changes endpoint'i
+@app.get("/changes", response_model=ChangesOutput, summary="Değişiklikleri sıra numarasından itibaren getir")
+async def get_changes(since: int = Query(0, ge=0), limit: int = Query(1000, ge=1, le=10000)):
+    """
+    Verilen sıra numarasından sonraki ekleme, silme ve temizleme işlemlerini döndürür.
+    Kataloğun kopyasını tutan servisler tüm listeyi indirmek yerine yalnızca değişiklikleri alır.
+
+    Raises:
+        HTTPException: İstenen aralık artık saklanmıyorsa (410 Gone).
+    """
+    changes = library.changes.since(since, limit)
+    if changes is None:
+        raise gone(since)
+    return {"last_seq": library.changes.last_seq, "changes": [change.to_dict() for change in changes]}
+
+def format_event(change: Change) -> str:
+    """Bir değişikliği Server-Sent Events biçimine çevirir."""
+    data = json.dumps(change.to_dict(), ensure_ascii=False)
+    return f"id: {change.seq}\nevent: {change.op}\ndata: {data}\n\n"
+
+async def change_events(since: int):
+    """
+    since numarasından sonraki değişiklikleri, ardından yeni değişiklikleri oluştukça
+    SSE olayları olarak üretir. Günlük istemcinin gerisinde kalan kısmı attıysa
+    "reset" olayı gönderilir ve akış kapanır; istemci kataloğu yeniden indirmelidir.
+    """
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+
+    def listener(change: Change):
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # Olay döngüsü kapanmış; akış zaten sonlanmıştır
+
+    library.add_change_listener(listener)
+    try:
+        last = since
+        while True:
+            wakeup.clear()
+            changes = library.changes.since(last)
+            if changes is None:
+                yield f"event: reset\ndata: {json.dumps({'since': last})}\n\n"
+                return
+            for change in changes:
+                last = change.seq
+                yield format_event(change)
+            try:
+                await asyncio.wait_for(wakeup.wait(), SSE_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        library.remove_change_listener(listener)
+
+# GET /changes/stream endpoint'i
+@app.get("/changes/stream", summary="Değişiklikleri canlı olarak izle (Server-Sent Events)")
+async def stream_changes(since: Optional[int] = Query(None, ge=0),
+                         last_event_id: Optional[int] = Header(None, ge=0)):
+    """
+    Değişiklikleri text/event-stream olarak canlı yayınlar. Her olayın id alanı sıra numarasıdır;
+    bağlantı koptuğunda tarayıcılar Last-Event-ID başlığıyla kaldığı yerden devam eder.
+    since ve Last-Event-ID verilmezse yalnızca bundan sonraki değişiklikler gönderilir.
+
+    Raises:
+        HTTPException: İstenen aralık artık saklanmıyorsa (410 Gone).
+    """
+    start = last_event_id if last_event_id is not None else since
+    if start is None:
+        start = library.changes.last_seq
+    if library.changes.since(start, 0) is None:
+        raise gone(start)
+    return StreamingResponse(
+        change_events(start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,177 @@
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from classes import Book, Library
+from search_index import FuzzyIndex
+from storage import read_shards, shard_dir, shard_of, write_shards
+
+# Sentetik kelimelerde harflerin İngilizce metinlerdeki sıklığına yakın dağılımı;
+# trigram listelerinin uzunluk dağılımı gerçek bir dağarcığa benzer.
+LETTERS = "eeeeeeeeeeeetttttttttaaaaaaaaoooooooiiiiiiinnnnnnnsssssshhhhhhrrrrrrddddlllluuucccmmmwwffggyyppbbvk"
+# Başlıklarda sık geçen kelimeler; bunların belge listeleri kataloğun büyük kısmını kapsar.
+COMMON_WORDS = ["the", "a", "of", "and", "in", "history", "to", "new", "life", "world", "book", "war", "love", "art"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Sıralı olmayan bir listenin pct. yüzdelik değerini (nearest-rank) döndürür."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def synthetic_words(count: int, rng: random.Random) -> List[str]:
+    """3-12 harfli, birbirinden farklı count kelime üretir."""
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 12))))
+    return sorted(words)
+
+
+def typo(word: str, rng: random.Random) -> str:
+    """Kelimenin rastgele bir harfini değiştirir."""
+    i = rng.randrange(len(word))
+    return word[:i] + rng.choice("abcdefghij") + word[i + 1:]
+
+
+def bench_search(books: int = 300_000, vocabulary: int = 290_000, queries: int = 30,
+                 query_words=(1, 3, 5, 8), seed: int = 1) -> Dict[str, dict]:
+    """
+    Bulanık aramayı büyük, sentetik bir katalog üzerinde ölçer.
+    Her kitap 2-6 kelimeden oluşur; kelimelerin yaklaşık %30'u yaygın kelimelerdir, kalanı
+    dağarcıktan seçilir. Sorgu kelimelerinin yarısı bir harfi değiştirilmiş dağarcık
+    kelimeleri, yarısı yaygın kelimelerdir.
+    Args:
+        books (int): Katalogdaki kitap sayısı.
+        vocabulary (int): Yaygın kelimeler dışındaki benzersiz kelime sayısı.
+        queries (int): Her sorgu uzunluğu için ölçülecek sorgu sayısı.
+        query_words (tuple): Ölçülecek sorgu uzunlukları (kelime sayısı).
+        seed (int): Rastgele tohum.
+    Returns:
+        dict: Sorgu uzunluğundan {"p50_ms", "p95_ms", "max_ms"} ölçümlerine eşleme;
+            "index" anahtarında dizin boyutu ve kurulum süresi bulunur.
+    """
+    rng = random.Random(seed)
+    words = synthetic_words(vocabulary, rng)
+    unused = iter(words)
+    index = FuzzyIndex()
+    started = time.perf_counter()
+    for i in range(books):
+        title = [
+            rng.choice(COMMON_WORDS) if rng.random() < 0.3 else next(unused, None) or rng.choice(words)
+            for _ in range(rng.randint(2, 6))
+        ]
+        index.add(str(i), " ".join(title), folded=True)
+    results: Dict[str, dict] = {"index": {
+        "books": len(index), "words": len(index._vocabulary), "build_s": round(time.perf_counter() - started, 2),
+    }}
+
+    for count in query_words:
+        timings = []
+        for _ in range(queries):
+            query = " ".join(
+                typo(rng.choice(words), rng) if rng.random() < 0.5 else rng.choice(COMMON_WORDS)
+                for _ in range(count)
+            )
+            started = time.perf_counter()
+            index.search(query)
+            timings.append(time.perf_counter() - started)
+        results[f"{count}_words"] = {
+            "p50_ms": round(percentile(timings, 50) * 1000, 2),
+            "p95_ms": round(percentile(timings, 95) * 1000, 2),
+            "max_ms": round(max(timings) * 1000, 2),
+        }
+    return results
+
+
+def bench_startup(books: int = 200_000, shards: int = 16, workers: Optional[int] = None,
+                  repeats: int = 3, seed: int = 1) -> Dict[str, dict]:
+    """
+    Parçalı düzende açılış süresini ölçer. Geçici bir dizine sentetik bir katalog yazılır;
+    parçaların tek işlemde ve işlem havuzunda okunması ile Library açılışının tamamı ayrı
+    ayrı ölçülür. Paralel okuma yalnızca JSON ayrıştırmayı hızlandırır; kayıtların
+    birleştirilmesi ve Book nesnelerinin oluşturulması ana işlemde sırayla yapılır.
+    Args:
+        books (int): Katalogdaki kitap sayısı.
+        shards (int): Parça sayısı.
+        workers (int): Paralel okumadaki işlem sayısı. Varsayılan: işlemci sayısı (en fazla parça sayısı).
+        repeats (int): Her ölçümün tekrar sayısı; en kısa süre raporlanır.
+        seed (int): Rastgele tohum.
+    Returns:
+        dict: "library" anahtarında katalog bilgileri; "read_serial_s", "read_parallel_s"
+            (tek işlemci varsa None) ve "load_s" anahtarlarında saniye cinsinden süreler.
+    """
+    rng = random.Random(seed)
+    words = synthetic_words(min(books, 50_000), rng)
+    workers = min(workers or os.cpu_count() or 1, shards)
+    directory = tempfile.mkdtemp(prefix="benchmark-")
+    try:
+        data_file = os.path.join(directory, "library.json")
+        contents: Dict[int, List[dict]] = {index: [] for index in range(shards)}
+        for order in range(books):
+            title = " ".join(rng.choice(words) for _ in range(rng.randint(2, 6)))
+            book = Book(title, " ".join(rng.sample(words, 2)), f"979{order:010d}")
+            data = book.to_storage_dict()
+            data["order"] = order
+            contents[shard_of(book.isbn, shards)].append(data)
+        write_shards(shard_dir(data_file), shards, contents)
+        size = sum(entry.stat().st_size for entry in os.scandir(shard_dir(data_file)))
+
+        def best(run) -> float:
+            timings = []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            return round(min(timings), 3)
+
+        return {
+            "library": {"books": books, "shards": shards, "megabytes": round(size / 2**20, 1),
+                        "cpus": os.cpu_count(), "workers": workers},
+            "read_serial_s": best(lambda: read_shards(shard_dir(data_file), shards, workers=1)),
+            "read_parallel_s": best(lambda: read_shards(shard_dir(data_file), shards, workers=workers, min_bytes=0))
+            if workers > 1 else None,
+            "load_s": best(lambda: Library(data_file)),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Komut satırı argümanlarını okuyup seçilen ölçümü çalıştırır ve sonucu JSON olarak basar."""
+    parser = argparse.ArgumentParser(description="Kütüphane için performans ölçümleri.")
+    commands = parser.add_subparsers(dest="command", metavar="ÖLÇÜM", required=True)
+
+    search = commands.add_parser("search", help="Büyük bir katalogda bulanık arama süresi")
+    search.add_argument("--books", type=int, default=300_000, help="Katalogdaki kitap sayısı (varsayılan: 300000)")
+    search.add_argument("--vocabulary", type=int, default=290_000,
+                        help="Benzersiz kelime sayısı (varsayılan: 290000)")
+    search.add_argument("--queries", type=int, default=30, help="Her sorgu uzunluğu için sorgu sayısı")
+    search.add_argument("--seed", type=int, default=1, help="Rastgele tohum")
+
+    startup = commands.add_parser("startup", help="Parçalı düzende açılış süresi")
+    startup.add_argument("--books", type=int, default=200_000, help="Katalogdaki kitap sayısı (varsayılan: 200000)")
+    startup.add_argument("--shards", type=int, default=16, help="Parça sayısı (varsayılan: 16)")
+    startup.add_argument("--workers", type=int, default=None,
+                         help="Paralel okumadaki işlem sayısı (varsayılan: işlemci sayısı)")
+    startup.add_argument("--repeats", type=int, default=3, help="Her ölçümün tekrar sayısı")
+    startup.add_argument("--seed", type=int, default=1, help="Rastgele tohum")
+    args = parser.parse_args(argv)
+
+    if args.command == "search":
+        results = bench_search(args.books, args.vocabulary, args.queries, seed=args.seed)
+    else:
+        results = bench_startup(args.books, args.shards, args.workers, args.repeats, seed=args.seed)
+    print(json.dumps(results, indent=4, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import json
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+
+# Change sınıfı, kütüphanede yapılan tek bir değişikliği (ekleme, silme, temizleme) temsil eder.
+class Change:
+    ADD = "add"
+    REMOVE = "remove"
+    CLEAR = "clear"
+
+    def __init__(self, seq: int, op: str, isbn: Optional[str] = None, book: Optional[dict] = None,
+                 timestamp: Optional[float] = None):
+        """
+        Change sınıfının yapıcı metodu.
+        Args:
+            seq (int): Değişikliğin sıra numarası. Her değişiklikte bir artar.
+            op (str): Değişiklik türü (add, remove, clear).
+            isbn (str): Eklenen veya silinen kitabın kanonik ISBN'i. clear için None.
+            book (dict): Eklenen kitabın bilgileri. Yalnızca add için dolu.
+            timestamp (float): Değişikliğin yapıldığı zaman (Unix zamanı).
+        """
+        self.seq = seq
+        self.op = op
+        self.isbn = isbn
+        self.book = book
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def to_dict(self) -> dict:
+        """Change nesnesini bir sözlüğe dönüştürür. Dosyaya yazmak ve API yanıtları için kullanılır."""
+        return {"seq": self.seq, "op": self.op, "isbn": self.isbn, "book": self.book, "timestamp": self.timestamp}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Sözlükten bir Change nesnesi oluşturur. Dosyadan yüklemek için kullanılır."""
+        return cls(data["seq"], data["op"], data.get("isbn"), data.get("book"), data.get("timestamp"))
+
+
+# ChangeLog sınıfı, kütüphane değişikliklerini sıra numarasıyla saklayan değişiklik günlüğüdür.
+class ChangeLog:
+    """
+    Sıra numaraları kesintisiz artan, dosyada saklanan değişiklik günlüğü.
+
+    Her değişiklik JSON Lines dosyasının sonuna tek satır olarak eklenir; tüm
+    dosya yeniden yazılmaz. Günlük `max_entries` değerinin iki katına ulaşınca
+    en eski kayıtlar atılır ve dosya bir kez yeniden yazılır. Atılan kayıtların
+    sonrasını isteyen istemciler tüm kataloğu yeniden indirmelidir.
+    Dosya, günlüğe ilk erişimde okunur.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        ChangeLog sınıfının yapıcı metodu.
+        Args:
+            path (str): Değişikliklerin saklandığı JSON Lines dosyası.
+            max_entries (int): Saklanacak en az değişiklik sayısı.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Optional[List[Change]] = None
+        self._last_seq = 0
+
+    def _load(self) -> List[Change]:
+        """
+        Günlüğü dosyadan okur (yalnızca ilk erişimde). Yarım yazılmış veya bozuk satırlar
+        atlanır ve sonraki eklemeler bozuk satıra yapışmasın diye dosya yeniden yazılır.
+        """
+        if self._entries is not None:
+            return self._entries
+        entries: List[Change] = []
+        damaged = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            change = Change.from_dict(json.loads(line))
+                        except (json.JSONDecodeError, KeyError, TypeError):
+                            damaged = True
+                            continue
+                        # Sıra numaraları kesintisiz olmalıdır; bozuk bir satırdan sonrası güvenilmez
+                        if entries and change.seq != entries[-1].seq + 1:
+                            print(f"Uyarı: {self.path} dosyasındaki değişiklik günlüğü {entries[-1].seq} numarasından sonra kesiliyor.")
+                            damaged = True
+                            break
+                        entries.append(change)
+            except OSError as e:
+                print(f"Değişiklik günlüğü okuma hatası: {e}")
+        self._entries = entries[-self.max_entries:]
+        self._last_seq = entries[-1].seq if entries else 0
+        if damaged:
+            self._rewrite()
+        return self._entries
+
+    @property
+    def last_seq(self) -> int:
+        """Son değişikliğin sıra numarasını döndürür; hiç değişiklik yoksa 0."""
+        self._load()
+        return self._last_seq
+
+    @property
+    def first_seq(self) -> int:
+        """Saklanan en eski değişikliğin sıra numarasını döndürür; günlük boşsa last_seq + 1."""
+        entries = self._load()
+        return entries[0].seq if entries else self._last_seq + 1
+
+    def append(self, op: str, isbn: Optional[str] = None, book: Optional[dict] = None) -> Change:
+        """
+        Günlüğe yeni bir değişiklik ekler ve dosyanın sonuna yazar.
+        Args:
+            op (str): Değişiklik türü (Change.ADD, Change.REMOVE, Change.CLEAR).
+            isbn (str): Eklenen veya silinen kitabın ISBN'i.
+            book (dict): Eklenen kitabın bilgileri.
+        Returns:
+            Change: Sıra numarası atanmış değişiklik.
+        """
+        entries = self._load()
+        self._last_seq += 1
+        change = Change(self._last_seq, op, isbn, book)
+        entries.append(change)
+        if len(entries) >= 2 * self.max_entries:
+            del entries[:len(entries) - self.max_entries]
+            self._rewrite()
+        else:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(change.to_dict(), ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"Değişiklik günlüğü kaydetme hatası: {e}")
+        return change
+
+    def extend(self, items: Iterable[Tuple[str, Optional[str], Optional[dict]]]) -> List[Change]:
+        """
+        Birden çok değişikliği tek seferde ekler ve dosyaya tek yazma işlemiyle kaydeder.
+        Toplu içe aktarmada kullanılır; saklama sınırını aşan en eski kayıtlar
+        eklenirken atıldığı için bellekte en fazla 2 * max_entries değişiklik tutulur.
+        Args:
+            items (iterable): (op, isbn, book) üçlüleri.
+        Returns:
+            list: Eklenen ve hâlâ saklanan değişiklikler.
+        """
+        entries = self._load()
+        start = len(entries)
+        trimmed = False
+        for op, isbn, book in items:
+            self._last_seq += 1
+            entries.append(Change(self._last_seq, op, isbn, book))
+            if len(entries) >= 2 * self.max_entries:
+                dropped = len(entries) - self.max_entries
+                del entries[:dropped]
+                start = max(0, start - dropped)
+                trimmed = True
+        added = entries[start:]
+        if trimmed:
+            self._rewrite()
+        elif added:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(json.dumps(change.to_dict(), ensure_ascii=False) + "\n" for change in added)
+            except OSError as e:
+                print(f"Değişiklik günlüğü kaydetme hatası: {e}")
+        return added
+
+    def _rewrite(self):
+        """Saklanan değişiklikleri dosyaya yeniden yazar (geçici dosya üzerinden)."""
+        temp_file = f"{self.path}.tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                for change in self._entries:
+                    f.write(json.dumps(change.to_dict(), ensure_ascii=False) + "\n")
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            print(f"Değişiklik günlüğü kaydetme hatası: {e}")
+
+    def since(self, seq: int, limit: Optional[int] = None) -> Optional[List[Change]]:
+        """
+        Verilen sıra numarasından sonraki değişiklikleri döndürür.
+        Args:
+            seq (int): İstemcinin uyguladığı son değişikliğin sıra numarası (başlangıç için 0).
+            limit (int): Döndürülecek en fazla değişiklik sayısı. None ise hepsi.
+        Returns:
+            list: Sıra numarasına göre artan değişiklikler. İstenen aralık artık saklanmıyorsa
+                veya seq günlükte hiç olmamış bir numaraysa None; istemci tüm kataloğu
+                yeniden indirmelidir.
+        """
+        entries = self._load()
+        if seq > self._last_seq or seq < self.first_seq - 1:
+            return None
+        # Sıra numaraları kesintisiz olduğu için başlangıç konumu doğrudan hesaplanır
+        start = seq - self.first_seq + 1
+        end = len(entries) if limit is None else start + limit
+        return entries[start:end]
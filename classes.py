@@ -1,310 +1,915 @@
-import json
-import httpx
-import os
-from typing import List, Optional
-
-# Book sınıfı, bir kitabı temsil eder.
-class Book:
-    def __init__(self, title: str, author: str, isbn: str):
-        """
-        Book sınıfının yapıcı metodu.
-        Args:
-            title (str): Kitabın başlığı.
-            author (str): Kitabın yazarı.
-            isbn (str): Kitabın ISBN numarası (benzersiz kimlik).
-        """
-        self.title = title
-        self.author = author
-        self.isbn = isbn
-
-    def __str__(self) -> str:
-        """
-        Kitap bilgilerini okunabilir bir string formatında döndürür.
-        Örn: "Ulysses by James Joyce (ISBN: 978-0199535675)"
-        """
-        return f"{self.title} by {self.author} (ISBN: {self.isbn})"
-
-    def to_dict(self) -> dict:
-        """
-        Book nesnesini bir sözlüğe dönüştürür. JSON'a kaydetmek için kullanılır.
-        """
-        return {"title": self.title, "author": self.author, "isbn": self.isbn}
-
-    @classmethod
-    def from_dict(cls, data: dict):
-        """
-        Sözlükten bir Book nesnesi oluşturur. JSON'dan yüklemek için kullanılır.
-        Args:
-            data (dict): Kitap bilgilerini içeren sözlük.
-        Returns:
-            Book: Oluşturulan Book nesnesi.
-        """
-        return cls(data['title'], data['author'], data['isbn'])
-
-# Library sınıfı, tüm kütüphane operasyonlarını yönetir.
-class Library:
-    def __init__(self, data_file: str = 'library.json'):
-        """
-        Library sınıfının yapıcı metodu.
-        Args:
-            data_file (str): Kitap verilerinin saklanacağı JSON dosyasının adı. Varsayılan 'library.json'.
-        """
-        self.data_file = data_file
-        self._books: List[Book] = []
-        self.load_books() 
-
-    @property
-    def books(self) -> List[Book]:
-        """Kütüphanedeki kitapların listesini döndürür."""
-        return self._books
-
-    def load_books(self) -> bool:
-        """
-        library.json dosyasından kitapları yükler. Dosya yoksa veya boşsa, boş bir liste ile başlar.
-        Returns:
-            bool: Yükleme başarılıysa True, aksi takdirde False.
-        """
-        if not os.path.exists(self.data_file):
-            
-            self._books = []
-            return False
-        
-        try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self._books = [Book.from_dict(book_data) for book_data in data]
-            return True
-        except json.JSONDecodeError:
-            print(f"Hata: {self.data_file} dosyası bozuk veya boş. Yeni bir dosya oluşturulacak.")
-            self._books = [] # Dosya bozuksa, boş liste ile başla
-            return False
-        except FileNotFoundError: 
-            self._books = []
-            return False
-        except Exception as e:
-            print(f"Veri yükleme hatası: {e}")
-            self._books = []
-            return False
-
-    def save_books(self) -> bool:
-        """
-        Kütüphanedeki tüm kitap listesini JSON dosyasına yazar.
-        Returns:
-            bool: Kaydetme başarılıysa True, aksi takdirde False.
-        """
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump([book.to_dict() for book in self.books], f, indent=4, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Veri kaydetme hatası: {e}")
-            return False
-
-    def add_book_manual(self, book: Book) -> bool:
-        """
-        Manuel olarak bir Book nesnesini kütüphaneye ekler ve dosyayı günceller.
-        Args:
-            book (Book): Eklenecek Book nesnesi.
-        Returns:
-            bool: Kitap başarıyla eklendiyse True, aksi takdirde False.
-        """
-        if not book.isbn.strip() or not book.title.strip() or not book.author.strip():
-            print("Hata: Kitap bilgileri (başlık, yazar, ISBN) boş olamaz.")
-            return False
-
-        if any(b.isbn == book.isbn for b in self._books):
-            print(f"Hata: Bu ISBN'ye sahip kitap kütüphanede zaten mevcut: {book.isbn}")
-            return False
-        
-        self._books.append(book)
-        self.save_books()
-        print(f"Kitap başarıyla manuel olarak eklendi: {book}")
-        return True
-
-    async def add_book_from_api(self, isbn: str) -> Optional[Book]:
-        """
-        Yeni bir Book nesnesini kütüphaneye Open Library API'sinden çekerek ekler.
-        Yazar adlarını almak için ek API çağrıları yapabilir.
-        Args:
-            isbn (str): Eklenecek kitabın ISBN numarası.
-        Returns:
-            Book: Başarılı olursa eklenen Book nesnesi, aksi takdirde None.
-        """
-        # ISBN boşsa hata döndür
-        if not isbn.strip():
-            print("Hata: ISBN boş olamaz.")
-            return None
-
-        # Kitap zaten mevcut mu kontrol et
-        if any(book.isbn == isbn for book in self.books):
-            print(f"Hata: ISBN {isbn} zaten kütüphanede mevcut.")
-            return None
-
-        # Open Library API'den kitap bilgilerini çekme
-        api_url = f"https://openlibrary.org/isbn/{isbn}.json"
-        try:
-            # Ana kitap bilgisi için httpx.AsyncClient kullan
-            async with httpx.AsyncClient() as main_client:
-                response = await main_client.get(api_url, timeout=10.0, follow_redirects=True)
-                
-                if not response.is_success:
-                    if response.status_code == 404:
-                        print(f"Hata: Verilen ISBN ({isbn}) ile kitap bulunamadı.")
-                    elif response.status_code == 302:
-                        print(f"Hata: API isteği bir yönlendirme hatasıyla karşılaştı. ISBN için bilgi alınamadı: {isbn}.")
-                    else:
-                        print(f"Hata: API'den beklenmeyen durum kodu: {response.status_code} (ISBN: {isbn}).")
-                    return None
-                
-                data = response.json()
-
-            title = data.get('title')
-            authors_list = data.get('authors') 
-            
-            author_names = "Bilinmiyor"
-            if authors_list:
-                fetched_author_names = []
-                # Her bir yazar bilgisi için döngü
-                for author_info in authors_list:
-                    if isinstance(author_info, dict) and 'name' in author_info:
-                        # Eğer 'name' doğrudan varsa, kullan
-                        fetched_author_names.append(author_info['name'])
-                    elif isinstance(author_info, dict) and 'key' in author_info:
-                        # Eğer sadece 'key' varsa, yazar detaylarını çekmek için ek API çağrısı yap
-                        author_key = author_info['key']
-                        author_detail_url = f"https://openlibrary.org{author_key}.json"
-                        try:
-                            # Yazar detayları için YENİ bir httpx.AsyncClient örneği kullan
-                            async with httpx.AsyncClient() as author_client: 
-                                author_response = await author_client.get(author_detail_url, timeout=5.0)
-                                if author_response.is_success:
-                                    author_data = author_response.json()
-                                    if 'name' in author_data:
-                                        fetched_author_names.append(author_data['name'])
-                                    else:
-                                        fetched_author_names.append("Bilinmeyen Yazar (Detay Yok)")
-                                else:
-                                    fetched_author_names.append(f"Bilinmeyen Yazar (API Durum Kodu: {author_response.status_code})")
-                        except httpx.RequestError:
-                            fetched_author_names.append("Bilinmeyen Yazar (API Hatası)")
-                        except json.JSONDecodeError:
-                            fetched_author_names.append("Bilinmeyen Yazar (JSON Hatası)")
-                    else:
-                        fetched_author_names.append("Bilinmeyen Yazar (Geçersiz Format)")
-                
-                if fetched_author_names:
-                    author_names = ", ".join(fetched_author_names)
-                else:
-                    author_names = "Bilinmiyor (Yazar Bilgisi Yok)"
-
-            if not title:
-                print(f"Hata: API'den kitap başlığı alınamadı (ISBN: {isbn}).")
-                return None
-
-            new_book = Book(title, author_names, isbn)
-            self._books.append(new_book)
-            self.save_books()
-            print(f"Kitap başarıyla API aracılığıyla eklendi: {new_book}")
-            return new_book
-
-        except httpx.RequestError as e:
-            print(f"Hata: API isteği başarısız oldu (ağ hatası, DNS sorunu vb.) - {e} (ISBN: {isbn}). Lütfen internet bağlantınızı kontrol edin veya ISBN'i doğrulayın.")
-            return None
-        except json.JSONDecodeError:
-            print(f"Hata: API yanıtı JSON olarak ayrıştırılamadı. Yanlış format veya boş yanıt (ISBN: {isbn}).")
-            return None
-        except Exception as e:
-            print(f"Beklenmeyen bir hata oluştu: {e} (ISBN: {isbn}).")
-            return None
-
-    def remove_book(self, isbn: str) -> bool:
-        """
-        ISBN numarasına göre bir kitabı kütüphaneden siler.
-        Args:
-            isbn (str): Silinecek kitabın ISBN numarası.
-        Returns:
-            bool: Kitap başarıyla silindiyse True, bulunamadıysa False.
-        """
-        initial_len = len(self._books)
-        # Sadece belirtilen ISBN'ye sahip olmayan kitapları koru
-        self._books = [book for book in self._books if book.isbn != isbn]
-        if len(self._books) < initial_len:
-            self.save_books()
-            print(f"ISBN {isbn} numaralı kitap başarıyla silindi.")
-            return True
-        else:
-            print(f"Hata: ISBN {isbn} numaralı kitap kütüphanede bulunamadı.")
-            return False
-
-    def list_books(self) -> List[Book]:
-        """
-        Kütüphanedeki tüm kitapları listeler.
-        Returns:
-            list: Book nesnelerinin listesi.
-        """
-        if not self._books:
-            print("Kütüphanede henüz kitap bulunmamaktadır.")
-            return []
-        else:
-            print("\n--- Kütüphanedeki Kitaplar ---")
-            for i, book in enumerate(self._books, 1):
-                print(f"{i}. {book}")
-            print("------------------------------")
-            return self._books
-
-    def find_book(self, isbn: str) -> Optional[Book]:
-        """
-        ISBN ile belirli bir kitabı bulur.
-        Args:
-            isbn (str): Aranacak kitabın ISBN numarası.
-        Returns:
-            Book: Bulunan Book nesnesi, bulunamazsa None.
-        """
-        for book in self._books:
-            if book.isbn == isbn:
-                print(f"Kitap bulundu: {book}")
-                return book
-        print(f"ISBN {isbn} numaralı kitap bulunamadı.")
-        return None
-
-    def search_books(self, query: str) -> List[Book]:
-        """
-        Başlık veya yazar adına göre kitapları arar.
-        Args:
-            query (str): Arama sorgusu.
-        Returns:
-            List[Book]: Arama sonuçlarına uyan kitapların listesi.
-        """
-        query = query.lower()
-        found_books = [
-            book for book in self._books
-            if query in book.title.lower() or query in book.author.lower()
-        ]
-        if found_books:
-            print(f"\n'{query}' için {len(found_books)} sonuç bulundu:")
-            print("-" * 50)
-            for i, book in enumerate(found_books, 1):
-                print(f"{i}. {book}")
-            print("-" * 50)
-        else:
-            print(f"'{query}' için sonuç bulunamadı.")
-        return found_books
-
-    def get_book_count(self) -> int:
-        """Kütüphanedeki toplam kitap sayısını döndürür."""
-        return len(self._books)
-
-    def get_author_statistics(self) -> dict:
-        """Yazar istatistiklerini (her yazarın kaç kitabı olduğunu) döndürür."""
-        authors = {}
-        for book in self._books:
-            authors[book.author] = authors.get(book.author, 0) + 1
-        return authors
-
-    def clear_library(self) -> bool:
-        """Tüm kütüphaneyi temizler ve değişiklikleri kaydeder."""
-        self._books = []
-        self.save_books()
-        print("Kütüphanedeki tüm kitaplar silindi.")
-        return True
-
+import gc
+import json
+import os
+import threading
+from collections.abc import Sequence
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from changes import Change, ChangeLog
+from isbn import normalize_isbn
+from openlibrary import CircuitOpenError, OpenLibraryClient
+from persistent import PersistentMap, PersistentVector
+from search_index import FuzzyIndex
+from storage import read_manifest, read_shards, remove_shards, shard_dir, shard_of, write_shards
+from textfold import FOLD_VERSION, fold
+
+if TYPE_CHECKING:
+    import httpx
+
+# Open Library isteklerinde kullanılan zaman aşımları (saniye). Bağlantı kurulamıyorsa
+# tüm okuma süresi beklenmeden hata alınır ve yeniden deneme devreye girer.
+BOOK_TIMEOUT = 10.0
+AUTHOR_TIMEOUT = 5.0
+CONNECT_TIMEOUT = 3.0
+# Open Library, kendini tanıtan istemcilere daha yüksek hız sınırı uygular.
+USER_AGENT = "Kutuphane-Yonetim-Sistemi/1.0 (+https://github.com/betulbilici/Kutuphane-Yonetim-Sistemi)"
+
+def __getattr__(name: str):
+    """
+    httpx ve asyncio yalnızca Open Library'ye istek atılırken gerekir ve yüklenmeleri
+    uzun sürer. Yerel işlemlerin (listeleme, arama, silme) hızlı başlaması için
+    ilk kullanımda yüklenirler; classes.httpx gibi erişimler de çalışmaya devam eder.
+    """
+    if name in ("httpx", "asyncio"):
+        import importlib
+        return importlib.import_module(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Book sınıfı, bir kitabı temsil eder.
+class Book:
+    def __init__(self, title: str, author: str, isbn: str, search_key: Optional[str] = None,
+                 order: Optional[int] = None):
+        """
+        Book sınıfının yapıcı metodu.
+        Args:
+            title (str): Kitabın başlığı.
+            author (str): Kitabın yazarı.
+            isbn (str): Kitabın ISBN numarası (benzersiz kimlik).
+            search_key (str): Önceden hesaplanmış arama anahtarı. Verilmezse başlık ve yazardan hesaplanır.
+            order (int): Kütüphaneye eklenme sırası. Verilmezse kitap eklenirken Library tarafından atanır.
+        """
+        self.title = title
+        self.author = author
+        self.isbn = isbn
+        # Aramalarda karşılaştırılan, Türkçe harf ve aksanlardan arındırılmış başlık ve yazar.
+        # Her sorguda yeniden hesaplanmaması için kitap oluşturulurken bir kez üretilir.
+        self.search_key = search_key if search_key is not None else self.make_search_key(title, author)
+        # Kütüphaneye eklenme sırası. Parçalı düzende kitaplar farklı dosyalarda saklandığı
+        # için liste sırası yüklemede bu numarayla yeniden kurulur; Library tarafından atanır.
+        self.order = order
+
+    @staticmethod
+    def make_search_key(title: str, author: str) -> str:
+        """
+        Başlık ve yazardan arama anahtarını üretir (bkz. textfold.fold).
+        Başlık ve yazar, sorguların ikisine yayılarak eşleşmemesi için satır sonuyla ayrılır.
+        """
+        return f"{fold(title)}\n{fold(author)}"
+
+    def __str__(self) -> str:
+        """
+        Kitap bilgilerini okunabilir bir string formatında döndürür.
+        Örn: "Ulysses by James Joyce (ISBN: 978-0199535675)"
+        """
+        return f"{self.title} by {self.author} (ISBN: {self.isbn})"
+
+    def to_dict(self) -> dict:
+        """
+        Book nesnesini bir sözlüğe dönüştürür. JSON'a kaydetmek için kullanılır.
+        """
+        return {"title": self.title, "author": self.author, "isbn": self.isbn}
+
+    def to_storage_dict(self) -> dict:
+        """
+        Book nesnesini, arama anahtarıyla birlikte veri dosyasına yazılacak sözlüğe dönüştürür.
+        """
+        data = self.to_dict()
+        data["search_key"] = self.search_key
+        data["search_key_version"] = FOLD_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Sözlükten bir Book nesnesi oluşturur. JSON'dan yüklemek için kullanılır.
+        Kayıtta güncel sürümde bir arama anahtarı varsa yeniden hesaplanmadan kullanılır.
+        Args:
+            data (dict): Kitap bilgilerini içeren sözlük.
+        Returns:
+            Book: Oluşturulan Book nesnesi.
+        """
+        search_key = data.get('search_key') if data.get('search_key_version') == FOLD_VERSION else None
+        return cls(data['title'], data['author'], data['isbn'], search_key)
+
+# LibrarySnapshot sınıfı, kütüphanenin belirli bir sürümdeki değişmez görünümüdür.
+class LibrarySnapshot(Sequence):
+    """
+    Kitapların ekleme sırasına göre listesi ve ISBN dizininden oluşan değişmez sürüm.
+
+    Kitaplar kalıcı bir dizide (PersistentVector), ISBN anahtarından (konum, kitap)
+    çiftine eşleme kalıcı bir sözlükte (PersistentMap) tutulur. Ekleme ve silme yeni
+    bir sürüm döndürür ve yalnızca değişen yolu kopyalar (O(log n)); eski sürümü
+    tutan okuyucular onu değişmeden görmeye devam eder. Silinen kitabın yeri
+    dizide boş (None) bırakılır; boşluklar kitap sayısını geçince dizi yeniden kurulur.
+    """
+
+    __slots__ = ("version", "_slots", "_index", "_holes")
+
+    def __init__(self, version: int = 0, slots: Optional[PersistentVector] = None,
+                 index: Optional[PersistentMap] = None, holes: int = 0):
+        """
+        LibrarySnapshot sınıfının yapıcı metodu. Dolu sürümler from_books ile oluşturulur.
+        Args:
+            version (int): Sürüm numarası; sürümü oluşturan son değişikliğin sıra numarası.
+            slots (PersistentVector): Ekleme sırasına göre kitaplar (silinenlerin yerinde None).
+            index (PersistentMap): Kanonik ISBN'den (konum, kitap) çiftine eşleme.
+            holes (int): slots içindeki boş yer sayısı.
+        """
+        self.version = version
+        self._slots = slots if slots is not None else PersistentVector()
+        self._index = index if index is not None else PersistentMap()
+        self._holes = holes
+
+    @classmethod
+    def from_books(cls, books: List[Book], version: int = 0) -> "LibrarySnapshot":
+        """ISBN'leri kanonik ve benzersiz kitaplardan yeni bir sürüm oluşturur (O(n))."""
+        keys = [book.isbn for book in books]
+        return cls(version, PersistentVector.from_iterable(books),
+                   PersistentMap.from_items(zip(keys, zip(range(len(books)), books))))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[Book]:
+        if not self._holes:
+            return iter(self._slots)
+        return filter(None, self._slots)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        if not self._holes:
+            return self._slots[i]
+        # Boşluk varken konum doğrudan hesaplanamaz; liste baştan sayılır (O(n))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("LibrarySnapshot index out of range")
+        return next(islice(self, i, None))
+
+    def __reversed__(self) -> Iterator[Book]:
+        return reversed(list(self))
+
+    def get(self, key: str) -> Optional[Book]:
+        """Kanonik ISBN anahtarı verilen kitabı döndürür; yoksa None."""
+        entry = self._index.get(key)
+        return entry[1] if entry is not None else None
+
+    def with_book(self, book: Book) -> "LibrarySnapshot":
+        """Sonuna book eklenmiş yeni sürümü döndürür. book.isbn kanonik ve sürümde yok olmalıdır."""
+        position = len(self._slots)
+        return LibrarySnapshot(self.version, self._slots.append(book),
+                               self._index.set(book.isbn, (position, book)), self._holes)
+
+    def without(self, key: str) -> "LibrarySnapshot":
+        """Anahtarı verilen kitabın çıkarıldığı yeni sürümü döndürür; kitap yoksa sürümün kendisi."""
+        entry = self._index.get(key)
+        if entry is None:
+            return self
+        snapshot = LibrarySnapshot(self.version, self._slots.set(entry[0], None),
+                                   self._index.delete(key), self._holes + 1)
+        if snapshot._holes > max(len(snapshot), 32):
+            # Boşluklar çoğaldı; dizi sıkıştırılır (maliyeti önceki silmelere yayılır)
+            return LibrarySnapshot.from_books(list(snapshot), self.version)
+        return snapshot
+
+    def at_version(self, version: int) -> "LibrarySnapshot":
+        """Aynı kitaplarla, verilen sürüm numarasını taşıyan sürümü döndürür (O(1))."""
+        return LibrarySnapshot(version, self._slots, self._index, self._holes)
+
+# Library sınıfı, tüm kütüphane operasyonlarını yönetir.
+class Library:
+    def __init__(self, data_file: str = 'library.json', shards: Optional[int] = None):
+        """
+        Library sınıfının yapıcı metodu.
+        Args:
+            data_file (str): Kitap verilerinin saklanacağı JSON dosyasının adı. Varsayılan 'library.json'.
+            shards (int): Kitapların bölüneceği dosya sayısı (bkz. storage). 1 ise tek dosya kullanılır.
+                None ise mevcut düzen korunur: <data_file>.shards/ dizini varsa parçalı, yoksa tek dosya.
+                Mevcut düzenden farklıysa veriler yüklemede yeni düzene dönüştürülür.
+        """
+        self.data_file = data_file
+        self._requested_shards = shards
+        # Kullanılan parça sayısı (1: tek dosya); load_books tarafından belirlenir.
+        self.shards = 1
+        # Parçalı düzende her parçanın kitapları (ISBN anahtarından kitaba, ekleme sırasıyla).
+        # Bir kayıt yalnızca değişen parçaların kitaplarını dolaşır; ilk kayıtta kurulur.
+        self._shard_members: Optional[List[Dict[str, Book]]] = None
+        # Yeni eklenen kitaba verilecek sıra numarası (bkz. Book.order)
+        self._next_order = 0
+        # Kitapların yayımlanmış son sürümü. Okuyucular kilitsiz okur; yazıcılar yeni bir
+        # sürüm oluşturup bu alana tek atamayla yayımlar (bkz. LibrarySnapshot).
+        self._snapshot = LibrarySnapshot()
+        # Yazıcıları sıraya sokar; okuma yolları bu kilidi beklemez.
+        self._write_lock = threading.RLock()
+        # Yazım hatalarına toleranslı arama için başlık ve yazar kelimelerinin dizini.
+        # Kurulması kitap sayısıyla orantılı sürdüğü için ilk bulanık aramada kurulur.
+        self._fuzzy: Optional[FuzzyIndex] = None
+        # Open Library isteklerinde kullanılacak isteğe bağlı httpx transport'u.
+        # None ise gerçek ağ kullanılır; yük testi gibi araçlar yerel bir sahte sunucu verebilir.
+        self.transport: Optional["httpx.AsyncBaseTransport"] = None
+        # Open Library istekleri için hız sınırlayıcı, yeniden deneme ve devre kesici
+        self.openlibrary = OpenLibraryClient()
+        # Ekleme/silme/temizleme işlemlerinin sıra numaralı günlüğü (bkz. changes_file)
+        self.changes: Optional[ChangeLog] = None
+        # Her değişiklikte çağrılan fonksiyonlar (ör. API'deki canlı değişiklik akışı)
+        self._change_listeners: List[Callable[[Change], None]] = []
+        self.load_books() 
+
+    @property
+    def books(self) -> LibrarySnapshot:
+        """Kütüphanedeki kitapları, o anki değişmez sürüm olarak döndürür (bkz. snapshot)."""
+        return self._snapshot
+
+    def snapshot(self) -> LibrarySnapshot:
+        """
+        Kütüphanenin o anki sürümünü O(1) sürede, kopyalamadan döndürür. Sürüm değişmez;
+        sonraki eklemeler ve silmeler onu etkilemez, yeni bir sürüm olarak yayımlanır.
+        Sürüm numarası (version), sürüme yansımış son değişikliğin sıra numarasıdır.
+        """
+        return self._snapshot
+
+    @property
+    def changes_file(self) -> str:
+        """Değişiklik günlüğünün saklandığı dosya; veri dosyasının yanında tutulur."""
+        return f"{self.data_file}.changes.jsonl"
+
+    def add_change_listener(self, listener: Callable[[Change], None]):
+        """Her değişiklikten sonra çağrılacak bir fonksiyon ekler."""
+        self._change_listeners.append(listener)
+
+    def remove_change_listener(self, listener: Callable[[Change], None]):
+        """add_change_listener ile eklenen fonksiyonu kaldırır."""
+        if listener in self._change_listeners:
+            self._change_listeners.remove(listener)
+
+    def _publish(self, snapshot: LibrarySnapshot, items: Iterable[Tuple[str, Optional[Book]]]):
+        """
+        Yeni sürümü yayımlar: değişiklikler günlüğe tek yazma işlemiyle eklenir, sürüme son
+        değişikliğin sıra numarası verilir, sürüm tek atamayla okuyuculara açılır ve
+        dinleyicilere bildirilir. Yazma kilidi tutulurken çağrılmalıdır.
+        """
+        changes = self.changes.extend(
+            (op, book.isbn if book else None, book.to_dict() if op == Change.ADD else None) for op, book in items
+        )
+        self._snapshot = snapshot.at_version(self.changes.last_seq)
+        for change in changes:
+            for listener in list(self._change_listeners):
+                listener(change)
+
+    def build_search_index(self) -> FuzzyIndex:
+        """
+        Yazım hatası toleranslı arama dizinini döndürür; henüz kurulmadıysa kurar.
+        API sunucusu ilk aramanın gecikmemesi için açılışta çağırır.
+        """
+        with self._write_lock:
+            if self._fuzzy is None:
+                fuzzy = FuzzyIndex()
+                for book in self._snapshot:
+                    fuzzy.add(book.isbn, book.search_key, folded=True)
+                self._fuzzy = fuzzy
+            return self._fuzzy
+
+    @staticmethod
+    def _isbn_key(isbn: str) -> str:
+        """
+        Bir ISBN için dizin anahtarını döndürür.
+        Geçerli ISBN-10/13 girdileri kanonik ISBN-13'e çevrilir; eski kayıtlardaki
+        ISBN olmayan kimlikler ise boşlukları kırpılmış haliyle kullanılır.
+        """
+        # Kaydedilen ISBN'ler zaten kanonik olduğundan yüklemede kontrol basamağı hesaplanmaz;
+        # ayraçsız 13 hane, geçerli olsun olmasın, her iki durumda da kendisi anahtardır.
+        if len(isbn) == 13 and isbn.isdigit():
+            return isbn
+        return normalize_isbn(isbn) or isbn.strip()
+
+    def _set_books(self, books: List[Book], canonical: bool = False):
+        """
+        Kitapların sürümünü verilen kitaplarla yeniden kurar ve yayımlar.
+        Geçerli ISBN'ler kanonik ISBN-13'e çevrilir, aynı anahtara sahip tekrarlar atlanır.
+        canonical True ise (parça dosyaları gibi bu sınıfın yazdığı kayıtlar) ISBN'lerin
+        kanonik olduğu varsayılır ve tek tek kontrol edilmez; yine de tekrar varsa atlanır.
+        """
+        snapshot = LibrarySnapshot.from_books(books, self.changes.last_seq) if canonical else None
+        if snapshot is None or len(snapshot) != len(books):
+            unique: Dict[str, Book] = {}
+            for position, book in enumerate(books):
+                key = self._isbn_key(book.isbn)
+                if key in unique:
+                    print(f"Uyarı: {self.data_file} dosyasında tekrarlanan ISBN atlandı: {book.isbn}")
+                    continue
+                book.isbn = key
+                if book.order is None:
+                    book.order = position
+                unique[key] = book
+            books = list(unique.values())
+            snapshot = LibrarySnapshot.from_books(books, self.changes.last_seq)
+        with self._write_lock:
+            self._snapshot = snapshot
+            self._next_order = max((book.order for book in books), default=-1) + 1
+            self._fuzzy = None
+            self._shard_members = None
+
+    def _stamp(self, book: Book) -> Book:
+        """Kütüphaneye eklenen kitaba sıra numarası verir. Yazma kilidi tutulurken çağrılmalıdır."""
+        book.order = self._next_order
+        self._next_order += 1
+        return book
+
+    def load_books(self) -> bool:
+        """
+        library.json dosyasından (veya parçalı düzende <data_file>.shards/ dizininden) kitapları
+        yükler. Dosya yoksa veya boşsa, boş bir liste ile başlar.
+        Arama anahtarı olmayan veya eski sürümde olan kayıtlar varsa (eski library.json dosyaları)
+        anahtarlar bir kez hesaplanır ve dosya güncellenir. İstenen parça sayısı mevcut düzenden
+        farklıysa veriler yeni düzende yeniden yazılır.
+        Returns:
+            bool: Yükleme başarılıysa True, aksi takdirde False.
+        """
+        # Veri dosyası değiştiyse değişiklik günlüğü de yeni dosyanınkiyle değiştirilir
+        if self.changes is None or self.changes.path != self.changes_file:
+            self.changes = ChangeLog(self.changes_file)
+
+        stored = read_manifest(shard_dir(self.data_file)) or 1
+        self.shards = self._requested_shards or stored
+        self._shard_members = None
+        # Yüklemede çok sayıda kalıcı nesne oluşturulur; çöp toplayıcı bunları tekrar tekrar
+        # taramasın diye yükleme süresince kapatılır (açılış süresinin yaklaşık üçte biri)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            loaded = self._load_shards(stored) if stored > 1 else self._load_file()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if self.shards != stored:
+            self._convert_layout(stored)
+        return loaded
+
+    def _load_shards(self, shards: int) -> bool:
+        """Parçalı düzendeki kitapları, parçaları paralel okuyarak yükler."""
+        records, outdated, errors = read_shards(shard_dir(self.data_file), shards)
+        for error in errors:
+            print(f"Hata: {error}")
+        self._set_books([Book(title, author, isbn, search_key, order)
+                         for order, title, author, isbn, search_key in records], canonical=True)
+        if outdated:
+            self.save_books()
+            print(f"Bilgi: {outdated} kitabın arama anahtarı oluşturuldu ve {shard_dir(self.data_file)} güncellendi.")
+        return not errors
+
+    def _convert_layout(self, stored: int):
+        """Yüklenen kitapları istenen düzende (self.shards) kaydeder ve eski düzeni kaldırır."""
+        if not self.save_books():
+            return
+        if stored > 1:
+            remove_shards(shard_dir(self.data_file), keep=self.shards if self.shards > 1 else 0)
+        elif os.path.exists(self.data_file):
+            # Eski tek dosya, parçalı düzenle karışmaması için yedek olarak saklanır
+            os.replace(self.data_file, f"{self.data_file}.bak")
+        print(f"Bilgi: {self.data_file} verileri {self.shards} parçalı düzene dönüştürüldü.")
+
+    def _load_file(self) -> bool:
+        """Tek dosyalı düzendeki kitapları yükler."""
+        if not os.path.exists(self.data_file):
+            
+            self._set_books([])
+            return False
+        
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                self._set_books([Book.from_dict(book_data) for book_data in data])
+            outdated = sum(1 for book_data in data if book_data.get('search_key_version') != FOLD_VERSION)
+            if outdated:
+                self.save_books()
+                print(f"Bilgi: {outdated} kitabın arama anahtarı oluşturuldu ve {self.data_file} güncellendi.")
+            return True
+        except json.JSONDecodeError:
+            print(f"Hata: {self.data_file} dosyası bozuk veya boş. Yeni bir dosya oluşturulacak.")
+            self._set_books([]) # Dosya bozuksa, boş liste ile başla
+            return False
+        except FileNotFoundError: 
+            self._set_books([])
+            return False
+        except Exception as e:
+            print(f"Veri yükleme hatası: {e}")
+            self._set_books([])
+            return False
+
+    def save_books(self, snapshot: Optional[LibrarySnapshot] = None, keys: Optional[Iterable[str]] = None) -> bool:
+        """
+        Kütüphanedeki tüm kitap listesini JSON dosyasına yazar.
+        Args:
+            snapshot (LibrarySnapshot): Yazılacak sürüm. Verilmezse yayımlanmış son sürüm yazılır.
+            keys (iterable): Değişen kitapların ISBN anahtarları. Parçalı düzende yalnızca bu
+                kitapların parçaları yeniden yazılır; None ise tüm parçalar yazılır.
+        Returns:
+            bool: Kaydetme başarılıysa True, aksi takdirde False.
+        """
+        if snapshot is None:
+            snapshot = self._snapshot
+        if self.shards > 1:
+            return self._save_shards(snapshot, keys)
+
+        # Yarım yazılmış bir veri dosyası bırakmamak için önce geçici dosyaya yazılır
+        temp_file = f"{self.data_file}.tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump([book.to_storage_dict() for book in snapshot], f, indent=4, ensure_ascii=False)
+            os.replace(temp_file, self.data_file)
+            return True
+        except Exception as e:
+            print(f"Veri kaydetme hatası: {e}")
+            return False
+
+    def _save_shards(self, snapshot: LibrarySnapshot, keys: Optional[Iterable[str]]) -> bool:
+        """
+        Verilen anahtarların bulunduğu parçaları (keys None ise tümünü) yeniden yazar.
+        Parça üyelikleri yalnızca değişen anahtarlar için güncellendiğinden bir kayıt,
+        tüm kütüphaneyi değil, yalnızca değişen parçaların kitaplarını dolaşır.
+        """
+        shards, members = self.shards, self._shard_members
+        if members is None or keys is None:
+            members = [{} for _ in range(shards)]
+            for book in snapshot:
+                members[shard_of(book.isbn, shards)][book.isbn] = book
+            touched = range(shards) if keys is None else {shard_of(key, shards) for key in keys}
+        else:
+            touched = set()
+            for key in keys:
+                index = shard_of(key, shards)
+                touched.add(index)
+                book = snapshot.get(key)
+                if book is None:
+                    members[index].pop(key, None)
+                else:
+                    members[index][key] = book
+        contents: Dict[int, List[dict]] = {}
+        for index in touched:
+            records = contents[index] = []
+            for book in members[index].values():
+                data = book.to_storage_dict()
+                data["order"] = book.order
+                records.append(data)
+        saved = write_shards(shard_dir(self.data_file), shards, contents)
+        # Yazılamayan sürüm yayımlanmayabilir; üyelikler bir sonraki kayıtta yeniden kurulur
+        self._shard_members = members if saved else None
+        return saved
+
+    def add_book_manual(self, book: Book) -> bool:
+        """
+        Manuel olarak bir Book nesnesini kütüphaneye ekler ve dosyayı günceller.
+        Args:
+            book (Book): Eklenecek Book nesnesi.
+        Returns:
+            bool: Kitap başarıyla eklendiyse True, aksi takdirde False.
+        """
+        if not book.isbn.strip() or not book.title.strip() or not book.author.strip():
+            print("Hata: Kitap bilgileri (başlık, yazar, ISBN) boş olamaz.")
+            return False
+
+        isbn = normalize_isbn(book.isbn)
+        if isbn is None:
+            print(f"Hata: Geçersiz ISBN: {book.isbn}. ISBN-10 veya ISBN-13 olmalı ve kontrol basamağı doğru olmalıdır.")
+            return False
+
+        with self._write_lock:
+            if self._snapshot.get(isbn) is not None:
+                print(f"Hata: Bu ISBN'ye sahip kitap kütüphanede zaten mevcut: {book.isbn}")
+                return False
+
+            book.isbn = isbn
+            snapshot = self._snapshot.with_book(self._stamp(book))
+            self.save_books(snapshot, [isbn])
+            self._publish(snapshot, [(Change.ADD, book)])
+            if self._fuzzy is not None:
+                self._fuzzy.add(isbn, book.search_key, folded=True)
+        print(f"Kitap başarıyla manuel olarak eklendi: {book}")
+        return True
+
+    def bulk_load(self, books: Iterable[Book], limit: Optional[int] = None) -> int:
+        """
+        Çok sayıda kitabı tek seferde ekler ve dosyayı yalnızca bir kez kaydeder.
+        Open Library döküm dosyalarından içe aktarma gibi toplu işlemler için kullanılır;
+        kitaplar sırayla tüketildiği için verilen iterable bir üreteç olabilir.
+        Geçersiz ISBN'li, bilgileri eksik veya kütüphanede zaten bulunan kitaplar atlanır.
+        Args:
+            books (iterable): Eklenecek Book nesneleri.
+            limit (int): Eklenecek en fazla kitap sayısı; atlanan kitaplar sayılmaz. Sınıra
+                ulaşıldığında kalan kitaplar okunmaz. None ise sınırsız.
+        Returns:
+            int: Eklenen kitap sayısı.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            added: Dict[str, Book] = {}
+            for book in books:
+                isbn = normalize_isbn(book.isbn)
+                if (isbn is None or isbn in added or snapshot.get(isbn) is not None
+                        or not book.title.strip() or not book.author.strip()):
+                    continue
+                book.isbn = isbn
+                added[isbn] = book
+                if limit is not None and len(added) >= limit:
+                    break
+
+            if added:
+                for book in added.values():
+                    self._stamp(book)
+                if len(added) * 8 < len(snapshot):
+                    for book in added.values():
+                        snapshot = snapshot.with_book(book)
+                else:
+                    # Çok sayıda ekleme tek tek yol kopyalamak yerine tek geçişte yeni sürüm olarak kurulur
+                    snapshot = LibrarySnapshot.from_books([*snapshot, *added.values()])
+                self.save_books(snapshot, added.keys())
+                self._publish(snapshot, ((Change.ADD, book) for book in added.values()))
+                if self._fuzzy is not None:
+                    for isbn, book in added.items():
+                        self._fuzzy.add(isbn, book.search_key, folded=True)
+        return len(added)
+
+    def apply_batch(self, operations: List[dict]) -> Tuple[bool, List[dict]]:
+        """
+        Ekleme ve silme işlemlerini tek bir işlem (transaction) olarak uygular: ya hepsi
+        uygulanır ya da hiçbiri. Önce tüm işlemler, kendilerinden önceki işlemlerin
+        etkisi de hesaba katılarak doğrulanır; biri bile hatalıysa kütüphane değişmez.
+        Hepsi geçerliyse yeni sürüm kurulur, dosya bir kez kaydedilir ve sürüm tek seferde yayımlanır.
+        Args:
+            operations (list): İşlemler. Ekleme için {"op": "add", "title", "author", "isbn"},
+                silme için {"op": "remove", "isbn"}.
+        Returns:
+            tuple: (uygulandı mı, işlem başına sonuçlar). Her sonuç {"index", "op", "isbn",
+                "status" ("ok" veya "error"), "error"} alanlarını içerir.
+        """
+        with self._write_lock:
+            # Toplu işlem sonunda değişecek anahtarların son durumu (None: silindi)
+            pending: Dict[str, Optional[Book]] = {}
+            log: List[Tuple[str, Book]] = []
+            results: List[dict] = []
+            base = self._snapshot
+
+            def exists(key: str) -> bool:
+                return pending[key] is not None if key in pending else base.get(key) is not None
+
+            for i, operation in enumerate(operations):
+                op = operation.get("op")
+                raw_isbn = str(operation.get("isbn") or "").strip()
+                result = {"index": i, "op": op, "isbn": raw_isbn, "status": "ok", "error": None}
+                results.append(result)
+
+                if op == "add":
+                    title = str(operation.get("title") or "").strip()
+                    author = str(operation.get("author") or "").strip()
+                    isbn = normalize_isbn(raw_isbn)
+                    if not title or not author or not raw_isbn:
+                        result["error"] = "Kitap bilgileri (başlık, yazar, ISBN) boş olamaz."
+                    elif isbn is None:
+                        result["error"] = "Geçersiz ISBN. ISBN-10 veya ISBN-13 olmalı ve kontrol basamağı doğru olmalıdır."
+                    elif exists(isbn):
+                        result["isbn"] = isbn
+                        result["error"] = "Bu ISBN'ye sahip kitap kütüphanede zaten mevcut."
+                    else:
+                        result["isbn"] = isbn
+                        book = Book(title, author, isbn)
+                        pending[isbn] = book
+                        log.append((Change.ADD, book))
+                elif op == "remove":
+                    key = self._isbn_key(raw_isbn) if raw_isbn else ""
+                    if not key or not exists(key):
+                        result["error"] = "Bu ISBN'ye sahip kitap kütüphanede bulunamadı."
+                    else:
+                        result["isbn"] = key
+                        log.append((Change.REMOVE, pending[key] if key in pending else base.get(key)))
+                        pending[key] = None
+                else:
+                    result["error"] = f"Bilinmeyen işlem: {op}. 'add' veya 'remove' olmalıdır."
+
+                if result["error"] is not None:
+                    result["status"] = "error"
+
+            if any(result["status"] == "error" for result in results):
+                print(f"Hata: Toplu işlem uygulanmadı; {sum(r['status'] == 'error' for r in results)} işlem geçersiz.")
+                return False, results
+            if not pending:
+                return True, results
+
+            # Yeni sürümü kur: değişmeyen kitaplar sırasını korur, yeni eklenenler sona eklenir.
+            # Sürüm dosyaya yazılamazsa yayımlanmaz; okuyucular hiçbir ara durumu görmez.
+            for book in pending.values():
+                if book is not None:
+                    self._stamp(book)
+            if len(pending) * 8 < len(base):
+                snapshot = base
+                for key, book in pending.items():
+                    snapshot = snapshot.without(key)
+                    if book is not None:
+                        snapshot = snapshot.with_book(book)
+            else:
+                books = [book for book in base if book.isbn not in pending]
+                books.extend(book for book in pending.values() if book is not None)
+                snapshot = LibrarySnapshot.from_books(books)
+
+            if not self.save_books(snapshot, pending.keys()):
+                return False, results
+            self._publish(snapshot, log)
+
+            if self._fuzzy is not None:
+                for key, book in pending.items():
+                    if book is None:
+                        self._fuzzy.remove(key)
+                    else:
+                        self._fuzzy.add(key, book.search_key, folded=True)
+            print(f"Toplu işlem uygulandı: {len(operations)} işlem.")
+            return True, results
+
+    async def add_book_from_api(self, isbn: str) -> Optional[Book]:
+        """
+        Yeni bir Book nesnesini kütüphaneye Open Library API'sinden çekerek ekler.
+        Yazar adlarını almak için ek API çağrıları yapabilir.
+        Args:
+            isbn (str): Eklenecek kitabın ISBN numarası (ISBN-10 veya ISBN-13, tireli olabilir).
+        Returns:
+            Book: Başarılı olursa eklenen Book nesnesi, aksi takdirde None.
+        Raises:
+            CircuitOpenError: Open Library devre kesici nedeniyle geçici olarak kullanılamıyorsa.
+                Bu durum "kitap bulunamadı" sonucundan ayrılsın diye None yerine iletilir;
+                çağıran istek daha sonra yeniden denenebilir.
+        """
+        # ISBN boşsa hata döndür
+        if not isbn.strip():
+            print("Hata: ISBN boş olamaz.")
+            return None
+
+        # Geçersiz ISBN'ler ağ isteği yapılmadan reddedilir
+        canonical = normalize_isbn(isbn)
+        if canonical is None:
+            print(f"Hata: Geçersiz ISBN: {isbn}. ISBN-10 veya ISBN-13 olmalı ve kontrol basamağı doğru olmalıdır.")
+            return None
+        isbn = canonical
+
+        # Kitap zaten mevcut mu kontrol et
+        if self._snapshot.get(isbn) is not None:
+            print(f"Hata: ISBN {isbn} zaten kütüphanede mevcut.")
+            return None
+
+        # Yakın zamanda bulunamayan ISBN'ler süre dolana kadar Open Library'ye yeniden sorulmaz
+        cache = self.openlibrary.cache
+        cache_key = f"/isbn/{isbn}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(cached[1])
+            return None
+
+        import asyncio
+        import httpx
+
+        # Open Library API'den kitap bilgilerini çekme
+        api_url = f"https://openlibrary.org/isbn/{isbn}.json"
+        try:
+            # Kitap ve yazar istekleri için tek bir httpx.AsyncClient (bağlantı havuzu) kullan
+            async with httpx.AsyncClient(transport=self.transport, headers={"User-Agent": USER_AGENT}) as client:
+                response = await self.openlibrary.get(client, api_url, timeout=httpx.Timeout(BOOK_TIMEOUT, connect=CONNECT_TIMEOUT), follow_redirects=True)
+                
+                if not response.is_success:
+                    if response.status_code == 404:
+                        message = f"Hata: Verilen ISBN ({isbn}) ile kitap bulunamadı."
+                        cache.put_negative(cache_key, message)
+                        print(message)
+                    elif response.status_code == 302:
+                        print(f"Hata: API isteği bir yönlendirme hatasıyla karşılaştı. ISBN için bilgi alınamadı: {isbn}.")
+                    else:
+                        print(f"Hata: API'den beklenmeyen durum kodu: {response.status_code} (ISBN: {isbn}).")
+                    return None
+                
+                data = response.json()
+
+                title = data.get('title')
+                if not title:
+                    message = f"Hata: API'den kitap başlığı alınamadı (ISBN: {isbn})."
+                    cache.put_negative(cache_key, message)
+                    print(message)
+                    return None
+
+                authors_list = data.get('authors') 
+                
+                author_names = "Bilinmiyor"
+                if authors_list:
+                    # Yazar bilgileri eşzamanlı olarak çekilir; hız sınırı OpenLibraryClient tarafından uygulanır
+                    fetched_author_names = await asyncio.gather(
+                        *(self._fetch_author_name(client, author_info) for author_info in authors_list)
+                    )
+                    
+                    if fetched_author_names:
+                        author_names = ", ".join(fetched_author_names)
+                    else:
+                        author_names = "Bilinmiyor (Yazar Bilgisi Yok)"
+
+            with self._write_lock:
+                # Ağ isteği sürerken aynı ISBN başka bir istekle eklenmiş olabilir
+                if self._snapshot.get(isbn) is not None:
+                    print(f"Hata: ISBN {isbn} zaten kütüphanede mevcut.")
+                    return None
+
+                new_book = Book(title, author_names, isbn)
+                snapshot = self._snapshot.with_book(self._stamp(new_book))
+                self.save_books(snapshot, [isbn])
+                self._publish(snapshot, [(Change.ADD, new_book)])
+                if self._fuzzy is not None:
+                    self._fuzzy.add(isbn, new_book.search_key, folded=True)
+            print(f"Kitap başarıyla API aracılığıyla eklendi: {new_book}")
+            return new_book
+
+        except CircuitOpenError as e:
+            print(f"Hata: {e} (ISBN: {isbn}).")
+            raise
+        except httpx.RequestError as e:
+            print(f"Hata: API isteği başarısız oldu (ağ hatası, DNS sorunu vb.) - {e} (ISBN: {isbn}). Lütfen internet bağlantınızı kontrol edin veya ISBN'i doğrulayın.")
+            return None
+        except json.JSONDecodeError:
+            print(f"Hata: API yanıtı JSON olarak ayrıştırılamadı. Yanlış format veya boş yanıt (ISBN: {isbn}).")
+            return None
+        except Exception as e:
+            print(f"Beklenmeyen bir hata oluştu: {e} (ISBN: {isbn}).")
+            return None
+
+    async def _fetch_author_name(self, client: "httpx.AsyncClient", author_info) -> str:
+        """
+        Open Library kitap kaydındaki tek bir yazar girdisinden yazar adını döndürür.
+        Girdide yalnızca 'key' varsa yazar detayları ek bir API çağrısıyla çekilir.
+        Args:
+            client (httpx.AsyncClient): İstekte kullanılacak istemci.
+            author_info: Kitap kaydının 'authors' listesindeki girdi.
+        Returns:
+            str: Yazar adı veya hatanın nedenini belirten "Bilinmeyen Yazar (...)" metni.
+        """
+        if isinstance(author_info, dict) and 'name' in author_info:
+            # Eğer 'name' doğrudan varsa, kullan
+            return author_info['name']
+        if not (isinstance(author_info, dict) and 'key' in author_info):
+            return "Bilinmeyen Yazar (Geçersiz Format)"
+
+        # Aynı yazarın kitapları için yazar detayları önbellekten okunur
+        cache = self.openlibrary.cache
+        cached = cache.get(author_info['key'])
+        if cached is not None:
+            return cached[1]
+
+        import httpx
+
+        # Eğer sadece 'key' varsa, yazar detaylarını çekmek için ek API çağrısı yap
+        author_detail_url = f"https://openlibrary.org{author_info['key']}.json"
+        try:
+            author_response = await self.openlibrary.get(client, author_detail_url, timeout=httpx.Timeout(AUTHOR_TIMEOUT, connect=CONNECT_TIMEOUT))
+            if not author_response.is_success:
+                name = f"Bilinmeyen Yazar (API Durum Kodu: {author_response.status_code})"
+                if author_response.status_code == 404:
+                    cache.put_negative(author_info['key'], name)
+                return name
+            author_data = author_response.json()
+            if 'name' in author_data:
+                cache.put(author_info['key'], author_data['name'])
+                return author_data['name']
+            cache.put_negative(author_info['key'], "Bilinmeyen Yazar (Detay Yok)")
+            return "Bilinmeyen Yazar (Detay Yok)"
+        except (httpx.RequestError, CircuitOpenError):
+            return "Bilinmeyen Yazar (API Hatası)"
+        except json.JSONDecodeError:
+            return "Bilinmeyen Yazar (JSON Hatası)"
+
+    def remove_book(self, isbn: str) -> bool:
+        """
+        ISBN numarasına göre bir kitabı kütüphaneden siler.
+        Args:
+            isbn (str): Silinecek kitabın ISBN numarası.
+        Returns:
+            bool: Kitap başarıyla silindiyse True, bulunamadıysa False.
+        """
+        key = self._isbn_key(isbn)
+        with self._write_lock:
+            book = self._snapshot.get(key)
+            if book is not None:
+                # Silinen kitap yeni sürümde yer almaz; eski sürümü okuyanlar etkilenmez
+                snapshot = self._snapshot.without(key)
+                self.save_books(snapshot, [key])
+                self._publish(snapshot, [(Change.REMOVE, book)])
+                if self._fuzzy is not None:
+                    self._fuzzy.remove(key)
+        if book is not None:
+            print(f"ISBN {isbn} numaralı kitap başarıyla silindi.")
+            return True
+        else:
+            print(f"Hata: ISBN {isbn} numaralı kitap kütüphanede bulunamadı.")
+            return False
+
+    def list_books(self) -> LibrarySnapshot:
+        """
+        Kütüphanedeki tüm kitapları listeler.
+        Returns:
+            LibrarySnapshot: Listelenen kitapların sürümü.
+        """
+        snapshot = self._snapshot
+        if not snapshot:
+            print("Kütüphanede henüz kitap bulunmamaktadır.")
+        else:
+            print("\n--- Kütüphanedeki Kitaplar ---")
+            for i, book in enumerate(snapshot, 1):
+                print(f"{i}. {book}")
+            print("------------------------------")
+        return snapshot
+
+    def find_book(self, isbn: str) -> Optional[Book]:
+        """
+        ISBN ile belirli bir kitabı bulur.
+        Args:
+            isbn (str): Aranacak kitabın ISBN numarası.
+        Returns:
+            Book: Bulunan Book nesnesi, bulunamazsa None.
+        """
+        book = self._snapshot.get(self._isbn_key(isbn))
+        if book is not None:
+            print(f"Kitap bulundu: {book}")
+            return book
+        print(f"ISBN {isbn} numaralı kitap bulunamadı.")
+        return None
+
+    def search_books(self, query: str) -> List[Book]:
+        """
+        Başlık veya yazar adına göre kitapları arar.
+        Args:
+            query (str): Arama sorgusu.
+        Returns:
+            List[Book]: Arama sonuçlarına uyan kitapların listesi.
+        """
+        key = fold(query)
+        found_books = [book for book in self._snapshot if key in book.search_key]
+        if found_books:
+            print(f"\n'{query}' için {len(found_books)} sonuç bulundu:")
+            print("-" * 50)
+            for i, book in enumerate(found_books, 1):
+                print(f"{i}. {book}")
+            print("-" * 50)
+        else:
+            print(f"'{query}' için sonuç bulunamadı.")
+        return found_books
+
+    def fuzzy_search_books(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[Book, float]]:
+        """
+        Başlık ve yazar adında yazım hatalarına toleranslı arama yapar.
+        Sorgudaki her kelime, kitaplardaki benzer kelimelerle trigram ve düzenleme
+        benzerliğine göre eşleştirilir (ör. "goerge orwel" -> "George Orwell").
+        Args:
+            query (str): Arama sorgusu.
+            limit (int): Döndürülecek en fazla sonuç sayısı.
+            min_score (float): Sonuçlara dahil edilmek için gereken en düşük benzerlik (0-1).
+        Returns:
+            List[Tuple[Book, float]]: (kitap, benzerlik puanı) çiftleri, puana göre azalan sırada.
+        """
+        # Dizin yazma kilidi altında güncellendiği için arama da kilit altında yapılır
+        with self._write_lock:
+            snapshot = self._snapshot
+            matches = self.build_search_index().search(query, limit=limit, min_score=min_score)
+        results = [(snapshot.get(key), score) for key, score in matches]
+        if results:
+            print(f"\n'{query}' için {len(results)} benzer sonuç bulundu:")
+            print("-" * 50)
+            for i, (book, score) in enumerate(results, 1):
+                print(f"{i}. {book} (benzerlik: %{score * 100:.0f})")
+            print("-" * 50)
+        else:
+            print(f"'{query}' için benzer sonuç bulunamadı.")
+        return results
+
+    def get_book_count(self) -> int:
+        """Kütüphanedeki toplam kitap sayısını döndürür."""
+        return len(self._snapshot)
+
+    def get_author_statistics(self) -> dict:
+        """Yazar istatistiklerini (her yazarın kaç kitabı olduğunu) döndürür."""
+        authors = {}
+        for book in self._snapshot:
+            authors[book.author] = authors.get(book.author, 0) + 1
+        return authors
+
+    def clear_library(self) -> bool:
+        """Tüm kütüphaneyi temizler ve değişiklikleri kaydeder."""
+        snapshot = LibrarySnapshot()
+        with self._write_lock:
+            self.save_books(snapshot)
+            self._publish(snapshot, [(Change.CLEAR, None)])
+            self._fuzzy = None
+        print("Kütüphanedeki tüm kitaplar silindi.")
+        return True
+
@@ -0,0 +1,308 @@
+import argparse
+import collections
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from classes import Book, Library
+from isbn import normalize_isbn
+
+# Open Library döküm dosyalarındaki sütunlar: tür, anahtar, revizyon, son değişiklik, JSON kayıt.
+# https://openlibrary.org/developers/dumps
+EDITION_TYPE = b"/type/edition"
+AUTHOR_TYPE = b"/type/author"
+# SQLite'ın tek sorguda kabul ettiği parametre sayısı sınırının altında kalan parça boyu
+SQL_CHUNK = 500
+
+
+def open_dump(path: str) -> BinaryIO:
+    """
+    Döküm dosyasını satır satır okunmak üzere açar. .gz dosyaları akış halinde
+    açılır; dosyanın tamamı belleğe veya diske açılmaz.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_batches(path: str, batch_size: int) -> Iterator[List[bytes]]:
+    """Döküm dosyasının satırlarını batch_size uzunluğunda listeler halinde üretir."""
+    with open_dump(path) as f:
+        batch: List[bytes] = []
+        for line in f:
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _record(line: bytes, record_type: bytes) -> Optional[dict]:
+    """Döküm satırı verilen türdense JSON kaydını döndürür; değilse veya bozuksa None."""
+    if not line.startswith(record_type):
+        return None
+    fields = line.rstrip(b"\n").split(b"\t", 4)
+    if len(fields) != 5:
+        return None
+    try:
+        return json.loads(fields[4])
+    except ValueError:
+        return None
+
+
+def parse_author_lines(lines: List[bytes]) -> List[Tuple[str, str]]:
+    """
+    Yazar döküm satırlarını ayrıştırır. İşlem havuzunda çalışır.
+    Args:
+        lines (list): Döküm dosyasından okunan ham satırlar.
+    Returns:
+        list: (yazar anahtarı, yazar adı) çiftleri, ör. ("/authors/OL23919A", "J. K. Rowling").
+    """
+    authors = []
+    for line in lines:
+        data = _record(line, AUTHOR_TYPE)
+        if data is None:
+            continue
+        key, name = data.get("key"), data.get("name")
+        if isinstance(key, str) and isinstance(name, str) and name.strip():
+            authors.append((key, name.strip()))
+    return authors
+
+
+def parse_edition_lines(lines: List[bytes]) -> List[Tuple[str, str, List[str]]]:
+    """
+    Baskı (edition) döküm satırlarını ayrıştırır. İşlem havuzunda çalışır.
+    Geçerli bir ISBN'i veya başlığı olmayan kayıtlar atlanır; önce ISBN-13,
+    yoksa ISBN-10 kullanılır ve kanonik ISBN-13'e çevrilir.
+    Args:
+        lines (list): Döküm dosyasından okunan ham satırlar.
+    Returns:
+        list: (kanonik ISBN, başlık, yazar anahtarları) üçlüleri.
+    """
+    editions = []
+    for line in lines:
+        data = _record(line, EDITION_TYPE)
+        if data is None:
+            continue
+        title = data.get("title")
+        if not isinstance(title, str) or not title.strip():
+            continue
+        isbn = None
+        for field in ("isbn_13", "isbn_10"):
+            values = data.get(field)
+            for candidate in values if isinstance(values, list) else []:
+                isbn = normalize_isbn(candidate)
+                if isbn is not None:
+                    break
+            if isbn is not None:
+                break
+        if isbn is None:
+            continue
+        author_keys = [
+            author["key"] for author in data.get("authors") or []
+            if isinstance(author, dict) and isinstance(author.get("key"), str)
+        ]
+        editions.append((isbn, title.strip(), author_keys))
+    return editions
+
+
+def parallel_map(executor: Executor, func, batches: Iterable[List[bytes]], max_in_flight: int) -> Iterator[list]:
+    """
+    Parçaları işlem havuzunda işler ve sonuçları okuma sırasıyla üretir.
+    Aynı anda en fazla max_in_flight parça havuzda bekler; dosya okuma, işlemcilerden
+    hızlı olsa bile bellekte sınırlı sayıda parça tutulur.
+    """
+    pending = collections.deque()
+    try:
+        for batch in batches:
+            pending.append(executor.submit(func, batch))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Tüketici erken durursa (ör. --limit dolduğunda) henüz başlamamış parçalar iptal edilir
+        for future in pending:
+            future.cancel()
+
+
+# AuthorTable sınıfı, yazar anahtarlarını adlara eşleyen diskteki SQLite tablosudur.
+class AuthorTable:
+    def __init__(self, path: str):
+        """
+        AuthorTable sınıfının yapıcı metodu.
+        Args:
+            path (str): SQLite veritabanı dosyası. Milyonlarca yazar belleğe alınmadan diskte tutulur.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        # Tablo yeniden oluşturulabilir bir ara veridir; dayanıklılık yerine hız tercih edilir
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS authors (key TEXT PRIMARY KEY, name TEXT NOT NULL)")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0]
+
+    def add_many(self, authors: List[Tuple[str, str]]):
+        """Yazarları tabloya ekler; aynı anahtar tekrar gelirse son ad geçerli olur."""
+        self._conn.executemany("INSERT OR REPLACE INTO authors (key, name) VALUES (?, ?)", authors)
+
+    def commit(self):
+        """Eklenen yazarları veritabanına yazar."""
+        self._conn.commit()
+
+    def lookup(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Verilen yazar anahtarlarının adlarını döndürür.
+        Returns:
+            dict: Anahtardan ada eşleme; tabloda olmayan anahtarlar sözlükte yer almaz.
+        """
+        keys = list(keys)
+        names: Dict[str, str] = {}
+        for i in range(0, len(keys), SQL_CHUNK):
+            chunk = keys[i:i + SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            names.update(self._conn.execute(
+                f"SELECT key, name FROM authors WHERE key IN ({placeholders})", chunk
+            ))
+        return names
+
+    def close(self):
+        self._conn.close()
+
+
+# DumpImporter sınıfı, Open Library döküm dosyalarını kütüphaneye toplu olarak aktarır.
+class DumpImporter:
+    """
+    Open Library döküm dosyalarından çevrimdışı ve akış halinde içe aktarma.
+
+    1. Yazar dökümü okunur, satırlar işlem havuzunda ayrıştırılır ve yazarlar
+       diskteki bir SQLite tablosuna yazılır.
+    2. Baskı dökümü okunur, satırlar işlem havuzunda ayrıştırılır; her parçadaki
+       yazar anahtarları tek sorguyla tablodan çözülür ve Book nesneleri üretilir.
+    3. Kitaplar Library.bulk_load ile tek seferde eklenir ve dosya bir kez kaydedilir.
+
+    Dosyalar sıkıştırılmış halde akış olarak okunur ve havuzda aynı anda sınırlı
+    sayıda parça bulunur; bellek kullanımı döküm boyutuyla değil, eklenen kitap
+    sayısıyla büyür.
+    """
+
+    def __init__(self, library: Library, workers: Optional[int] = None, batch_size: int = 5000,
+                 author_db: Optional[str] = None):
+        """
+        DumpImporter sınıfının yapıcı metodu.
+        Args:
+            library (Library): Kitapların ekleneceği kütüphane.
+            workers (int): Ayrıştırma için işlem sayısı. None ise işlemci sayısı kadar.
+            batch_size (int): İşlem havuzuna tek seferde gönderilen satır sayısı.
+            author_db (str): Yazar tablosunun saklanacağı SQLite dosyası. Verilirse sonraki
+                içe aktarmalarda yazar dökümü yeniden okunmadan kullanılabilir; None ise
+                geçici bir dosya kullanılır ve iş bitince silinir.
+        """
+        self.library = library
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.author_db = author_db
+        self.stats = {"author_lines": 0, "authors": 0, "edition_lines": 0, "editions": 0,
+                      "added": 0, "unresolved_authors": 0}
+
+    def load_authors(self, executor: Executor, table: AuthorTable, authors_path: str):
+        """Yazar dökümünü okuyup yazar tablosuna yazar."""
+        for authors in parallel_map(executor, parse_author_lines,
+                                    self._counted(read_batches(authors_path, self.batch_size), "author_lines"),
+                                    self.workers * 2):
+            table.add_many(authors)
+            self.stats["authors"] += len(authors)
+        table.commit()
+
+    def iter_books(self, executor: Executor, table: AuthorTable, editions_path: str) -> Iterator[Book]:
+        """Baskı dökümünden, yazar adları çözülmüş Book nesneleri üretir."""
+        for editions in parallel_map(executor, parse_edition_lines,
+                                     self._counted(read_batches(editions_path, self.batch_size), "edition_lines"),
+                                     self.workers * 2):
+            names = table.lookup({key for _, _, keys in editions for key in keys})
+            for isbn, title, author_keys in editions:
+                if author_keys:
+                    resolved = [names.get(key) for key in author_keys]
+                    self.stats["unresolved_authors"] += resolved.count(None)
+                    author = ", ".join(name or "Bilinmeyen Yazar (Detay Yok)" for name in resolved)
+                else:
+                    author = "Bilinmiyor"
+                self.stats["editions"] += 1
+                yield Book(title, author, isbn)
+
+    def _counted(self, batches: Iterable[List[bytes]], stat: str) -> Iterator[List[bytes]]:
+        """Okunan satır sayısını istatistiklere ekleyerek parçaları aktarır."""
+        for batch in batches:
+            self.stats[stat] += len(batch)
+            yield batch
+
+    def run(self, editions_path: str, authors_path: Optional[str] = None, limit: Optional[int] = None) -> dict:
+        """
+        İçe aktarmayı çalıştırır.
+        Args:
+            editions_path (str): Baskı döküm dosyası (ol_dump_editions_*.txt.gz).
+            authors_path (str): Yazar döküm dosyası (ol_dump_authors_*.txt.gz). None ise
+                yazar tablosu author_db dosyasından kullanılır.
+            limit (int): Eklenecek en fazla kitap sayısı. Geçersiz veya kütüphanede zaten
+                bulunan baskılar sayılmaz; sınır dolunca döküm okunmayı bırakır. None ise sınırsız.
+        Returns:
+            dict: Okunan satır, ayrıştırılan kayıt ve eklenen kitap sayıları.
+        """
+        if self.author_db is None:
+            fd, db_path = tempfile.mkstemp(prefix="ol_authors_", suffix=".sqlite3")
+            os.close(fd)
+        else:
+            db_path = self.author_db
+        table = AuthorTable(db_path)
+        try:
+            with ProcessPoolExecutor(self.workers) as executor:
+                if authors_path is not None:
+                    self.load_authors(executor, table, authors_path)
+                books = self.iter_books(executor, table, editions_path)
+                try:
+                    self.stats["added"] = self.library.bulk_load(books, limit)
+                finally:
+                    books.close()
+        finally:
+            table.close()
+            if self.author_db is None and os.path.exists(db_path):
+                os.remove(db_path)
+        return self.stats
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Open Library döküm dosyalarını kütüphaneye toplu olarak aktarır.")
+    parser.add_argument("--editions", required=True, help="Baskı döküm dosyası (ol_dump_editions_*.txt.gz)")
+    parser.add_argument("--authors", help="Yazar döküm dosyası (ol_dump_authors_*.txt.gz)")
+    parser.add_argument("--data-file", default="library.json", help="Kitapların ekleneceği veri dosyası")
+    parser.add_argument("--author-db", help="Yazar tablosunu saklamak ve sonraki çalıştırmalarda kullanmak için SQLite dosyası")
+    parser.add_argument("--workers", type=int, default=None, help="Ayrıştırma işlem sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="İşlem havuzuna tek seferde gönderilen satır sayısı")
+    parser.add_argument("--limit", type=int, default=None, help="Eklenecek en fazla kitap sayısı (atlanan baskılar sayılmaz)")
+    args = parser.parse_args(argv)
+
+    if args.authors is None and args.author_db is None:
+        print("Uyarı: --authors veya --author-db verilmedi; yazar adları çözülemeyecek.")
+
+    library = Library(args.data_file)
+    importer = DumpImporter(library, args.workers, args.batch_size, args.author_db)
+    started = time.perf_counter()
+    stats = importer.run(args.editions, args.authors, args.limit)
+    elapsed = time.perf_counter() - started
+
+    print(f"Yazar dökümü: {stats['author_lines']} satır, {stats['authors']} yazar")
+    print(f"Baskı dökümü: {stats['edition_lines']} satır, ISBN'li {stats['editions']} kayıt")
+    print(f"Çözülemeyen yazar anahtarı: {stats['unresolved_authors']}")
+    print(f"Eklenen kitap: {stats['added']} ({elapsed:.1f} sn). Toplam kitap: {library.get_book_count()}")
+
+
+if __name__ == "__main__":
+    main()
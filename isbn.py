@@ -0,0 +1,69 @@
+from typing import Optional
+
+# ISBN'lerde ayraç olarak kabul edilen ve normalleştirmede atılan karakterler.
+_SEPARATORS = str.maketrans("", "", "- \t")
+
+
+def isbn13_check_digit(first12: str) -> str:
+    """
+    ISBN-13'ün ilk 12 hanesinden kontrol basamağını hesaplar.
+    Args:
+        first12 (str): 12 haneli rakam dizisi.
+    Returns:
+        str: Tek haneli kontrol basamağı.
+    """
+    total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def isbn10_check_digit(first9: str) -> str:
+    """
+    ISBN-10'un ilk 9 hanesinden kontrol basamağını hesaplar.
+    Args:
+        first9 (str): 9 haneli rakam dizisi.
+    Returns:
+        str: "0"-"9" arası bir rakam veya "X".
+    """
+    total = sum(int(d) * (10 - i) for i, d in enumerate(first9))
+    check = (11 - total % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def normalize_isbn(raw: str) -> Optional[str]:
+    """
+    ISBN-10 veya ISBN-13 girdisini doğrular ve kanonik ISBN-13 biçimine çevirir.
+    Tire ve boşluklar yok sayılır; "978-0451524935", "0451524934" ve
+    "9780451524935" aynı anahtarı ("9780451524935") üretir.
+    Args:
+        raw (str): Kullanıcıdan veya dosyadan gelen ISBN.
+    Returns:
+        str: Kanonik 13 haneli ISBN; girdi geçerli bir ISBN değilse None.
+    """
+    if not isinstance(raw, str):
+        return None
+    value = raw.translate(_SEPARATORS).upper()
+    # str.isdigit "²" gibi int() ile çevrilemeyen Unicode rakamlarını da kabul eder
+    if not value.isascii():
+        return None
+
+    if len(value) == 10:
+        if not value[:9].isdigit() or not (value[9].isdigit() or value[9] == "X"):
+            return None
+        if isbn10_check_digit(value[:9]) != value[9]:
+            return None
+        first12 = "978" + value[:9]
+        return first12 + isbn13_check_digit(first12)
+
+    if len(value) == 13:
+        if not value.isdigit() or not value.startswith(("978", "979")):
+            return None
+        if isbn13_check_digit(value[:12]) != value[12]:
+            return None
+        return value
+
+    return None
+
+
+def is_valid_isbn(raw: str) -> bool:
+    """Girdinin kontrol basamağı doğru bir ISBN-10 veya ISBN-13 olup olmadığını döndürür."""
+    return normalize_isbn(raw) is not None
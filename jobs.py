@@ -0,0 +1,349 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from isbn import normalize_isbn
+from openlibrary import CircuitOpenError
+
+
+# ImportJob sınıfı, arka planda Open Library'den yapılacak tek bir kitap içe aktarımını temsil eder.
+class ImportJob:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    def __init__(self, isbn: str, job_id: Optional[str] = None, status: str = QUEUED,
+                 created_at: Optional[float] = None):
+        """
+        ImportJob sınıfının yapıcı metodu.
+        Args:
+            isbn (str): İçe aktarılacak kitabın ISBN numarası.
+            job_id (str): İşin benzersiz kimliği. Verilmezse yeni bir kimlik üretilir.
+            status (str): İşin durumu (queued, running, succeeded, failed).
+            created_at (float): İşin oluşturulma zamanı (Unix zamanı).
+        """
+        self.id = job_id or uuid.uuid4().hex
+        self.isbn = isbn
+        self.status = status
+        self.created_at = created_at if created_at is not None else time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.book: Optional[dict] = None
+
+    @property
+    def finished(self) -> bool:
+        """İş tamamlandıysa (başarılı veya başarısız) True döndürür."""
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def to_dict(self) -> dict:
+        """ImportJob nesnesini bir sözlüğe dönüştürür. JSON'a kaydetmek ve API yanıtları için kullanılır."""
+        return {
+            "id": self.id,
+            "isbn": self.isbn,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "attempts": self.attempts,
+            "error": self.error,
+            "book": self.book,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Sözlükten bir ImportJob nesnesi oluşturur. JSON'dan yüklemek için kullanılır."""
+        job = cls(data["isbn"], data["id"], data["status"], data["created_at"])
+        job.started_at = data.get("started_at")
+        job.finished_at = data.get("finished_at")
+        job.attempts = data.get("attempts", 0)
+        job.error = data.get("error")
+        job.book = data.get("book")
+        return job
+
+
+# ImportJobQueue sınıfı, ISBN içe aktarımlarını sınırlı sayıda işçiyle arka planda işler.
+class ImportJobQueue:
+    def __init__(self, library, jobs_file: Optional[str] = None, workers: int = 4,
+                 max_pending: int = 1000, max_finished: int = 1000, max_attempts: int = 5,
+                 min_retry_delay: float = 1.0):
+        """
+        ImportJobQueue sınıfının yapıcı metodu.
+        Args:
+            library (Library): Kitapların ekleneceği kütüphane.
+            jobs_file (str): İşlerin yeniden başlatmalar arasında saklandığı JSON Lines günlüğü.
+                None ise veri dosyasının yanındaki <data_file>.jobs.jsonl kullanılır; böylece
+                sunucu hangi dizinden başlatılırsa başlatılsın aynı kuyruk yüklenir.
+            workers (int): Aynı anda çalışan en fazla içe aktarma işi.
+            max_pending (int): Kuyrukta bekleyebilecek en fazla iş; dolunca yeni işler reddedilir.
+            max_finished (int): Durumu sorgulanabilmesi için saklanan en fazla tamamlanmış iş.
+            max_attempts (int): Open Library geçici olarak kullanılamadığında bir işin en fazla deneme sayısı.
+            min_retry_delay (float): Geçici olarak kullanılamayan Open Library için yeniden denemeden
+                önceki en kısa bekleme (saniye). Yarı açık devrede deneme isteği sürerken
+                devre kesicinin bildirdiği kalan süre 0 olabilir.
+        """
+        self.library = library
+        # Önceki sürümlerin iş dosyaları: günlüğün .json uzantılı eski biçimi ve varsayılan
+        # yolda veri dosyasıyla aynı dizindeki jobs.jsonl / jobs.json. Günlük yoksa ilk
+        # bulunan okunup günlüğe taşınır.
+        self._legacy_files: List[str] = []
+        if jobs_file is None:
+            jobs_file = f"{library.data_file}.jobs.jsonl"
+            directory = os.path.dirname(library.data_file)
+            self._legacy_files = [os.path.join(directory, name) for name in ("jobs.jsonl", "jobs.json")]
+        elif jobs_file.endswith(".jsonl"):
+            self._legacy_files = [jobs_file[:-1]]
+        self.jobs_file = jobs_file
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.max_attempts = max_attempts
+        self.min_retry_delay = min_retry_delay
+        self._jobs: Dict[str, ImportJob] = {}
+        # Bitmemiş işlerin ISBN'den işe eşlemesi ve biten işlerin bitiş sırası (budama için)
+        self._pending: Dict[str, ImportJob] = {}
+        self._finished: Dict[str, None] = {}
+        # Günlük dosyasındaki satır sayısı; canlı iş sayısının çok üstüne çıkınca dosya sıkıştırılır
+        self._journal_lines = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.load_jobs()
+
+    def load_jobs(self) -> bool:
+        """
+        İş günlüğünü okur. Her satır bir işin son durumunu içerir; aynı işin sonraki
+        satırları öncekileri geçersiz kılar. Yarıda kalmış (running) işler tekrar
+        kuyruğa alınır. Bozuk satırlar atlanır; günlük yoksa önceki sürümlerin dosyası
+        (eski biçimde tek JSON dizisi olan jobs.json dahil) okunup günlüğe yazılır.
+        Returns:
+            bool: Yükleme başarılıysa True, aksi takdirde False.
+        """
+        self._jobs = {}
+        self._pending = {}
+        self._finished = {}
+        self._journal_lines = 0
+        path = self.jobs_file
+        if not os.path.exists(path):
+            path = next((legacy for legacy in self._legacy_files if os.path.exists(legacy)), path)
+        if not os.path.exists(path):
+            return False
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Hata: {path} dosyası okunamadı, iş kuyruğu boş başlatılıyor: {e}")
+            return False
+        rewrite = path != self.jobs_file
+        if text.lstrip().startswith("["):
+            try:
+                records = json.loads(text)
+            except json.JSONDecodeError as e:
+                print(f"Hata: {path} dosyası okunamadı, iş kuyruğu boş başlatılıyor: {e}")
+                return False
+            rewrite = True
+        else:
+            records = []
+            for line in text.splitlines():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    rewrite = True
+
+        for data in records:
+            try:
+                if data.get("deleted"):
+                    self._jobs.pop(data["id"], None)
+                    continue
+                job = ImportJob.from_dict(data)
+            except (AttributeError, KeyError, TypeError):
+                rewrite = True
+                continue
+            if job.status == ImportJob.RUNNING:
+                job.status = ImportJob.QUEUED
+            self._jobs[job.id] = job
+        self._journal_lines = len(records)
+
+        for job in self._jobs.values():
+            if not job.finished:
+                self._pending.setdefault(job.isbn, job)
+        for job in sorted((job for job in self._jobs.values() if job.finished), key=lambda j: j.finished_at or 0):
+            self._finished[job.id] = None
+        if rewrite:
+            self.save_jobs()
+        return True
+
+    def save_jobs(self) -> bool:
+        """
+        Tüm işleri günlük dosyasına yeniden yazar (sıkıştırma); her işin yalnızca son
+        durumu kalır. Yarım yazılmış bir dosya bırakmamak için önce geçici dosyaya
+        yazılır, sonra asıl dosyanın yerine taşınır.
+        Returns:
+            bool: Kaydetme başarılıysa True, aksi takdirde False.
+        """
+        temp_file = f"{self.jobs_file}.tmp"
+        try:
+            with open(temp_file, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(job.to_dict(), ensure_ascii=False) + "\n" for job in self._jobs.values())
+            os.replace(temp_file, self.jobs_file)
+            self._journal_lines = len(self._jobs)
+            return True
+        except Exception as e:
+            print(f"İş kuyruğu kaydetme hatası: {e}")
+            return False
+
+    def _append(self, records: List[dict]):
+        """
+        Kayıtları günlüğün sonuna ekler; tüm dosya yeniden yazılmaz. Günlük canlı iş
+        sayısının iki katını (en az 1000 satır) aşınca bir kez sıkıştırılır.
+        """
+        self._journal_lines += len(records)
+        if self._journal_lines > max(1000, 2 * len(self._jobs)):
+            self.save_jobs()
+            return
+        try:
+            with open(self.jobs_file, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        except OSError as e:
+            print(f"İş kuyruğu kaydetme hatası: {e}")
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """Kimliği verilen işi döndürür; yoksa None."""
+        return self._jobs.get(job_id)
+
+    def pending_count(self) -> int:
+        """Kuyrukta bekleyen veya çalışan iş sayısını döndürür."""
+        return len(self._pending)
+
+    def position(self, job: ImportJob) -> Optional[int]:
+        """Bekleyen bir işin kuyruktaki sırasını (1'den başlayarak) döndürür; beklemiyorsa None."""
+        if job.status != ImportJob.QUEUED:
+            return None
+        return 1 + sum(
+            1 for other in self._pending.values()
+            if other.status == ImportJob.QUEUED and other.created_at < job.created_at
+        )
+
+    def enqueue(self, isbn: str) -> Optional[ImportJob]:
+        """
+        Bir ISBN'i içe aktarma kuyruğuna ekler. Aynı ISBN için bekleyen veya çalışan
+        bir iş varsa yeni iş açılmaz, mevcut iş döndürülür.
+        Args:
+            isbn (str): İçe aktarılacak kitabın ISBN numarası.
+        Returns:
+            ImportJob: Kuyruğa eklenen (veya mevcut) iş; kuyruk doluysa None.
+        """
+        isbn = normalize_isbn(isbn) or isbn.strip()
+        job = self._pending.get(isbn)
+        if job is not None:
+            return job
+        if len(self._pending) >= self.max_pending:
+            return None
+
+        job = ImportJob(isbn)
+        self._jobs[job.id] = job
+        self._pending[isbn] = job
+        self._append([job.to_dict()])
+        self._ensure_started()
+        self._queue.put_nowait(job.id)
+        return job
+
+    def _ensure_started(self):
+        """
+        İşçilerin geçerli olay döngüsünde çalıştığından emin olur. İlk çağrıda veya
+        olay döngüsü değiştiyse kuyruk yeniden kurulur ve bekleyen işler eklenir.
+        Çalışan işçi kalmadığı için "running" durumundaki işler de yeniden kuyruğa alınır.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks and not all(task.done() for task in self._tasks):
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        for job in sorted(self._pending.values(), key=lambda j: j.created_at):
+            if job.status == ImportJob.RUNNING:
+                job.status = ImportJob.QUEUED
+            if job.status == ImportJob.QUEUED:
+                self._queue.put_nowait(job.id)
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def start(self):
+        """İşçileri başlatır ve önceki çalışmadan kalan bekleyen işleri kuyruğa alır."""
+        self._ensure_started()
+
+    async def stop(self):
+        """İşçileri durdurur. Yarıda kalan işler bir sonraki başlatmada yeniden çalıştırılır."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.save_jobs()
+
+    async def _worker(self):
+        """Kuyruktan iş alıp çalıştıran işçi döngüsü."""
+        while True:
+            job_id = await self._queue.get()
+            job = self._jobs.get(job_id)
+            try:
+                if job is not None and job.status == ImportJob.QUEUED:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ImportJob):
+        """Tek bir içe aktarma işini çalıştırır ve sonucunu kaydeder."""
+        job.status = ImportJob.RUNNING
+        job.started_at = time.time()
+        job.attempts += 1
+        self._append([job.to_dict()])
+
+        try:
+            book = await self.library.add_book_from_api(job.isbn)
+        except CircuitOpenError as e:
+            if e.retry_after == 0:
+                # Yarı açık devrede deneme isteği sürüyor; istek Open Library'ye gitmediği için
+                # deneme sayılmaz. Deneme isteği devreyi kapatır veya yeniden açar.
+                job.attempts -= 1
+            if job.attempts < self.max_attempts:
+                # Open Library geçici olarak kullanılamıyor; iş devre kesici izin verince yeniden denenir
+                job.status = ImportJob.QUEUED
+                job.error = "Open Library geçici olarak kullanılamıyor; yeniden denenecek."
+                self._append([job.to_dict()])
+                self._loop.call_later(max(e.retry_after, self.min_retry_delay), self._queue.put_nowait, job.id)
+                return
+            book = None
+        except Exception as e:
+            print(f"Beklenmeyen bir hata oluştu: {e} (ISBN: {job.isbn}).")
+            book = None
+
+        job.finished_at = time.time()
+        if book is not None:
+            job.status = ImportJob.SUCCEEDED
+            job.book = book.to_dict()
+            job.error = None
+        else:
+            job.status = ImportJob.FAILED
+            job.error = "Kitap eklenemedi: ISBN ile kitap bulunamadı, kitap zaten mevcut veya Open Library hatası."
+        if self._pending.get(job.isbn) is job:
+            del self._pending[job.isbn]
+        self._finished[job.id] = None
+        self._append([job.to_dict()] + self._prune())
+
+    def _prune(self) -> List[dict]:
+        """
+        Saklanan tamamlanmış iş sayısı sınırı aşarsa en eski tamamlanmış işleri siler.
+        Returns:
+            list: Günlüğe yazılacak silme kayıtları.
+        """
+        deleted = []
+        while len(self._finished) > self.max_finished:
+            job_id = next(iter(self._finished))
+            del self._finished[job_id]
+            self._jobs.pop(job_id, None)
+            deleted.append({"id": job_id, "deleted": True})
+        return deleted
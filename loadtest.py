@@ -0,0 +1,393 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import httpx
+
+import api
+from isbn import isbn13_check_digit
+from jobs import ImportJobQueue
+from openlibrary import OpenLibraryClient
+
+# Yük testinde kullanılan işlem türleri ve varsayılan ağırlıkları (yüzde olarak).
+OPERATIONS = ("get", "post", "delete", "search")
+DEFAULT_MIX = {"get": 50, "post": 20, "delete": 10, "search": 20}
+
+# Sahte Open Library'nin kitap başlığı ve yazar adı üretirken kullandığı kelimeler.
+# Arama işlemleri de bu kelimelerden seçildiği için sonuç dönen sorgular üretilir.
+WORDS = [
+    "kitap", "deniz", "orman", "gece", "yol", "zaman", "ışık", "şehir",
+    "python", "tarih", "bilim", "sanat", "yıldız", "rüzgar", "taş", "nehir",
+]
+
+
+def random_isbn13(rng: random.Random) -> str:
+    """
+    Kontrol basamağı geçerli, rastgele bir ISBN-13 üretir.
+    Args:
+        rng (random.Random): Kullanılacak rastgele sayı üreteci.
+    Returns:
+        str: 978 önekli, 13 haneli ISBN.
+    """
+    first12 = "978" + "".join(str(rng.randint(0, 9)) for _ in range(9))
+    return first12 + isbn13_check_digit(first12)
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """
+    "get=60,post=20,delete=10,search=10" biçimindeki işlem karışımını ayrıştırır.
+    Args:
+        text (str): Virgülle ayrılmış işlem=ağırlık çiftleri.
+    Returns:
+        dict: İşlem adından ağırlığa sözlük.
+    """
+    mix = {op: 0 for op in OPERATIONS}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip().lower()
+        if name not in mix:
+            raise ValueError(f"Bilinmeyen işlem türü: {name}")
+        mix[name] = int(weight)
+    if sum(mix.values()) <= 0:
+        raise ValueError("İşlem karışımındaki ağırlıkların toplamı sıfırdan büyük olmalı.")
+    return mix
+
+
+# OpenLibraryStub sınıfı, Open Library'nin yerine geçen ayarlanabilir gecikmeli yerel sunucudur.
+class OpenLibraryStub:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, not_found_ratio: float = 0.0,
+                 error_ratio: float = 0.0):
+        """
+        OpenLibraryStub sınıfının yapıcı metodu.
+        Args:
+            latency (float): Her isteğe eklenecek ortalama gecikme (saniye).
+            jitter (float): Gecikmeye eklenecek en fazla rastgele sapma (saniye).
+            not_found_ratio (float): 404 döndürülecek ISBN'lerin oranı (0-1).
+            error_ratio (float): Rastgele 503 döndürülecek isteklerin oranı (0-1); yeniden
+                deneme ve devre kesici davranışını denemek için kullanılır.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.not_found_ratio = not_found_ratio
+        self.error_ratio = error_ratio
+        self.requests = 0
+        self._rng = random.Random()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        /isbn/{isbn}.json ve /authors/{key}.json isteklerini Open Library biçiminde yanıtlar.
+        """
+        self.requests += 1
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.error_ratio:
+            return httpx.Response(503, json={"error": "unavailable"})
+
+        path = request.url.path
+        if path.startswith("/isbn/") and path.endswith(".json"):
+            isbn = path[len("/isbn/"):-len(".json")]
+            # Aynı ISBN her zaman aynı sonucu versin diye üreteç ISBN ile tohumlanır.
+            rng = random.Random(isbn)
+            if rng.random() < self.not_found_ratio:
+                return httpx.Response(404, json={"error": "notfound"})
+            title = " ".join(rng.choice(WORDS) for _ in range(3)).title()
+            return httpx.Response(200, json={
+                "title": title,
+                "authors": [{"key": f"/authors/OL{rng.randint(1, 500)}A"}],
+            })
+        if path.startswith("/authors/") and path.endswith(".json"):
+            key = path[len("/authors/"):-len(".json")]
+            rng = random.Random(key)
+            name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}"
+            return httpx.Response(200, json={"name": name})
+        return httpx.Response(404, json={"error": "notfound"})
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Library'ye verilecek, istekleri bu sahte sunucuya yönlendiren transport'u döndürür."""
+        return httpx.MockTransport(self.handle)
+
+
+# LoadReport sınıfı, işlem başına gecikme ve durum kodu ölçümlerini toplar.
+class LoadReport:
+    def __init__(self):
+        """LoadReport sınıfının yapıcı metodu."""
+        self.latencies: Dict[str, List[float]] = {op: [] for op in OPERATIONS}
+        self.statuses: Dict[str, Counter] = {op: Counter() for op in OPERATIONS}
+        self.errors: Dict[str, int] = {op: 0 for op in OPERATIONS}
+        self.elapsed = 0.0
+
+    def record(self, op: str, latency: float, status: Optional[int]):
+        """
+        Tek bir isteğin sonucunu kaydeder.
+        Args:
+            op (str): İşlem türü.
+            latency (float): İsteğin süresi (saniye).
+            status (int): HTTP durum kodu; bağlantı hatasında None.
+        """
+        self.latencies[op].append(latency)
+        if status is None or status >= 500:
+            self.errors[op] += 1
+        self.statuses[op][str(status) if status is not None else "error"] += 1
+
+    @staticmethod
+    def percentile(values: List[float], p: float) -> float:
+        """Sıralı olmayan bir listenin p. yüzdelik değerini (nearest-rank) döndürür."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def summary(self) -> dict:
+        """Toplam ve işlem başına verim ile gecikme yüzdeliklerini sözlük olarak döndürür."""
+        def describe(values: List[float]) -> dict:
+            return {
+                "count": len(values),
+                "throughput_rps": round(len(values) / self.elapsed, 2) if self.elapsed else 0.0,
+                "p50_ms": round(self.percentile(values, 50) * 1000, 2),
+                "p90_ms": round(self.percentile(values, 90) * 1000, 2),
+                "p99_ms": round(self.percentile(values, 99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2) if values else 0.0,
+            }
+
+        all_values = [v for values in self.latencies.values() for v in values]
+        result = {"elapsed_s": round(self.elapsed, 3), "total": describe(all_values)}
+        result["total"]["errors"] = sum(self.errors.values())
+        for op in OPERATIONS:
+            if self.latencies[op]:
+                result[op] = describe(self.latencies[op])
+                result[op]["errors"] = self.errors[op]
+                result[op]["statuses"] = dict(self.statuses[op])
+        return result
+
+    def format(self) -> str:
+        """Özeti terminalde okunabilir bir tablo olarak biçimlendirir."""
+        summary = self.summary()
+        lines = [
+            f"Süre: {summary['elapsed_s']} sn",
+            f"{'işlem':<8}{'adet':>8}{'istek/sn':>11}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'hata':>7}",
+            "-" * 64,
+        ]
+        for name in OPERATIONS + ("total",):
+            if name not in summary:
+                continue
+            row = summary[name]
+            lines.append(
+                f"{name:<8}{row['count']:>8}{row['throughput_rps']:>11}"
+                f"{row['p50_ms']:>10}{row['p90_ms']:>10}{row['p99_ms']:>10}{row['errors']:>7}"
+            )
+        return "\n".join(lines)
+
+
+async def run_load(client: httpx.AsyncClient, mix: Dict[str, int], concurrency: int,
+                   duration: float, seed: Optional[int] = None) -> LoadReport:
+    """
+    Verilen istemci üzerinden, belirtilen süre boyunca eşzamanlı istekler gönderir.
+    Args:
+        client (httpx.AsyncClient): API'ye bağlı istemci (base_url ayarlı olmalı).
+        mix (dict): İşlem türünden ağırlığa sözlük.
+        concurrency (int): Aynı anda istek gönderen sanal kullanıcı sayısı.
+        duration (float): Testin süresi (saniye).
+        seed (int): Tekrarlanabilir işlem dizisi için rastgele tohum.
+    Returns:
+        LoadReport: Toplanan ölçümler.
+    """
+    rng = random.Random(seed)
+    ops = [op for op in OPERATIONS if mix.get(op, 0) > 0]
+    weights = [mix[op] for op in ops]
+    report = LoadReport()
+    # POST ile eklenen ISBN'ler, DELETE işlemlerinin gerçek kayıtları silebilmesi için saklanır.
+    added: List[str] = []
+
+    async def perform(op: str) -> httpx.Response:
+        if op == "get":
+            return await client.get("/books")
+        if op == "post":
+            return await client.post("/books", json={"isbn": random_isbn13(rng)})
+        if op == "delete":
+            isbn = added.pop(rng.randrange(len(added))) if added else random_isbn13(rng)
+            return await client.delete(f"/books/{isbn}")
+        return await client.get("/books/search", params={"q": rng.choice(WORDS)})
+
+    async def user(deadline: float):
+        while time.perf_counter() < deadline:
+            op = rng.choices(ops, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await perform(op)
+                status = response.status_code
+                if op == "post" and status == 201:
+                    added.append(response.json()["isbn"])
+            except httpx.HTTPError:
+                status = None
+            report.record(op, time.perf_counter() - started, status)
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(user(deadline) for _ in range(concurrency)))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+@contextlib.contextmanager
+def prepared_library(stub: OpenLibraryStub, seed_books: int = 0, seed: Optional[int] = None,
+                     upstream_rate: float = 1_000_000.0):
+    """
+    api.library'yi geçici bir veri dosyasına ve sahte Open Library'ye yönlendirir.
+    api.import_queue da geçici veri dosyasının yanındaki bir iş günlüğü kullanan yeni bir
+    kuyrukla değiştirilir; böylece uvicorn modunda başlayan işçiler gerçek kuyruktaki
+    işleri sahte sunucuya karşı çalıştırmaz. Çıkışta özgün veri dosyası, iş kuyruğu,
+    transport ve Open Library istemcisi geri yüklenir.
+    Args:
+        stub (OpenLibraryStub): İsteklerin yönlendirileceği sahte sunucu.
+        seed_books (int): Test başlamadan önce eklenecek kitap sayısı.
+        seed (int): Başlangıç kitapları için rastgele tohum.
+        upstream_rate (float): Sahte Open Library'ye saniyede gönderilebilecek istek sayısı.
+    """
+    library = api.library
+    original_queue = api.import_queue
+    original_data_file = library.data_file
+    original_transport = library.transport
+    original_openlibrary = library.openlibrary
+    rng = random.Random(seed)
+    fd, path = tempfile.mkstemp(prefix="loadtest_", suffix=".json")
+    try:
+        books = []
+        for _ in range(seed_books):
+            words = [rng.choice(WORDS) for _ in range(4)]
+            books.append({
+                "title": " ".join(words[:3]).title(),
+                "author": words[3].title(),
+                "isbn": random_isbn13(rng),
+            })
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(books, f, ensure_ascii=False)
+        library.data_file = path
+        library.load_books()
+        library.transport = stub.transport()
+        library.openlibrary = OpenLibraryClient(rate=upstream_rate, burst=max(1, int(upstream_rate)))
+        api.import_queue = ImportJobQueue(library)
+        yield library
+    finally:
+        api.import_queue = original_queue
+        library.data_file = original_data_file
+        library.transport = original_transport
+        library.openlibrary = original_openlibrary
+        library.load_books()
+        for leftover in (path, f"{path}.changes.jsonl", f"{path}.jobs.jsonl", f"{path}.jobs.jsonl.tmp"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+@contextlib.asynccontextmanager
+async def in_process_client():
+    """api.app'e ağ kullanmadan, ASGI üzerinden doğrudan bağlanan bir istemci açar."""
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        yield client
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client(host: str, port: int, concurrency: int):
+    """
+    api.app'i aynı süreçte yerel bir uvicorn sunucusu olarak başlatır ve ona bağlı istemci açar.
+    Sahte Open Library'nin devreye girebilmesi için sunucu aynı süreçte çalıştırılır.
+    """
+    import uvicorn
+
+    config = uvicorn.Config(api.app, host=host, port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            if server_task.done():
+                server_task.result()
+                raise RuntimeError("uvicorn sunucusu başlatılamadı.")
+            await asyncio.sleep(0.01)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://{host}:{port}", limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+async def run(mode: str = "inprocess", mix: Optional[Dict[str, int]] = None, concurrency: int = 10,
+              duration: float = 10.0, latency: float = 0.05, jitter: float = 0.0,
+              not_found_ratio: float = 0.0, error_ratio: float = 0.0, upstream_rate: float = 1_000_000.0,
+              seed_books: int = 0, host: str = "127.0.0.1", port: int = 8765,
+              seed: Optional[int] = None, verbose: bool = False) -> LoadReport:
+    """
+    Sahte Open Library ve geçici veri dosyası hazırlayıp yük testini çalıştırır.
+    Args:
+        mode (str): "inprocess" (ASGI) veya "uvicorn" (yerel TCP sunucusu).
+        verbose (bool): False ise Library'nin terminal çıktıları bastırılır.
+        Diğer argümanlar run_load, OpenLibraryStub ve prepared_library ile aynıdır.
+    Returns:
+        LoadReport: Toplanan ölçümler.
+    """
+    stub = OpenLibraryStub(latency=latency, jitter=jitter, not_found_ratio=not_found_ratio,
+                           error_ratio=error_ratio)
+    with contextlib.ExitStack() as stack:
+        if not verbose:
+            devnull = stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        stack.enter_context(prepared_library(stub, seed_books=seed_books, seed=seed,
+                                             upstream_rate=upstream_rate))
+        if mode == "uvicorn":
+            client_cm = uvicorn_client(host, port, concurrency)
+        else:
+            client_cm = in_process_client()
+        async with client_cm as client:
+            return await run_load(client, mix or DEFAULT_MIX, concurrency, duration, seed=seed)
+
+
+def main():
+    """Komut satırı argümanlarını okuyup yük testini çalıştırır ve raporu basar."""
+    parser = argparse.ArgumentParser(description="Kütüphane API'si için yerel yük testi aracı.")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess",
+                        help="API'ye ASGI üzerinden mi yoksa yerel uvicorn sunucusu üzerinden mi bağlanılacağı")
+    parser.add_argument("--mix", default="get=50,post=20,delete=10,search=20",
+                        help="İşlem karışımı, ör: get=60,post=20,delete=10,search=10")
+    parser.add_argument("--concurrency", type=int, default=10, help="Eşzamanlı sanal kullanıcı sayısı")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test süresi (saniye)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Sahte Open Library gecikmesi (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Gecikmeye eklenecek en fazla sapma (saniye)")
+    parser.add_argument("--not-found-ratio", type=float, default=0.0, help="404 döndürülecek ISBN oranı (0-1)")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="Sahte Open Library'nin 503 döndürme oranı (0-1)")
+    parser.add_argument("--upstream-rate", type=float, default=1_000_000.0,
+                        help="Open Library istemcisinin saniyedeki istek sınırı (varsayılan: pratikte sınırsız)")
+    parser.add_argument("--seed-books", type=int, default=1000, help="Başlangıçta yüklenecek kitap sayısı")
+    parser.add_argument("--host", default="127.0.0.1", help="uvicorn modunda dinlenecek adres")
+    parser.add_argument("--port", type=int, default=8765, help="uvicorn modunda dinlenecek port")
+    parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir testler için rastgele tohum")
+    parser.add_argument("--json", action="store_true", help="Raporu JSON olarak yazdır")
+    parser.add_argument("--verbose", action="store_true", help="Library çıktılarını bastırma")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(
+        mode=args.mode, mix=parse_mix(args.mix), concurrency=args.concurrency,
+        duration=args.duration, latency=args.latency, jitter=args.jitter,
+        not_found_ratio=args.not_found_ratio, error_ratio=args.error_ratio,
+        upstream_rate=args.upstream_rate, seed_books=args.seed_books,
+        host=args.host, port=args.port, seed=args.seed, verbose=args.verbose,
+    ))
+    if args.json:
+        print(json.dumps(report.summary(), indent=4, ensure_ascii=False))
+    else:
+        print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,127 +1,428 @@
-import asyncio
-from classes import Book, Library
-
-def display_menu():
-    """Kütüphane yönetim sistemi menüsünü ekrana basar."""
-    print("\n     Kütüphane Yönetim Sistemi")
-    print("=" * 50)
-    print("1. Kitabı ISBN ile API'den Ekle") # API tabanlı ekleme
-    print("2. Kitabı Manuel Olarak Ekle")      # Manuel ekleme
-    print("3. Kitap Sil (ISBN ile)")
-    print("4. Kitapları Listele")
-    print("5. Kitap Ara (ISBN ile)")
-    print("6. Kitap Ara (Başlık/Yazar ile)")
-    print("7. Kütüphane İstatistikleri")
-    print("8. Çıkış")
-    print("-" * 50)
-
-async def add_book_from_api_menu(library: Library):
-    """
-    Kullanıcıdan ISBN alarak yeni kitabı Open Library API'den çekip ekler.
-    """
-    isbn = input("\nEklemek istediğiniz kitabın ISBN numarasını girin: ").strip()
-    await library.add_book_from_api(isbn)
-
-def add_book_manual_menu(library: Library):
-    """
-    Kullanıcıdan manuel olarak kitap bilgilerini alarak kitap ekler.
-    """
-    print("\nYeni Kitap Bilgileri (Manuel Giriş):")
-    title = input("Kitap Başlığı: ").strip()
-    author = input("Yazar: ").strip()
-    isbn = input("ISBN: ").strip()
-
-    if not title or not author or not isbn:
-        print("Hata: Kitap bilgileri eksik. Lütfen tekrar deneyin.")
-        return
-
-    new_book = Book(title, author, isbn)
-    library.add_book_manual(new_book)
-
-def remove_book_menu(library: Library):
-    """Kullanıcıdan ISBN alarak kitap siler."""
-    isbn = input("\nSilinecek kitabın ISBN numarasını girin: ").strip()
-    if isbn:
-        book = library.find_book(isbn) 
-        if book:
-            print(f"Silinecek kitap: {book}")
-            confirm = input("Bu kitabı silmek istediğinizden emin misiniz? (e/h): ").lower()
-            if confirm == 'e':
-                library.remove_book(isbn)
-            else:
-                print("Silme işlemi iptal edildi.")
-        else:
-            pass
-    else:
-        print("Geçersiz ISBN!")
-
-def search_book_isbn_menu(library: Library):
-    """Kullanıcıdan ISBN alarak kitap arar."""
-    isbn = input("\nAranacak kitabın ISBN numarasını girin: ").strip()
-    if isbn:
-        library.find_book(isbn) 
-    else:
-        print("Geçersiz ISBN!")
-
-def search_book_text_menu(library: Library):
-    """Kullanıcıdan arama terimi alarak başlık veya yazara göre kitap arar."""
-    query = input("\nArama terimi girin (başlık veya yazar): ").strip()
-    if query:
-        library.search_books(query) 
-    else:
-        print("Geçersiz arama terimi!")
-
-def show_statistics(library: Library):
-    """Kütüphane istatistiklerini gösterir."""
-    count = library.get_book_count()
-    print(f"\n KÜTÜPHANE İSTATİSTİKLERİ")
-    print("-" * 30)
-    print(f"Toplam Kitap Sayısı: {count}")
-
-    if count > 0:
-        authors = library.get_author_statistics()
-        print(f"Farklı Yazar Sayısı: {len(authors)}")
-        print("\nEn Çok Kitabı Olan Yazarlar:")
-        # Yazar istatistiklerini azalan sıraya göre sırala ve ilk 3'ü göster
-        sorted_authors = sorted(authors.items(), key=lambda x: x[1], reverse=True)[:3]
-        for i, (author, book_count) in enumerate(sorted_authors, 1):
-            print(f"  {i}. {author}: {book_count} kitap")
-    else:
-        print("İstatistikleri gösterebilmek için kütüphanede kitap bulunmamaktadır.")
-
-    print("-" * 30)
-
-async def main():
-    """Ana uygulama döngüsü."""
-    library = Library() # Varsayılan olarak 'library.json' kullanır
-
-    while True:
-        try:
-            display_menu()
-            choice = input("Seçiminizi yapın (1-8): ").strip() 
-            if choice == '1':
-                await add_book_from_api_menu(library) 
-            elif choice == '2':
-                add_book_manual_menu(library)        
-            elif choice == '3':
-                remove_book_menu(library)
-            elif choice == '4': 
-                library.list_books()
-            elif choice == '5': 
-                search_book_isbn_menu(library)
-            elif choice == '6': 
-                search_book_text_menu(library)
-            elif choice == '7': 
-                show_statistics(library)
-            elif choice == '8': 
-                print("Çıkış yapılıyor...")
-                break
-            else:
-                print("Geçersiz seçim. Lütfen 1-8 arasında bir değer girin.")
-        except Exception as e:
-            print(f"Beklenmeyen bir hata oluştu: {e}")
-
-if __name__ == "__main__":
-    # main fonksiyonunu eşzamansız olarak çalıştırır
-    asyncio.run(main())
-
+import argparse
+import contextlib
+import csv
+import json
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from classes import Book, Library
+from openlibrary import CircuitOpenError
+
+def display_menu():
+    """Kütüphane yönetim sistemi menüsünü ekrana basar."""
+    print("\n     Kütüphane Yönetim Sistemi")
+    print("=" * 50)
+    print("1. Kitabı ISBN ile API'den Ekle") # API tabanlı ekleme
+    print("2. Kitabı Manuel Olarak Ekle")      # Manuel ekleme
+    print("3. Kitap Sil (ISBN ile)")
+    print("4. Kitapları Listele")
+    print("5. Kitap Ara (ISBN ile)")
+    print("6. Kitap Ara (Başlık/Yazar ile)")
+    print("7. Kitap Ara (Yazım Hatası Toleranslı)")
+    print("8. Kütüphane İstatistikleri")
+    print("9. Çıkış")
+    print("-" * 50)
+
+async def add_book_from_api_menu(library: Library):
+    """
+    Kullanıcıdan ISBN alarak yeni kitabı Open Library API'den çekip ekler.
+    """
+    isbn = input("\nEklemek istediğiniz kitabın ISBN numarasını girin: ").strip()
+    try:
+        await library.add_book_from_api(isbn)
+    except CircuitOpenError:
+        # Hata mesajı add_book_from_api tarafından yazıldı; menüye dönülür
+        pass
+
+def add_book_manual_menu(library: Library):
+    """
+    Kullanıcıdan manuel olarak kitap bilgilerini alarak kitap ekler.
+    """
+    print("\nYeni Kitap Bilgileri (Manuel Giriş):")
+    title = input("Kitap Başlığı: ").strip()
+    author = input("Yazar: ").strip()
+    isbn = input("ISBN: ").strip()
+
+    if not title or not author or not isbn:
+        print("Hata: Kitap bilgileri eksik. Lütfen tekrar deneyin.")
+        return
+
+    new_book = Book(title, author, isbn)
+    library.add_book_manual(new_book)
+
+def remove_book_menu(library: Library):
+    """Kullanıcıdan ISBN alarak kitap siler."""
+    isbn = input("\nSilinecek kitabın ISBN numarasını girin: ").strip()
+    if isbn:
+        book = library.find_book(isbn) 
+        if book:
+            print(f"Silinecek kitap: {book}")
+            confirm = input("Bu kitabı silmek istediğinizden emin misiniz? (e/h): ").lower()
+            if confirm == 'e':
+                library.remove_book(isbn)
+            else:
+                print("Silme işlemi iptal edildi.")
+        else:
+            pass
+    else:
+        print("Geçersiz ISBN!")
+
+def search_book_isbn_menu(library: Library):
+    """Kullanıcıdan ISBN alarak kitap arar."""
+    isbn = input("\nAranacak kitabın ISBN numarasını girin: ").strip()
+    if isbn:
+        library.find_book(isbn) 
+    else:
+        print("Geçersiz ISBN!")
+
+def search_book_text_menu(library: Library):
+    """Kullanıcıdan arama terimi alarak başlık veya yazara göre kitap arar."""
+    query = input("\nArama terimi girin (başlık veya yazar): ").strip()
+    if query:
+        library.search_books(query) 
+    else:
+        print("Geçersiz arama terimi!")
+
+def fuzzy_search_menu(library: Library):
+    """Kullanıcıdan arama terimi alarak yazım hatalarına toleranslı kitap araması yapar."""
+    query = input("\nArama terimi girin (başlık veya yazar, yazım hatası olabilir): ").strip()
+    if query:
+        library.fuzzy_search_books(query)
+    else:
+        print("Geçersiz arama terimi!")
+
+def show_statistics(library: Library):
+    """Kütüphane istatistiklerini gösterir."""
+    count = library.get_book_count()
+    print(f"\n KÜTÜPHANE İSTATİSTİKLERİ")
+    print("-" * 30)
+    print(f"Toplam Kitap Sayısı: {count}")
+
+    if count > 0:
+        authors = library.get_author_statistics()
+        print(f"Farklı Yazar Sayısı: {len(authors)}")
+        print("\nEn Çok Kitabı Olan Yazarlar:")
+        # Yazar istatistiklerini azalan sıraya göre sırala ve ilk 3'ü göster
+        sorted_authors = sorted(authors.items(), key=lambda x: x[1], reverse=True)[:3]
+        for i, (author, book_count) in enumerate(sorted_authors, 1):
+            print(f"  {i}. {author}: {book_count} kitap")
+    else:
+        print("İstatistikleri gösterebilmek için kütüphanede kitap bulunmamaktadır.")
+
+    print("-" * 30)
+
+async def main(data_file: str = 'library.json', shards: Optional[int] = None):
+    """Ana uygulama döngüsü."""
+    library = Library(data_file, shards=shards) # Varsayılan olarak 'library.json' kullanır
+
+    while True:
+        try:
+            display_menu()
+            choice = input("Seçiminizi yapın (1-9): ").strip() 
+            if choice == '1':
+                await add_book_from_api_menu(library) 
+            elif choice == '2':
+                add_book_manual_menu(library)        
+            elif choice == '3':
+                remove_book_menu(library)
+            elif choice == '4': 
+                library.list_books()
+            elif choice == '5': 
+                search_book_isbn_menu(library)
+            elif choice == '6': 
+                search_book_text_menu(library)
+            elif choice == '7': 
+                fuzzy_search_menu(library)
+            elif choice == '8': 
+                show_statistics(library)
+            elif choice == '9': 
+                print("Çıkış yapılıyor...")
+                break
+            else:
+                print("Geçersiz seçim. Lütfen 1-9 arasında bir değer girin.")
+        except Exception as e:
+            print(f"Beklenmeyen bir hata oluştu: {e}")
+
+# --- Komut satırı arayüzü -------------------------------------------------
+# Argümanla çalıştırıldığında menü açılmaz; komutlar sonuçlarını stdout'a JSON
+# (veya --format ile JSON Lines/CSV) olarak yazar, böylece cron ve kabuk boru
+# hatlarından kullanılabilir. Library'nin bilgi ve hata mesajları stderr'e yönlendirilir.
+# Çıkış kodu: 0 başarılı, 1 en az bir işlem başarısız, 2 hatalı kullanım.
+
+# Open Library'den aynı anda içe aktarılan en fazla ISBN; hız sınırı ayrıca OpenLibraryClient ile uygulanır.
+IMPORT_CONCURRENCY = 8
+OUTPUT_FORMATS = ("json", "jsonl", "csv")
+BOOK_FIELDS = ("title", "author", "isbn")
+
+def write_records(records: Iterable[dict], fmt: str, out: TextIO, fields=BOOK_FIELDS):
+    """
+    Kayıtları istenen biçimde yazar.
+    Args:
+        records (iterable): Yazılacak sözlükler.
+        fmt (str): json (tek dizi), jsonl (satır başına bir kayıt) veya csv.
+        out: Yazılacak dosya nesnesi.
+        fields (tuple): csv biçiminde yazılacak sütunlar.
+    """
+    if fmt == "jsonl":
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    elif fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        json.dump(list(records), out, ensure_ascii=False, indent=2)
+        out.write("\n")
+
+def write_result(result: dict, out: TextIO):
+    """Tek bir sonuç nesnesini JSON olarak yazar."""
+    json.dump(result, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+@contextlib.contextmanager
+def open_input(path: str):
+    """Dosyayı okumak için açar; "-" ise stdin kullanılır."""
+    if path == "-":
+        yield sys.stdin
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            yield f
+
+def read_isbns(path: str) -> List[str]:
+    """Satır başına bir ISBN içeren dosyayı okur; boş satırlar ve # ile başlayan satırlar atlanır."""
+    with open_input(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def read_book_records(path: str, fmt: str) -> Iterator[dict]:
+    """
+    İçe aktarılacak kitap kayıtlarını okur.
+    Args:
+        path (str): Dosya yolu; "-" ise stdin.
+        fmt (str): json (kitap dizisi; export çıktısı ve library.json ile aynı), jsonl veya csv.
+    """
+    with open_input(path) as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif fmt == "csv":
+            yield from csv.DictReader(f, strict=True)
+        else:
+            yield from json.load(f)
+
+def guess_format(path: str) -> Optional[str]:
+    """Dosya uzantısından biçimi tahmin eder (json, jsonl, csv); bilinmeyen uzantılar için None."""
+    extension = os.path.splitext(path)[1].lower()
+    return {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}.get(extension)
+
+async def import_isbns(library: Library, isbns: List[str], concurrency: int = IMPORT_CONCURRENCY) -> List[dict]:
+    """
+    ISBN'leri Open Library'den eşzamanlı olarak içe aktarır.
+    Returns:
+        list: Her ISBN için {"isbn", "status" ("added" veya "failed"), "book"} sonuçları, girdi sırasıyla.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def import_one(isbn: str) -> dict:
+        async with semaphore:
+            try:
+                book = await library.add_book_from_api(isbn)
+            except CircuitOpenError:
+                book = None
+        if book is None:
+            return {"isbn": isbn, "status": "failed", "book": None}
+        return {"isbn": isbn, "status": "added", "book": book.to_dict()}
+
+    return list(await asyncio.gather(*(import_one(isbn) for isbn in isbns)))
+
+def cmd_add(library: Library, args, out: TextIO) -> int:
+    """add: ISBN'leri Open Library'den ekler; --title ve --author verilirse tek kitabı elle ekler."""
+    if args.title or args.author:
+        if not (args.title and args.author) or len(args.isbn) != 1:
+            print("Hata: Elle eklemek için tek bir ISBN ile birlikte --title ve --author gereklidir.", file=sys.stderr)
+            return 2
+        book = Book(args.title, args.author, args.isbn[0])
+        added = library.add_book_manual(book)
+        results = [{"isbn": args.isbn[0], "status": "added" if added else "failed",
+                    "book": book.to_dict() if added else None}]
+    else:
+        import asyncio
+        results = asyncio.run(import_isbns(library, args.isbn))
+    write_records(results, "json", out)
+    return 0 if all(result["status"] == "added" for result in results) else 1
+
+def cmd_import(library: Library, args, out: TextIO) -> int:
+    """
+    import: Kitap kayıtlarını (json/jsonl/csv) toplu ekler veya ISBN listesini Open Library'den içe aktarır.
+    Dosya açılamaz veya ayrıştırılamazsa tek satırlık hata yazılır, hiçbir kitap eklenmez ve 2 döner.
+    """
+    try:
+        return _import_file(library, args, out)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError, csv.Error) as e:
+        print(f"Hata: '{args.file}' okunamadı: {e}", file=sys.stderr)
+        return 2
+
+def _import_file(library: Library, args, out: TextIO) -> int:
+    fmt = args.format or guess_format(args.file) or "isbn"
+    if fmt == "isbn":
+        import asyncio
+        results = asyncio.run(import_isbns(library, read_isbns(args.file)))
+        added = sum(1 for result in results if result["status"] == "added")
+        write_result({"added": added, "failed": len(results) - added}, out)
+        return 0 if added == len(results) else 1
+
+    counts = {"read": 0, "invalid": 0}
+
+    def books() -> Iterator[Book]:
+        for record in read_book_records(args.file, fmt):
+            counts["read"] += 1
+            try:
+                yield Book(str(record["title"]), str(record["author"]), str(record["isbn"]))
+            except (KeyError, TypeError):
+                counts["invalid"] += 1
+
+    added = library.bulk_load(books())
+    write_result({"added": added, "skipped": counts["read"] - added}, out)
+    return 0 if counts["invalid"] == 0 else 1
+
+def cmd_remove(library: Library, args, out: TextIO) -> int:
+    """remove: ISBN'leri verilen kitapları siler."""
+    results = [
+        {"isbn": isbn, "status": "removed" if library.remove_book(isbn) else "not_found"}
+        for isbn in args.isbn
+    ]
+    write_records(results, "json", out)
+    return 0 if all(result["status"] == "removed" for result in results) else 1
+
+def cmd_list(library: Library, args, out: TextIO) -> int:
+    """list: Tüm kitapları yazar."""
+    write_records((book.to_dict() for book in library.books), args.format, out)
+    return 0
+
+def cmd_search(library: Library, args, out: TextIO) -> int:
+    """search: Başlık veya yazara göre arar; --fuzzy ile yazım hatalarına toleranslı arar."""
+    if args.fuzzy:
+        records = [
+            {**book.to_dict(), "score": score}
+            for book, score in library.fuzzy_search_books(args.query, limit=args.limit)
+        ]
+        fields = BOOK_FIELDS + ("score",)
+    else:
+        records = [book.to_dict() for book in library.search_books(args.query)[:args.limit]]
+        fields = BOOK_FIELDS
+    write_records(records, args.format, out, fields)
+    return 0
+
+def cmd_stats(library: Library, args, out: TextIO) -> int:
+    """stats: Kitap ve yazar sayılarını ve en çok kitabı olan yazarları yazar."""
+    authors = library.get_author_statistics()
+    top = sorted(authors.items(), key=lambda x: x[1], reverse=True)[:args.top]
+    write_result({
+        "books": library.get_book_count(),
+        "authors": len(authors),
+        "top_authors": [{"author": author, "books": count} for author, count in top],
+    }, out)
+    return 0
+
+def cmd_export(library: Library, args, out: TextIO) -> int:
+    """
+    export: Tüm kitapları dosyaya (veya stdout'a) yazar; çıktı import ile geri yüklenebilir.
+    Dosya yazılamazsa tek satırlık hata yazılır, geçici dosya silinir ve 2 döner.
+    """
+    records = (book.to_dict() for book in library.books)
+    if args.output == "-":
+        write_records(records, args.format or "json", out)
+        return 0
+    fmt = args.format or guess_format(args.output) or "json"
+    # Yarım kalmış bir dışa aktarma dosyası bırakmamak için önce geçici dosyaya yazılır
+    temp_file = f"{args.output}.tmp"
+    try:
+        with open(temp_file, "w", encoding="utf-8", newline="") as f:
+            write_records(records, fmt, f)
+        os.replace(temp_file, args.output)
+    except OSError as e:
+        print(f"Hata: '{args.output}' yazılamadı: {e}", file=sys.stderr)
+        with contextlib.suppress(OSError):
+            os.remove(temp_file)
+        return 2
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Komut satırı argümanlarını tanımlar."""
+    parser = argparse.ArgumentParser(
+        description="Kütüphane Yönetim Sistemi. Komut verilmezse etkileşimli menü açılır."
+    )
+    parser.add_argument("--data-file", default="library.json", help="Kitap verilerinin saklandığı JSON dosyası")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Kitapları ISBN'e göre bu kadar dosyaya bölerek sakla (1: tek dosya; mevcut veriler dönüştürülür)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Bilgi ve hata mesajlarını gösterme (yalnızca sonuç)")
+    commands = parser.add_subparsers(dest="command", metavar="KOMUT")
+
+    add = commands.add_parser("add", help="ISBN ile Open Library'den (veya --title/--author ile elle) kitap ekle")
+    add.add_argument("isbn", nargs="+", help="Eklenecek ISBN'ler")
+    add.add_argument("--title", help="Elle eklenecek kitabın başlığı")
+    add.add_argument("--author", help="Elle eklenecek kitabın yazarı")
+    add.set_defaults(handler=cmd_add)
+
+    import_ = commands.add_parser("import", help="Dosyadan (veya '-' ile stdin'den) toplu kitap ekle")
+    import_.add_argument("file", help="json/jsonl/csv kitap kayıtları veya satır başına bir ISBN içeren dosya")
+    import_.add_argument("--format", choices=OUTPUT_FORMATS + ("isbn",),
+                         help="Dosya biçimi (varsayılan: uzantıdan; bilinmeyen uzantı ve stdin için isbn)")
+    import_.set_defaults(handler=cmd_import)
+
+    remove = commands.add_parser("remove", help="ISBN ile kitap sil")
+    remove.add_argument("isbn", nargs="+", help="Silinecek ISBN'ler")
+    remove.set_defaults(handler=cmd_remove)
+
+    list_ = commands.add_parser("list", help="Tüm kitapları listele")
+    list_.add_argument("--format", choices=OUTPUT_FORMATS, default="json")
+    list_.set_defaults(handler=cmd_list)
+
+    search = commands.add_parser("search", help="Başlık veya yazara göre ara")
+    search.add_argument("query", help="Arama terimi")
+    search.add_argument("--fuzzy", action="store_true", help="Yazım hatalarına toleranslı arama")
+    search.add_argument("--limit", type=int, default=10, help="En fazla sonuç sayısı (varsayılan: 10)")
+    search.add_argument("--format", choices=OUTPUT_FORMATS, default="json")
+    search.set_defaults(handler=cmd_search)
+
+    stats = commands.add_parser("stats", help="Kütüphane istatistikleri")
+    stats.add_argument("--top", type=int, default=3, help="Listelenecek yazar sayısı (varsayılan: 3)")
+    stats.set_defaults(handler=cmd_stats)
+
+    export = commands.add_parser("export", help="Tüm kitapları dışa aktar")
+    export.add_argument("-o", "--output", default="-", help="Çıktı dosyası (varsayılan: stdout)")
+    export.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="Çıktı biçimi (varsayılan: dosya uzantısından, stdout için json)")
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+def cli(argv: Optional[List[str]] = None) -> int:
+    """
+    Komut satırı giriş noktası.
+    Args:
+        argv (list): Argümanlar. None ise sys.argv kullanılır.
+    Returns:
+        int: Çıkış kodu.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        import asyncio
+        # main fonksiyonunu eşzamansız olarak çalıştırır
+        asyncio.run(main(args.data_file, args.shards))
+        return 0
+
+    # Komut sonucu gerçek stdout'a yazılır; Library'nin print mesajları stderr'e
+    # (--quiet ile hiçbir yere) yönlendirilir ve çıktıyı bozmaz.
+    out = sys.stdout
+    with contextlib.ExitStack() as stack:
+        messages = stack.enter_context(open(os.devnull, "w")) if args.quiet else sys.stderr
+        stack.enter_context(contextlib.redirect_stdout(messages))
+        library = Library(args.data_file, shards=args.shards)
+        return args.handler(library, args, out)
+
+if __name__ == "__main__":
+    sys.exit(cli())
+
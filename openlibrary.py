@@ -0,0 +1,370 @@
+import random
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx, asyncio ve email.utils yüklenmesi uzun süren modüllerdir; yalnızca istek
+# atılırken gerektikleri için ilgili metodların içinde içe aktarılırlar.
+def __getattr__(name: str):
+    """openlibrary.asyncio ve openlibrary.httpx erişimlerinde modülü ilk kullanımda yükler."""
+    if name in ("asyncio", "httpx"):
+        import importlib
+        return importlib.import_module(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Yeniden denenmesi anlamlı olan HTTP durum kodları (hız sınırı ve geçici sunucu hataları).
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Önbellekteki başarılı yanıtların (yazar adları) ve "bulunamadı" sonuçlarının geçerlilik
+# süreleri (saniye). Open Library'ye sonradan eklenen bir baskı en geç NEGATIVE_TTL
+# sonra tekrar sorulur; bu yüzden olumsuz sonuçlar daha kısa süre tutulur.
+POSITIVE_TTL = 24 * 60 * 60.0
+NEGATIVE_TTL = 10 * 60.0
+
+
+# CircuitOpenError, devre kesici açıkken yapılan isteklerde fırlatılır.
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        """
+        Args:
+            retry_after (float): Devre kesicinin yeniden deneme izni vereceği zamana kalan süre (saniye).
+        """
+        super().__init__(f"Open Library geçici olarak devre dışı; {retry_after:.0f} sn sonra tekrar denenecek.")
+        self.retry_after = retry_after
+
+
+# RateLimiter sınıfı, Open Library'ye gönderilen istekleri jeton kovası ile sınırlar.
+class RateLimiter:
+    def __init__(self, rate: float, burst: int):
+        """
+        RateLimiter sınıfının yapıcı metodu.
+        Args:
+            rate (float): Saniyede eklenen jeton (izin verilen istek) sayısı.
+            burst (int): Kovanın kapasitesi; art arda gönderilebilecek en fazla istek.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Bir jeton ayırır ve jetonun kullanılabilir olmasına kalan süreyi döndürür.
+        Jetonlar eksiye düşebilir; böylece bekleyen istekler sırayla ve kilit
+        kullanmadan farklı zamanlara yerleştirilir.
+        Returns:
+            float: Beklenmesi gereken süre (saniye); hemen gönderilebiliyorsa 0.
+        """
+        self._refill()
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        """Bir istek için jeton alınana kadar bekler."""
+        import asyncio
+
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float):
+        """
+        Kovayı belirtilen süre boyunca boşaltır; sunucu 429 ile yavaşlamamızı
+        istediğinde sonraki tüm isteklerin de beklemesini sağlar.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+# CircuitBreaker sınıfı, art arda hata veren bir sunucuya istek göndermeyi geçici olarak durdurur.
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        CircuitBreaker sınıfının yapıcı metodu.
+        Args:
+            failure_threshold (int): Devrenin açılması için gereken art arda hata sayısı.
+            reset_timeout (float): Açık devrenin tek bir deneme isteğine izin vermeden önce bekleyeceği süre (saniye).
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Devrenin güncel durumunu döndürür; süresi dolan açık devre yarı açık sayılır."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Açık devrenin deneme isteğine izin vermesine kalan süreyi döndürür (saniye)."""
+        if self._state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> Optional[str]:
+        """
+        İsteğin gönderilip gönderilemeyeceğini döndürür. Yarı açık durumda aynı anda
+        yalnızca bir deneme isteğine izin verilir.
+        Returns:
+            str: İzin verildiyse isteğin kabul edildiği durum: CLOSED veya deneme isteği için
+                HALF_OPEN. Yalnızca HALF_OPEN ile kabul edilen istek deneme hakkını tutar.
+                İzin verilmediyse None.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return self.CLOSED
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return self.HALF_OPEN
+        return None
+
+    def record_success(self):
+        """Başarılı bir yanıtı kaydeder ve devreyi kapatır."""
+        self.failures = 0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """
+        Sonucu kaydedilmeden biten (iptal edilen veya beklenmeyen bir hatayla biten)
+        deneme isteğinin hakkını serbest bırakır; devre durumu değişmez ve sıradaki
+        istek yeniden deneme isteği olabilir. Yalnızca allow_request'in HALF_OPEN ile
+        kabul ettiği istek için çağrılmalıdır.
+        """
+        self._probe_in_flight = False
+
+    def record_failure(self, probe: bool = True):
+        """
+        Başarısız bir isteği kaydeder; eşik aşıldıysa veya deneme isteği başarısızsa devreyi açar.
+        Args:
+            probe (bool): False ise istek devre kapalıyken kabul edilmiştir; sürmekte olan
+                bir deneme isteği varsa onun hakkına dokunulmaz.
+        """
+        self.failures += 1
+        probe_failed = probe and self._probe_in_flight
+        if probe_failed or self.failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        if probe_failed:
+            self._probe_in_flight = False
+
+
+# LookupCache sınıfı, Open Library sorgularının sonuçlarını sınırlı boyutta ve süreli olarak saklar.
+class LookupCache:
+    def __init__(self, maxsize: int = 10000, ttl: float = POSITIVE_TTL, negative_ttl: float = NEGATIVE_TTL):
+        """
+        LookupCache sınıfının yapıcı metodu.
+        Args:
+            maxsize (int): Saklanacak en fazla kayıt; dolduğunda en uzun süredir kullanılmayan kayıt atılır.
+            ttl (float): Başarılı sonuçların geçerlilik süresi (saniye).
+            negative_ttl (float): Olumsuz sonuçların (bulunamadı, eksik kayıt) geçerlilik süresi (saniye).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # Anahtardan (bitiş zamanı, olumsuz mu, değer) kaydına eşleme; sıra kullanım sırasıdır
+        self._entries: "OrderedDict[str, Tuple[float, bool, Any]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[bool, Any]]:
+        """
+        Anahtarın geçerli kaydını döndürür ve sayaçları günceller.
+        Returns:
+            tuple: (olumsuz mu, değer); kayıt yoksa veya süresi dolduysa None.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry[1]:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key: str, value: Any):
+        """Başarılı bir sonucu ttl süresince saklar."""
+        self._store(key, False, value, self.ttl)
+
+    def put_negative(self, key: str, reason: str):
+        """
+        Olumsuz bir sonucu negative_ttl süresince saklar; süre dolana kadar aynı
+        sorgu ağa gitmeden aynı nedenle yanıtlanır.
+        Args:
+            key (str): Sorgu anahtarı.
+            reason (str): Sonucun nedeni (kullanıcıya gösterilen hata mesajı).
+        """
+        self._store(key, True, reason, self.negative_ttl)
+
+    def _store(self, key: str, negative: bool, value: Any, ttl: float):
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, negative, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: str):
+        """Anahtarın kaydını (varsa) siler."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Tüm kayıtları siler; sayaçlar korunur."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek boyutunu, sürelerini ve isabet/ıskalama sayaçlarını döndürür."""
+        negative = sum(1 for entry in self._entries.values() if entry[1])
+        return {
+            "size": len(self._entries),
+            "negative_size": negative,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "negative_ttl": self.negative_ttl,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# OpenLibraryClient sınıfı, Open Library isteklerine hız sınırı, yeniden deneme ve devre kesici uygular.
+class OpenLibraryClient:
+    def __init__(self, rate: float = 3.0, burst: int = 5, max_attempts: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 8.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 cache_size: int = 10000, cache_ttl: float = POSITIVE_TTL,
+                 negative_ttl: float = NEGATIVE_TTL):
+        """
+        OpenLibraryClient sınıfının yapıcı metodu.
+        Args:
+            rate (float): Saniyede gönderilebilecek ortalama istek sayısı.
+            burst (int): Art arda gönderilebilecek en fazla istek sayısı.
+            max_attempts (int): Bir istek için yapılacak en fazla deneme (ilk deneme dahil).
+            base_delay (float): Üstel geri çekilmenin başlangıç süresi (saniye).
+            max_delay (float): İki deneme arasındaki en uzun bekleme (saniye).
+            failure_threshold (int): Devre kesicinin açılması için art arda hata sayısı.
+            reset_timeout (float): Devre kesicinin açık kalma süresi (saniye).
+            cache_size (int): Sorgu önbelleğinin en fazla kayıt sayısı (0: önbellek kapalı).
+            cache_ttl (float): Önbellekteki başarılı sonuçların geçerlilik süresi (saniye).
+            negative_ttl (float): Önbellekteki "bulunamadı" sonuçlarının geçerlilik süresi (saniye).
+        """
+        self.limiter = RateLimiter(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.cache = LookupCache(cache_size, cache_ttl, negative_ttl)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Verilen denemeden sonra beklenecek süreyi döndürür ("full jitter": 0 ile
+        üstel sınır arasında rastgele), böylece eşzamanlı istemciler aynı anda tekrar denemez.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _retry_after(response: "httpx.Response") -> Optional[float]:
+        """Yanıttaki Retry-After başlığını saniye cinsinden döndürür; yoksa veya okunamazsa None."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        import email.utils
+
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    async def get(self, client: "httpx.AsyncClient", url: str, **kwargs) -> "httpx.Response":
+        """
+        Verilen istemciyle GET isteği gönderir. 429/5xx yanıtlarında ve ağ hatalarında
+        artan ve rastgele dağıtılan aralıklarla yeniden dener; 429'daki Retry-After
+        süresi kadar tüm istekleri yavaşlatır.
+        Args:
+            client (httpx.AsyncClient): İsteği gönderecek istemci.
+            url (str): İstenecek adres.
+            **kwargs: client.get metoduna aktarılacak ek argümanlar (timeout vb.).
+        Returns:
+            httpx.Response: Son yanıt. Denemeler tükendiyse yeniden denenebilir bir hata yanıtı olabilir.
+        Raises:
+            CircuitOpenError: Devre kesici açıksa (istek gönderilmez).
+            httpx.RequestError: Tüm denemeler ağ hatasıyla sonuçlandıysa.
+        """
+        import asyncio
+        import httpx
+
+        for attempt in range(1, self.max_attempts + 1):
+            admitted = self.breaker.allow_request()
+            if admitted is None:
+                raise CircuitOpenError(self.breaker.retry_after())
+            probe = admitted == CircuitBreaker.HALF_OPEN
+
+            try:
+                await self.limiter.acquire()
+                response = await client.get(url, **kwargs)
+            except httpx.RequestError:
+                self.breaker.record_failure(probe)
+                if attempt == self.max_attempts:
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            except BaseException:
+                # İptal (ör. asyncio.wait_for zaman aşımı) ve beklenmeyen hatalar devre
+                # kesicinin sonucu sayılmaz; yarı açık devre kalıcı olarak kilitlenmesin.
+                # Devre kapalıyken kabul edilen istek, başka bir isteğin deneme hakkını bırakamaz.
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            if response.status_code not in RETRYABLE_STATUSES:
+                self.breaker.record_success()
+                return response
+
+            self.breaker.record_failure(probe)
+            if attempt == self.max_attempts:
+                return response
+            delay = self._retry_after(response)
+            if delay is not None and response.status_code == 429:
+                # Bir sonraki acquire çağrısı (bu ve diğer istekler için) bu süre kadar bekletir
+                self.limiter.pause(min(self.max_delay, delay))
+            elif delay is not None:
+                await asyncio.sleep(min(self.max_delay, delay))
+            else:
+                await asyncio.sleep(self.backoff(attempt))
+        return response
@@ -0,0 +1,405 @@
+from itertools import chain
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+# Kalıcı (persistent) veri yapıları: her değişiklik yeni bir sürüm döndürür, eski sürüm
+# olduğu gibi kalır. Sürümler, değişmeyen düğümleri paylaştığı için bir ekleme veya
+# silme tüm koleksiyonu değil yalnızca kökten değişen öğeye giden yolu kopyalar
+# (O(log32 n)). Böylece okuyucular ellerindeki sürümü kilitsiz ve kopyasız kullanabilir.
+
+# Her düğüm en fazla 32 çocuk tutar; dizin/özet değerinin her 5 biti bir seviyeyi seçer.
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+# Python'un hash değerleri 64 bittir; bu derinliğin altında çakışan anahtarlar listede tutulur.
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+def _popcount(value: int) -> int:
+    """Bir tamsayıdaki 1 bitlerinin sayısını döndürür."""
+    return bin(value).count("1")
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    _popcount = int.bit_count  # noqa: F811
+
+
+# PersistentVector sınıfı, sonuna ekleme ve konuma göre değiştirme destekleyen değişmez dizidir.
+class PersistentVector:
+    """
+    32 dallı trie üzerinde değişmez dizi (Clojure'un PersistentVector yapısı).
+
+    Son 32 öğe ayrı bir "kuyruk" düğümünde tutulur; sona ekleme çoğunlukla yalnızca
+    bu küçük düğümü kopyalar, kuyruk dolunca trie'ye tek bir yol eklenir.
+    Konuma göre okuma ve değiştirme O(log32 n) sürer.
+    """
+
+    __slots__ = ("_count", "_shift", "_root", "_tail")
+
+    def __init__(self, count: int = 0, shift: int = _BITS, root: tuple = (), tail: tuple = ()):
+        """PersistentVector sınıfının yapıcı metodu. Yeni diziler from_iterable ile oluşturulur."""
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[Any]) -> "PersistentVector":
+        """Öğelerden, trie'yi alttan yukarı tek geçişte kurarak yeni bir dizi oluşturur (O(n))."""
+        items = list(items)
+        count = len(items)
+        if count <= _WIDTH:
+            return cls(count, _BITS, (), tuple(items))
+        tail_offset = ((count - 1) >> _BITS) << _BITS
+        nodes = [tuple(items[i:i + _WIDTH]) for i in range(0, tail_offset, _WIDTH)]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [tuple(nodes[i:i + _WIDTH]) for i in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+        return cls(count, shift, tuple(nodes), tuple(items[tail_offset:]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tail_offset(self) -> int:
+        """Kuyruktaki ilk öğenin konumunu döndürür."""
+        return 0 if self._count <= _WIDTH else ((self._count - 1) >> _BITS) << _BITS
+
+    def _leaf(self, i: int) -> tuple:
+        """i konumundaki öğeyi içeren yaprak düğümü döndürür."""
+        if i >= self._tail_offset():
+            return self._tail
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(i >> level) & _MASK]
+            level -= _BITS
+        return node
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("PersistentVector index out of range")
+        return self._leaf(i)[i & _MASK]
+
+    def __iter__(self) -> Iterator[Any]:
+        # Yalnızca iç düğümler Python'da gezilir; yapraklardaki öğeler C hızında zincirlenir
+        return chain(chain.from_iterable(self._leaves(self._root, self._shift)), self._tail)
+
+    def _leaves(self, node: tuple, level: int) -> Iterator[tuple]:
+        if level == _BITS:
+            yield from node
+            return
+        for child in node:
+            yield from self._leaves(child, level - _BITS)
+
+    def append(self, value: Any) -> "PersistentVector":
+        """Sonuna value eklenmiş yeni diziyi döndürür."""
+        count = self._count
+        if count - self._tail_offset() < _WIDTH:
+            return PersistentVector(count + 1, self._shift, self._root, self._tail + (value,))
+        # Kuyruk dolu: trie'ye taşınır, yeni kuyruk yalnızca value'dan oluşur
+        shift = self._shift
+        if (count >> _BITS) > (1 << shift):
+            # Kök doldu; ağaç bir seviye derinleşir
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _BITS
+        else:
+            root = self._push_tail(shift, self._root, self._tail)
+        return PersistentVector(count + 1, shift, root, (value,))
+
+    def _push_tail(self, level: int, parent: tuple, tail: tuple) -> tuple:
+        """Dolu kuyruğu trie'ye ekleyerek kökten kuyruğa kadar kopyalanmış yolu döndürür."""
+        index = ((self._count - 1) >> level) & _MASK
+        if level == _BITS:
+            child = tail
+        elif index < len(parent):
+            child = self._push_tail(level - _BITS, parent[index], tail)
+        else:
+            child = _new_path(level - _BITS, tail)
+        return parent[:index] + (child,) + parent[index + 1:]
+
+    def set(self, i: int, value: Any) -> "PersistentVector":
+        """i konumundaki öğesi value ile değiştirilmiş yeni diziyi döndürür."""
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("PersistentVector index out of range")
+        if i >= self._tail_offset():
+            j = i & _MASK
+            return PersistentVector(self._count, self._shift, self._root, self._tail[:j] + (value,) + self._tail[j + 1:])
+        return PersistentVector(self._count, self._shift, _assoc_path(self._shift, self._root, i, value), self._tail)
+
+
+def _new_path(level: int, node: tuple) -> tuple:
+    """Bir yaprağı verilen seviyeye kadar tek çocuklu düğümlerle sarar."""
+    while level > 0:
+        node = (node,)
+        level -= _BITS
+    return node
+
+
+def _assoc_path(level: int, node: tuple, i: int, value: Any) -> tuple:
+    """Kökten i konumuna giden yolu kopyalayıp yaprağa value yazar."""
+    if level == 0:
+        j = i & _MASK
+        return node[:j] + (value,) + node[j + 1:]
+    j = (i >> level) & _MASK
+    return node[:j] + (_assoc_path(level - _BITS, node[j], i, value),) + node[j + 1:]
+
+
+# HAMT düğümleri. Bir düğümün dizisindeki her girdi ya (hash, anahtar, değer) üçlüsüdür
+# ya da bir alt düğümdür; bitmap, 32 olası dalın hangilerinin dolu olduğunu gösterir.
+class _BitmapNode:
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap: int, array: tuple):
+        self.bitmap = bitmap
+        self.array = array
+
+    def find(self, h: int, shift: int, key: Any, default: Any) -> Any:
+        node = self
+        while True:
+            if isinstance(node, _CollisionNode):
+                return node.find(h, shift, key, default)
+            bit = 1 << ((h >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.array[_popcount(node.bitmap & (bit - 1))]
+            if isinstance(entry, tuple):
+                return entry[2] if entry[1] == key else default
+            node = entry
+            shift += _BITS
+
+    def assoc(self, h: int, shift: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        """Anahtarı eklenmiş/güncellenmiş düğümü ve yeni bir anahtar eklenip eklenmediğini döndürür."""
+        bit = 1 << ((h >> shift) & _MASK)
+        index = _popcount(self.bitmap & (bit - 1))
+        array = self.array
+        if not self.bitmap & bit:
+            return _BitmapNode(self.bitmap | bit, array[:index] + ((h, key, value),) + array[index:]), True
+        entry = array[index]
+        if isinstance(entry, tuple):
+            if entry[1] == key:
+                if entry[2] is value:
+                    return self, False
+                child, added = (h, key, value), False
+            else:
+                child, added = _merge(entry, (h, key, value), shift + _BITS), True
+        else:
+            child, added = entry.assoc(h, shift + _BITS, key, value)
+            if child is entry:
+                return self, False
+        return _BitmapNode(self.bitmap, array[:index] + (child,) + array[index + 1:]), added
+
+    def without(self, h: int, shift: int, key: Any) -> Any:
+        """
+        Anahtarı çıkarılmış girdiyi döndürür: anahtar yoksa düğümün kendisi, düğüm boşaldıysa
+        None, tek bir anahtar kaldıysa o anahtarın üçlüsü (üst düğüme taşınması için).
+        """
+        bit = 1 << ((h >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        index = _popcount(self.bitmap & (bit - 1))
+        entry = self.array[index]
+        if isinstance(entry, tuple):
+            if entry[1] != key:
+                return self
+            child = None
+        else:
+            child = entry.without(h, shift + _BITS, key)
+            if child is entry:
+                return self
+        if child is None:
+            if self.bitmap == bit:
+                return None
+            array = self.array[:index] + self.array[index + 1:]
+            if len(array) == 1 and isinstance(array[0], tuple):
+                return array[0]
+            return _BitmapNode(self.bitmap ^ bit, array)
+        if len(self.array) == 1 and isinstance(child, tuple):
+            return child
+        return _BitmapNode(self.bitmap, self.array[:index] + (child,) + self.array[index + 1:])
+
+    def entries(self) -> Iterator[tuple]:
+        for entry in self.array:
+            if isinstance(entry, tuple):
+                yield entry
+            else:
+                yield from entry.entries()
+
+
+class _CollisionNode:
+    """Tüm hash bitleri aynı olan anahtarları tutan düğüm."""
+
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, h: int, pairs: tuple):
+        self.hash = h
+        self.pairs = pairs
+
+    def find(self, h: int, shift: int, key: Any, default: Any) -> Any:
+        for entry in self.pairs:
+            if entry[1] == key:
+                return entry[2]
+        return default
+
+    def assoc(self, h: int, shift: int, key: Any, value: Any) -> Tuple[Any, bool]:
+        if h != self.hash:
+            # Farklı bir hash bu seviyede ayrışır; düğüm bir bitmap düğümüne sarılır
+            node = _BitmapNode(1 << ((self.hash >> shift) & _MASK), (self,))
+            return node.assoc(h, shift, key, value)
+        for i, entry in enumerate(self.pairs):
+            if entry[1] == key:
+                if entry[2] is value:
+                    return self, False
+                return _CollisionNode(h, self.pairs[:i] + ((h, key, value),) + self.pairs[i + 1:]), False
+        return _CollisionNode(h, self.pairs + ((h, key, value),)), True
+
+    def without(self, h: int, shift: int, key: Any) -> Any:
+        pairs = tuple(entry for entry in self.pairs if entry[1] != key)
+        if len(pairs) == len(self.pairs):
+            return self
+        if len(pairs) == 1:
+            return pairs[0]
+        return _CollisionNode(self.hash, pairs)
+
+    def entries(self) -> Iterator[tuple]:
+        return iter(self.pairs)
+
+
+def _merge(a: tuple, b: tuple, shift: int) -> Any:
+    """Aynı dala düşen iki girdiyi, ayrıştıkları seviyeye kadar inen bir alt düğümde birleştirir."""
+    if a[0] == b[0] or shift >= _HASH_BITS:
+        return _CollisionNode(a[0], (a, b))
+    bit_a = (a[0] >> shift) & _MASK
+    bit_b = (b[0] >> shift) & _MASK
+    if bit_a == bit_b:
+        return _BitmapNode(1 << bit_a, (_merge(a, b, shift + _BITS),))
+    array = (a, b) if bit_a < bit_b else (b, a)
+    return _BitmapNode((1 << bit_a) | (1 << bit_b), array)
+
+
+def _as_root(entry: Any) -> _BitmapNode:
+    """Kökte tek başına kalan bir girdiyi (üçlü veya çakışma düğümü) bitmap düğümüne sarar."""
+    if entry is None:
+        return _EMPTY_NODE
+    if isinstance(entry, _BitmapNode):
+        return entry
+    h = entry[0] if isinstance(entry, tuple) else entry.hash
+    return _BitmapNode(1 << (h & _MASK), (entry,))
+
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+
+# PersistentMap sınıfı, paylaşılan bir taban sözlük ve HAMT katmanından oluşan değişmez sözlüktür.
+class PersistentMap:
+    """
+    Değişmez sözlük. set ve delete yeni bir sürüm döndürür.
+
+    Anahtarlar iki katmanda tutulur: sürümler arasında paylaşılan ve hiç değiştirilmeyen
+    bir taban sözlük (dict) ve sonraki değişiklikleri tutan bir hash array mapped trie
+    (HAMT). Silinen taban anahtarları HAMT'de _DELETED ile işaretlenir. Büyük bir
+    sözlük bu sayede yüklemede C hızında kurulur ve okumaların çoğu doğrudan tabandan
+    yapılır; değişiklikler O(log32 k) sürer (k: HAMT'deki değişiklik sayısı). HAMT,
+    tabanın sekizde birini geçince değişiklikler yeni bir taban sözlüğe katlanır; bu
+    O(n) kopyanın maliyeti önceki değişikliklere yayılır.
+    """
+
+    __slots__ = ("_base", "_root", "_changed", "_count")
+
+    def __init__(self, base: Optional[dict] = None, root: _BitmapNode = _EMPTY_NODE,
+                 changed: int = 0, count: Optional[int] = None):
+        """
+        PersistentMap sınıfının yapıcı metodu. Dolu sözlükler from_items ile oluşturulur.
+        Args:
+            base (dict): Taban sözlük. Sözlüğe verildikten sonra değiştirilmemelidir.
+            root (_BitmapNode): Değişiklik katmanının kökü.
+            changed (int): Değişiklik katmanındaki girdi sayısı.
+            count (int): Toplam anahtar sayısı. None ise taban sözlüğün boyutu.
+        """
+        self._base = base if base is not None else {}
+        self._root = root
+        self._changed = changed
+        self._count = len(self._base) if count is None else count
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[Any, Any]]) -> "PersistentMap":
+        """(anahtar, değer) çiftlerinden yeni bir sözlük oluşturur; tekrarlanan anahtarda sonuncusu kalır."""
+        return cls(dict(items))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        """Anahtarın değerini döndürür; anahtar yoksa default."""
+        if self._changed:
+            value = self._root.find(hash(key) & _HASH_MASK, 0, key, _MISSING)
+            if value is not _MISSING:
+                return default if value is _DELETED else value
+        return self._base.get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> "PersistentMap":
+        """Anahtarı value değerine eşlenmiş yeni sözlüğü döndürür."""
+        current = self.get(key, _MISSING)
+        if current is value:
+            return self
+        root, added = self._root.assoc(hash(key) & _HASH_MASK, 0, key, value)
+        count = self._count + 1 if current is _MISSING else self._count
+        return PersistentMap(self._base, root, self._changed + added, count)._compacted()
+
+    def delete(self, key: Any) -> "PersistentMap":
+        """Anahtarı çıkarılmış yeni sözlüğü döndürür; anahtar yoksa sözlüğün kendisi."""
+        if key not in self:
+            return self
+        h = hash(key) & _HASH_MASK
+        if key in self._base:
+            root, added = self._root.assoc(h, 0, key, _DELETED)
+            changed = self._changed + added
+        else:
+            root = _as_root(self._root.without(h, 0, key))
+            changed = self._changed - 1
+        return PersistentMap(self._base, root, changed, self._count - 1)._compacted()
+
+    def _compacted(self) -> "PersistentMap":
+        """Değişiklik katmanı büyüdüyse değişiklikleri yeni bir taban sözlüğe katlar."""
+        if self._changed <= max(_WIDTH, len(self._base) >> 3):
+            return self
+        base = dict(self._base)
+        for _, key, value in self._root.entries():
+            if value is _DELETED:
+                del base[key]
+            else:
+                base[key] = value
+        return PersistentMap(base)
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        if not self._changed:
+            yield from self._base.items()
+            return
+        changes = {key: value for _, key, value in self._root.entries()}
+        for key, value in self._base.items():
+            if key not in changes:
+                yield key, value
+        for key, value in changes.items():
+            if value is not _DELETED:
+                yield key, value
+
+    def __iter__(self) -> Iterator[Any]:
+        return (key for key, _ in self.items())
+
+
+_MISSING = object()
+# Değişiklik katmanında, taban sözlükten silinmiş anahtarları işaretler.
+_DELETED = object()
@@ -0,0 +1,390 @@
+import heapq
+import math
+import re
+import sys
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from textfold import fold
+
+# Kelimeleri ayırmak için kullanılan düzenli ifade (harf ve rakam dizileri).
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalleştirilmiş (bkz. textfold.fold) metni kelimelerine ayırır."""
+    return _WORD_RE.findall(text)
+
+
+def trigrams(word: str) -> FrozenSet[str]:
+    """
+    Bir kelimenin karakter üçlülerini (trigram) döndürür.
+    Kelime başına iki, sonuna bir boşluk eklenir; böylece kısa kelimeler ve
+    kelime başları da eşleşmeye katkı sağlar ("ali" -> "  a", " al", "ali", "li ").
+    Args:
+        word (str): Normalleştirilmiş tek bir kelime.
+    Returns:
+        frozenset: Kelimedeki benzersiz trigramlar.
+    """
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def edit_similarity(a: str, b: str, above: float = -1.0) -> float:
+    """
+    İki kelime arasındaki düzenleme benzerliğini döndürür: 1 - mesafe / en uzun kelime.
+    Mesafe, yan yana iki harfin yer değiştirmesini tek hata sayan (optimal string
+    alignment) Damerau-Levenshtein mesafesidir; "goerge" ile "george" arasında 1'dir.
+    Args:
+        above (float): Benzerlik bu değeri geçemeyecekse hesaplama erken bırakılır ve 0.0 döner.
+    """
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    longest = max(len(a), len(b))
+    # Benzerliğin above'u geçmesi için mesafenin bundan küçük olması gerekir
+    limit = (1 - above) * longest
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    previous_min = 0
+    for i, ca in enumerate(a, 1):
+        current = [i] * (len(b) + 1)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            # min() çağrısı yerine karşılaştırmalar: bu döngü aramanın en sık çalışan kısmıdır
+            value = previous[j - 1] if ca == cb else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        # Sonraki satırlar bu satırdan, yer değiştirmede bir önceki satırdan +1 ile türer
+        if row_min >= limit and previous_min + 1 >= limit:
+            return 0.0
+        previous2, previous, previous_min = previous, current, row_min
+    return 1 - previous[-1] / longest
+
+
+# Düzenleme benzerliğiyle yeniden puanlanacak adayların sağlaması gereken en düşük Dice
+# katsayısı, min_score'un bu oranıdır. Harf yer değiştirmesi gibi trigramları çok bozan
+# ama düzenleme benzerliği yüksek kelimeler ("goerge") için min_score'dan biraz düşüktür.
+CANDIDATE_RATIO = 0.75
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+# TrigramIndex sınıfı, kelimeler arasında trigram benzerliğiyle arama yapan dizindir.
+class TrigramIndex:
+    def __init__(self, merge_limit: int = 2000):
+        """
+        TrigramIndex sınıfının yapıcı metodu.
+        Args:
+            merge_limit (int): Bir sorgu kelimesi için her uzunluk grubunda birleştirilecek en
+                fazla liste öğesi. Aşılırsa en uzun listeler yalnızca doğrulamada kullanılır;
+                yani o gruptaki adaylardan daha çok ortak trigram istenir.
+        """
+        self.merge_limit = merge_limit
+        # (trigram sayısı, trigram) çiftinden, o trigramı içeren ve o kadar trigramı olan
+        # kelimelere eşleme. Listeler kelime uzunluğuna göre bölündüğü için benzerlik
+        # eşiğine ulaşamayacak uzunluktaki kelimelerin listeleri hiç okunmaz.
+        self._postings: Dict[Tuple[int, str], Set[str]] = {}
+        # Trigram sayısından, o sayıda trigramı olan kelime sayısına eşleme
+        self._sizes: Dict[int, int] = {}
+        # Kelimeden kelimenin trigram kümesine eşleme
+        self._words: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str):
+        """Bir kelimeyi dizine ekler; zaten varsa bir şey yapmaz."""
+        if word in self._words:
+            return
+        grams = trigrams(word)
+        size = len(grams)
+        self._words[word] = grams
+        self._sizes[size] = self._sizes.get(size, 0) + 1
+        for gram in grams:
+            bucket = self._postings.get((size, gram))
+            if bucket is None:
+                self._postings[(size, gram)] = {word}
+            else:
+                bucket.add(word)
+
+    def remove(self, word: str):
+        """Bir kelimeyi dizinden çıkarır."""
+        grams = self._words.pop(word, None)
+        if grams is None:
+            return
+        size = len(grams)
+        self._sizes[size] -= 1
+        if not self._sizes[size]:
+            del self._sizes[size]
+        for gram in grams:
+            bucket = self._postings[(size, gram)]
+            bucket.discard(word)
+            if not bucket:
+                del self._postings[(size, gram)]
+
+    def similar(self, word: str, limit: int = 32, min_score: float = 0.4) -> List[Tuple[str, float]]:
+        """
+        Verilen kelimeye en çok benzeyen dizindeki kelimeleri döndürür.
+        Adaylar trigram kümeleri üzerinden Dice katsayısıyla (2·ortak / (|a| + |b|))
+        sıralanır; en iyi adaylar ayrıca düzenleme benzerliğiyle yeniden puanlanır ve
+        ikisinden büyük olanı kullanılır. Böylece trigramların zayıf kaldığı harf
+        yer değiştirmeleri ("goerge") de yakalanır.
+
+        Aday olmak için Dice katsayısının min_score · CANDIDATE_RATIO'ya ulaşması gerekir. Bu eşik,
+        okunacak listeleri sınırlar (CPMerge): her aday uzunluğu için gereken ortak
+        trigram sayısı t ise, kelimenin en kısa |a| - t + 1 listesinden birinde geçmeyen
+        bir kelime eşiğe ulaşamaz. Bu listeler birleştirilir; kelime başı trigramları
+        gibi dağarcığın büyük kısmını içeren uzun listeler yalnızca bulunan adaylar
+        için üyelik sorgusuyla kontrol edilir. Birleştirilen öğe sayısı merge_limit ile,
+        düzenleme benzerliği hesaplanan aday sayısı limit · 4 ile sınırlıdır; böylece bir
+        kelimenin maliyeti dağarcık büyüklüğünden bağımsızdır.
+        Args:
+            word (str): Normalleştirilmiş sorgu kelimesi.
+            limit (int): Döndürülecek en fazla kelime sayısı.
+            min_score (float): Kabul edilecek en düşük benzerlik.
+        Returns:
+            list: (kelime, benzerlik) çiftleri, benzerliğe göre azalan sırada.
+        """
+        grams = trigrams(word)
+        size = len(grams)
+        postings = self._postings
+        # Tek ortak trigram (çoğunlukla yalnızca ilk harf) anlamlı bir benzerlik sayılmaz
+        min_shared = 1 if size <= 2 else 2
+        candidate_score = min_score * CANDIDATE_RATIO
+        candidates = []
+        for other in self._sizes:
+            # Dice >= candidate_score için gereken ortak trigram sayısı; 1e-9 kayan nokta hatasını giderir
+            needed = max(min_shared, math.ceil(candidate_score * (size + other) / 2 - 1e-9))
+            if needed > min(size, other):
+                continue
+            buckets = sorted((postings.get((other, gram), _EMPTY) for gram in grams), key=len)
+            split = size - needed + 1
+            merged = sum(len(bucket) for bucket in buckets[:split])
+            while split > 1 and merged > self.merge_limit:
+                split -= 1
+                merged -= len(buckets[split])
+            needed = size - split + 1
+            counts: Counter = Counter()
+            for bucket in buckets[:split]:
+                counts.update(bucket)
+            # Uzun listeler taranmaz; kesişim, adaylar üzerinden C düzeyinde yapılır
+            for bucket in buckets[split:]:
+                counts.update(bucket.intersection(counts))
+            candidates.extend(
+                (2 * shared / (size + other), candidate) for candidate, shared in counts.items() if shared >= needed
+            )
+        shortlist = heapq.nlargest(limit * 4, candidates)
+
+        # En iyi `limit` sonuç bir min-yığında tutulur; yığın dolduktan sonra düzenleme
+        # benzerliği yalnızca en düşük sonucu geçebilecek adaylar için sonuna kadar hesaplanır
+        scored: List[Tuple[float, str]] = []
+        for dice, candidate in shortlist:
+            floor = scored[0][0] if len(scored) >= limit else min_score
+            above = max(dice, floor - 1e-9)
+            # Uzunluk farkı düzenleme benzerliğine üst sınır koyar; above'u geçemeyecekse hesaplanmaz
+            longest = max(len(word), len(candidate))
+            if 1 - abs(len(word) - len(candidate)) / longest > above:
+                score = max(dice, edit_similarity(word, candidate, above))
+            else:
+                score = dice
+            if score < min_score:
+                continue
+            if len(scored) < limit:
+                heapq.heappush(scored, (score, candidate))
+            elif (score, candidate) > scored[0]:
+                heapq.heapreplace(scored, (score, candidate))
+        return [(candidate, score) for score, candidate in sorted(scored, reverse=True)]
+
+
+# FuzzyIndex sınıfı, belgeler (kitaplar) üzerinde yazım hatalarına toleranslı arama sağlar.
+class FuzzyIndex:
+    """
+    Artımlı güncellenen, yazım hatalarına toleranslı tam metin dizini.
+
+    Trigramlar belge başına değil, benzersiz kelime dağarcığı üzerinde tutulur:
+    sorgudaki her kelime önce TrigramIndex ile dağarcıktaki benzer kelimelere
+    eşlenir, ardından bu kelimeleri içeren belgeler puanlanır. Dağarcık, belge
+    sayısından çok daha küçük olduğu için bellek ve sorgu süresi katalog
+    büyüdükçe belge sayısıyla doğrusal artmaz.
+    """
+
+    def __init__(self, max_terms: int = 32, term_min_score: float = 0.4, term_margin: float = 0.25,
+                 bucket_limit: int = 1000):
+        """
+        FuzzyIndex sınıfının yapıcı metodu.
+        Args:
+            max_terms (int): Her sorgu kelimesi için değerlendirilecek en fazla benzer kelime.
+            term_min_score (float): Bir kelimenin eşleşme sayılması için gereken en düşük benzerlik.
+            term_margin (float): Sorgu kelimesine en benzer kelimeden bu kadar daha düşük
+                benzerlikteki kelimeler değerlendirmeye alınmaz.
+            bucket_limit (int): Bir kelimenin belge listesinden puanlanacak en fazla yeni belge.
+                "the" gibi yaygın kelimelerde arama süresini katalog boyutundan bağımsız tutar.
+        """
+        self.max_terms = max_terms
+        self.term_min_score = term_min_score
+        self.term_margin = term_margin
+        self.bucket_limit = bucket_limit
+        self._vocabulary = TrigramIndex()
+        # Kelimeden, o kelimeyi içeren belge anahtarlarına eşleme
+        self._postings: Dict[str, Set[str]] = {}
+        # Belge anahtarından belgenin kelimelerine eşleme (silme ve sıralama için)
+        self._documents: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._documents
+
+    def add(self, key: str, text: str, folded: bool = False):
+        """
+        Bir belgeyi dizine ekler; anahtar zaten varsa önce eski hali çıkarılır.
+        Args:
+            key (str): Belgenin benzersiz anahtarı (kanonik ISBN).
+            text (str): Dizinlenecek metin (başlık ve yazar).
+            folded (bool): Metin textfold.fold ile zaten normalleştirilmişse True.
+        """
+        if key in self._documents:
+            self.remove(key)
+        if not folded:
+            text = fold(text)
+        words = tuple(sys.intern(word) for word in dict.fromkeys(tokenize(text)))
+        self._documents[key] = words
+        for word in words:
+            bucket = self._postings.get(word)
+            if bucket is None:
+                self._postings[word] = {key}
+                self._vocabulary.add(word)
+            else:
+                bucket.add(key)
+
+    def remove(self, key: str) -> bool:
+        """
+        Bir belgeyi dizinden çıkarır; artık hiçbir belgede geçmeyen kelimeler dağarcıktan silinir.
+        Returns:
+            bool: Belge dizindeyse True, değilse False.
+        """
+        words = self._documents.pop(key, None)
+        if words is None:
+            return False
+        for word in words:
+            bucket = self._postings[word]
+            bucket.discard(key)
+            if not bucket:
+                del self._postings[word]
+                self._vocabulary.remove(word)
+        return True
+
+    def clear(self):
+        """Dizindeki tüm belgeleri siler."""
+        self._vocabulary = TrigramIndex()
+        self._postings = {}
+        self._documents = {}
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """
+        Sorguya en çok benzeyen belgeleri puana göre sıralı döndürür.
+
+        Sorgudaki her kelime için belgede bulunan en benzer kelimenin benzerliği,
+        sorgu kelimesinin nadirliğiyle (IDF) ağırlıklandırılır; belgenin puanı bu
+        değerlerin ağırlıklı ortalamasıdır (0-1). Böylece "the", "of" gibi yaygın
+        kelimeler sıralamayı belirlemez. Eşit puanlarda daha az kelimeden oluşan
+        belgeler öne alınır.
+
+        Sıralama Fagin'in eşik algoritmasıyla yapılır: sorgu kelimelerinin eşleştiği
+        dağarcık kelimelerinin belge listeleri, puana katkısı (ağırlık x benzerlik) en
+        büyük olandan başlanarak okunur ve yeni görülen belgeler tam olarak puanlanır.
+        Henüz görülmemiş bir belgenin alabileceği en yüksek puan, her kelime için
+        sıradaki katkıların toplamıdır; en iyi `limit` sonucun en düşüğü bu sınıra
+        ulaştığında arama durur. Yaygın kelimelerin uzun listelerine çoğu zaman hiç
+        gelinmez; gelinirse listeden en fazla `bucket_limit` yeni belge puanlanır.
+
+        Args:
+            query (str): Arama sorgusu.
+            limit (int): Döndürülecek en fazla sonuç sayısı.
+            min_score (float): Sonuçlara dahil edilmek için gereken en düşük puan.
+        Returns:
+            list: (anahtar, puan) çiftleri, puana göre azalan sırada.
+        """
+        words = list(dict.fromkeys(tokenize(fold(query))))
+        if not words or limit <= 0:
+            return []
+
+        # Her sorgu kelimesi için benzer dağarcık kelimeleri (benzerliğe göre azalan),
+        # belge puanlamasında kullanılacak kelime -> benzerlik sözlüğü ve kelimenin ağırlığı
+        postings_map = self._postings
+        total_documents = len(self._documents)
+        matches = []
+        term_scores = []
+        weights = []
+        for word in words:
+            terms = self._vocabulary.similar(word, self.max_terms, self.term_min_score)
+            cutoff = terms[0][1] - self.term_margin if terms else 0.0
+            terms = [(term, score) for term, score in terms if score >= cutoff]
+            matches.append([(postings_map[term], score) for term, score in terms])
+            term_scores.append(dict(terms))
+            # En benzer kelimenin belge sıklığından hesaplanan BM25 IDF ağırlığı
+            frequency = len(postings_map[terms[0][0]]) if terms else 0
+            weights.append(math.log(1 + (total_documents - frequency + 0.5) / (frequency + 0.5)))
+
+        total = sum(weights)
+        threshold = min_score * total
+        bucket_limit = self.bucket_limit
+        documents = self._documents
+        positions = [0] * len(words)
+        seen: Set[str] = set()
+        heap: List[Tuple[float, int, str]] = []
+
+        while True:
+            # Puana en çok katkı verebilecek okunmamış belge listesi seçilir
+            best, best_gain = -1, 0.0
+            for i, postings in enumerate(matches):
+                if positions[i] < len(postings):
+                    gain = weights[i] * postings[positions[i]][1]
+                    if gain > best_gain:
+                        best, best_gain = i, gain
+            if best < 0:
+                break
+            bucket, _ = matches[best][positions[best]]
+            positions[best] += 1
+
+            scored = 0
+            for key in bucket:
+                if key in seen:
+                    continue
+                if scored >= bucket_limit:
+                    break
+                scored += 1
+                seen.add(key)
+                doc_words = documents[key]
+                score = 0.0
+                for weight, scores in zip(weights, term_scores):
+                    score += weight * max([scores.get(w, 0.0) for w in doc_words])
+                if score < threshold:
+                    continue
+                item = (score, -len(doc_words), key)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+            upper = sum(
+                weight * postings[position][1] if position < len(postings) else 0.0
+                for weight, postings, position in zip(weights, matches, positions)
+            )
+            if upper < threshold or upper == 0.0 or (len(heap) == limit and heap[0][0] >= upper):
+                break
+
+        return [(key, round(score / total, 4)) for score, _, key in sorted(heap, reverse=True)]
@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+# Parçalı (sharded) veri düzeni: kitaplar ISBN'lerinin CRC32 özetine göre N dosyaya
+# bölünür ve <veri dosyası>.shards/ dizininde saklanır. Bir değişiklikte yalnızca
+# değişen kitapların bulunduğu parçalar yeniden yazılır; açılışta parçalar bir işlem
+# havuzunda paralel okunur. Kitapların eklenme sırası, her kayıttaki "order" alanıyla korunur.
+
+MANIFEST_FILE = "manifest.json"
+# Toplam boyutu bunun altındaki parçalar tek işlemde okunur; işlem havuzunu
+# başlatmak küçük dosyaları okumaktan uzun sürer.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Parça okuyan işlemlerin döndürdüğü kayıt: (order, title, author, isbn, search_key).
+# search_key, kayıttaki anahtar eski sürümdeyse yeniden hesaplanmış olarak döner.
+Record = Tuple[int, str, str, str, str]
+
+
+def shard_dir(data_file: str) -> str:
+    """Parçaların saklandığı dizini döndürür; veri dosyasının yanında tutulur."""
+    return f"{data_file}.shards"
+
+
+def shard_path(directory: str, index: int) -> str:
+    """index numaralı parçanın dosya yolunu döndürür."""
+    return os.path.join(directory, f"{index:03d}.json")
+
+
+def shard_of(isbn: str, shards: int) -> int:
+    """
+    Kanonik ISBN'in hangi parçada saklanacağını döndürür.
+    Python'un hash() değeri her çalıştırmada değiştiği için kalıcı bir özet (CRC32) kullanılır.
+    """
+    return zlib.crc32(isbn.encode("utf-8")) % shards
+
+
+def read_manifest(directory: str) -> Optional[int]:
+    """
+    Parçalı düzenin parça sayısını okur.
+    Returns:
+        int: Parça sayısı; dizinde geçerli bir manifest yoksa None.
+    """
+    if not os.path.isdir(directory):
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            shards = json.load(f)["shards"]
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"Hata: {directory} parça manifesti okunamadı: {e}")
+        return None
+    return shards if isinstance(shards, int) and shards > 0 else None
+
+
+def read_shard(path: str) -> Tuple[List[Record], int, Optional[str]]:
+    """
+    Tek bir parça dosyasını okur ve kayıtları eklenme sırasına göre döndürür.
+    İşlem havuzunda çalıştırıldığı için Book nesneleri yerine, işlemler arasında
+    hızlı aktarılan demetler döndürür. Arama anahtarı eski sürümde olan kayıtların
+    anahtarları da burada, paralel olarak hesaplanır.
+    Args:
+        path (str): Parça dosyası. Dosya yoksa parça boş sayılır.
+    Returns:
+        tuple: (kayıtlar, anahtarı yeniden hesaplanan kayıt sayısı, hata mesajı veya None).
+    """
+    from classes import Book
+    from textfold import FOLD_VERSION
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return [], 0, None
+    except (OSError, json.JSONDecodeError) as e:
+        return [], 0, f"{path} parça dosyası okunamadı: {e}"
+
+    records: List[Record] = []
+    outdated = 0
+    try:
+        for item in data:
+            title, author = item["title"], item["author"]
+            search_key = item.get("search_key")
+            if item.get("search_key_version") != FOLD_VERSION or search_key is None:
+                search_key = Book.make_search_key(title, author)
+                outdated += 1
+            records.append((item["order"], title, author, item["isbn"], search_key))
+    except (KeyError, TypeError) as e:
+        return [], 0, f"{path} parça dosyasında geçersiz kayıt: {e}"
+    records.sort()
+    return records, outdated, None
+
+
+def read_shards(directory: str, shards: int, workers: Optional[int] = None,
+                min_bytes: int = PARALLEL_MIN_BYTES) -> Tuple[List[Record], int, List[str]]:
+    """
+    Tüm parçaları okur ve kayıtları eklenme sırasında birleştirir.
+    Parçalar toplamda min_bytes'tan büyükse bir işlem havuzunda paralel okunur; JSON
+    ayrıştırma tek bir işlemcide sırayla yapılmaz.
+    Args:
+        directory (str): Parça dizini.
+        shards (int): Parça sayısı.
+        workers (int): Okuma işlem sayısı. Varsayılan: işlemci sayısı (en fazla parça sayısı).
+        min_bytes (int): İşlem havuzunun kullanılacağı en küçük toplam boyut.
+    Returns:
+        tuple: (eklenme sırasındaki kayıtlar, anahtarı yeniden hesaplanan kayıt sayısı, hata mesajları).
+    """
+    paths = [shard_path(directory, i) for i in range(shards)]
+    workers = min(workers or os.cpu_count() or 1, shards)
+    total = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+    if workers > 1 and total >= min_bytes:
+        # Havuz yalnızca burada gerekir; küçük kütüphanelerin açılışı concurrent.futures'ı yüklemez
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(read_shard, paths))
+    else:
+        results = [read_shard(path) for path in paths]
+
+    # Her parça kendi içinde sıralı; sıralama bu dizileri doğrusal zamana yakın birleştirir
+    records = [record for result in results for record in result[0]]
+    records.sort()
+    outdated = sum(result[1] for result in results)
+    errors = [result[2] for result in results if result[2] is not None]
+    return records, outdated, errors
+
+
+def write_shards(directory: str, shards: int, contents: Dict[int, List[dict]]) -> bool:
+    """
+    Verilen parçaları ve manifesti yazar. Parçalar önce geçici dosyalara yazılır,
+    hepsi başarıyla yazıldıktan sonra asıl dosyaların yerine taşınır; böylece bir
+    yazma hatası birden çok parçayı etkileyen bir değişikliği yarım bırakmaz.
+    Args:
+        directory (str): Parça dizini (yoksa oluşturulur).
+        shards (int): Toplam parça sayısı (manifest için).
+        contents (dict): Parça numarasından parçanın kayıtlarına eşleme. Yalnızca
+            verilen parçalar yeniden yazılır.
+    Returns:
+        bool: Yazma başarılıysa True, aksi takdirde False.
+    """
+    written: List[Tuple[str, str]] = []
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for index, records in contents.items():
+            path = shard_path(directory, index)
+            # json.dumps girintisiz çağrıldığında C kodlayıcısını tek seferde kullanır
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                f.write(json.dumps(records, ensure_ascii=False))
+            written.append((f"{path}.tmp", path))
+        # Manifest en son yazılır; parçalar tamamlanmadan yeni düzen okunmaz
+        if read_manifest(directory) != shards:
+            manifest = os.path.join(directory, MANIFEST_FILE)
+            with open(f"{manifest}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"shards": shards, "hash": "crc32"}, f)
+            written.append((f"{manifest}.tmp", manifest))
+        for temp_file, path in written:
+            os.replace(temp_file, path)
+        return True
+    except OSError as e:
+        print(f"Veri kaydetme hatası: {e}")
+        for temp_file, _ in written:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+        return False
+
+
+def remove_shards(directory: str, keep: int = 0):
+    """
+    Artık kullanılmayan parça dosyalarını siler.
+    Args:
+        directory (str): Parça dizini.
+        keep (int): Korunacak parça sayısı; bu numaradan itibaren parçalar silinir.
+            0 ise parçalı düzenin tamamı silinir (tek dosyalı düzene dönülürken).
+    """
+    if keep == 0:
+        shutil.rmtree(directory, ignore_errors=True)
+        return
+    index = keep
+    while os.path.exists(shard_path(directory, index)):
+        os.remove(shard_path(directory, index))
+        index += 1
@@ -1,111 +1,299 @@
-import pytest
-import os
-import json
-from fastapi.testclient import TestClient
-from unittest.mock import patch, AsyncMock
-import httpx
-
-from api import app, library
-from classes import Book
-
-@pytest.fixture
-def client():
-    return TestClient(app)
-
-@pytest.fixture
-def setup_test_library():
-    test_file = "test_api_library.json"
-    test_books = [
-        {"title": "1984", "author": "George Orwell", "isbn": "978-0451524935"},
-        {"title": "Python Programming", "author": "John Doe", "isbn": "978-1234567890"}
-    ]
-    with open(test_file, 'w', encoding='utf-8') as f:
-        json.dump(test_books, f, indent=4, ensure_ascii=False)
-    original_data_file = library.data_file
-    original_books = library._books.copy()
-    library.data_file = test_file
-    library.load_books()
-    yield library
-    if os.path.exists(test_file):
-        os.remove(test_file)
-    library.data_file = original_data_file
-    library._books = original_books
-
-@pytest.fixture
-def empty_library():
-    test_file = "test_empty_library.json"
-    with open(test_file, 'w', encoding='utf-8') as f:
-        f.write("[]")
-    original_data_file = library.data_file
-    original_books = library._books.copy()
-    library.data_file = test_file
-    library.load_books()
-    yield library
-    if os.path.exists(test_file):
-        os.remove(test_file)
-    library.data_file = original_data_file
-    library._books = original_books
-
-class TestGetBooks:
-    def test_get_books_empty(self, client, empty_library):
-        response = client.get("/books")
-        assert response.status_code == 200
-        assert response.json() == []
-    
-    def test_get_books_with_data(self, client, setup_test_library):
-        response = client.get("/books")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-        assert data[0]["title"] == "1984"
-
-class TestPostBooks:
-    @pytest.mark.asyncio
-    async def test_add_book_success(self, client, empty_library):
-        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
-            expected_book = Book("Mocked Test Book", "Mocked Author", "9780123456789")
-            mock_add_book_from_api.return_value = expected_book
-            response = client.post("/books", json={"isbn": "9780123456789"})
-            assert response.status_code == 201
-            data = response.json()
-            assert data["title"] == expected_book.title
-
-    @pytest.mark.asyncio
-    async def test_add_book_network_error(self, client, empty_library):
-        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
-            mock_add_book_from_api.side_effect = Exception("Simulated network error")
-            response = client.post("/books", json={"isbn": "9780123456789"})
-            assert response.status_code == 400
-            assert "9780123456789" in response.json()["detail"]
-
-class TestAPIIntegration:
-    @pytest.mark.asyncio
-    async def test_full_crud_cycle(self, client, empty_library):
-        response = client.get("/books")
-        assert response.status_code == 200
-        assert len(response.json()) == 0
-
-        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
-            def mock_add_book_side_effect(isbn):
-                book = Book("Integration Test Book", "Test Author", isbn)
-                library._books.append(book)
-                return book
-            mock_add_book_from_api.side_effect = mock_add_book_side_effect
-            response = client.post("/books", json={"isbn": "9780123456789"})
-            assert response.status_code == 201
-
-        response = client.get("/books")
-        assert response.status_code == 200
-        books = response.json()
-        assert len(books) == 1
-        assert books[0]["isbn"] == "9780123456789"
-
-        response = client.delete("/books/9780123456789")
-        assert response.status_code == 204
-
-        response = client.get("/books")
-        assert response.status_code == 200
-        assert len(response.json()) == 0
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+import pytest
+import os
+import json
+import time
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+import httpx
+import asyncio
+
+import api
+from api import app, library, import_queue
+from classes import Book
+from openlibrary import CircuitOpenError
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def setup_test_library():
+    test_file = "test_api_library.json"
+    test_books = [
+        {"title": "1984", "author": "George Orwell", "isbn": "978-0451524935"},
+        {"title": "Python Programming", "author": "John Doe", "isbn": "978-1234567890"}
+    ]
+    with open(test_file, 'w', encoding='utf-8') as f:
+        json.dump(test_books, f, indent=4, ensure_ascii=False)
+    original_data_file = library.data_file
+    library.data_file = test_file
+    library.load_books()
+    yield library
+    for path in (test_file, f"{test_file}.changes.jsonl"):
+        if os.path.exists(path):
+            os.remove(path)
+    library.data_file = original_data_file
+    library.load_books()
+
+@pytest.fixture
+def empty_library():
+    test_file = "test_empty_library.json"
+    with open(test_file, 'w', encoding='utf-8') as f:
+        f.write("[]")
+    original_data_file = library.data_file
+    library.data_file = test_file
+    library.load_books()
+    yield library
+    for path in (test_file, f"{test_file}.changes.jsonl"):
+        if os.path.exists(path):
+            os.remove(path)
+    library.data_file = original_data_file
+    library.load_books()
+
+class TestGetBooks:
+    def test_get_books_empty(self, client, empty_library):
+        response = client.get("/books")
+        assert response.status_code == 200
+        assert response.json() == []
+    
+    def test_get_books_with_data(self, client, setup_test_library):
+        response = client.get("/books")
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2
+        assert data[0]["title"] == "1984"
+
+class TestSearchBooks:
+    def test_search_substring(self, client, setup_test_library):
+        response = client.get("/books/search", params={"q": "orwell"})
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["title"] == "1984"
+        assert data[0]["score"] is None
+
+    def test_search_fuzzy(self, client, setup_test_library):
+        response = client.get("/books/search", params={"q": "goerge orwel", "fuzzy": "true"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["title"] == "1984"
+        assert 0 < data[0]["score"] <= 1
+
+class TestPostBooks:
+    @pytest.mark.asyncio
+    async def test_add_book_success(self, client, empty_library):
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            expected_book = Book("Mocked Test Book", "Mocked Author", "9780123456786")
+            mock_add_book_from_api.return_value = expected_book
+            response = client.post("/books", json={"isbn": "9780123456786"})
+            assert response.status_code == 201
+            data = response.json()
+            assert data["title"] == expected_book.title
+
+    @pytest.mark.asyncio
+    async def test_add_book_network_error(self, client, empty_library):
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            mock_add_book_from_api.side_effect = Exception("Simulated network error")
+            response = client.post("/books", json={"isbn": "9780123456786"})
+            assert response.status_code == 400
+            assert "9780123456786" in response.json()["detail"]
+
+    def test_add_book_invalid_isbn(self, client, empty_library):
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            response = client.post("/books", json={"isbn": "978-0451524936"})
+            assert response.status_code == 422
+            mock_add_book_from_api.assert_not_called()
+
+    def test_non_ascii_digits_rejected(self, client, empty_library):
+        assert client.post("/books", json={"isbn": "²451524934"}).status_code == 422
+        assert client.delete("/books/²451524934").status_code == 404
+        response = client.post("/books/batch", json={"operations": [{"op": "remove", "isbn": "²451524934"}]})
+        assert response.status_code == 409
+
+    def test_add_book_circuit_open(self, client, empty_library):
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            mock_add_book_from_api.side_effect = CircuitOpenError(12.0)
+            response = client.post("/books", json={"isbn": "9780123456786"})
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "12"
+
+    def test_add_book_while_probe_in_flight(self, client, empty_library):
+        # Yarı açık devrede deneme isteği sürerken diğer istekler 400 değil 503 almalı
+        library.openlibrary.breaker._state = "open"
+        library.openlibrary.breaker._opened_at = time.monotonic() - library.openlibrary.breaker.reset_timeout - 1
+        library.openlibrary.breaker._probe_in_flight = True
+        try:
+            response = client.post("/books", json={"isbn": "9780123456786"})
+        finally:
+            library.openlibrary.breaker.record_success()
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_not_found_isbn_is_cached(self, client, empty_library):
+        library.openlibrary.cache.clear()
+        not_found = httpx.Response(404, json={"error": "notfound"})
+        with patch.object(library.openlibrary, 'get', new_callable=AsyncMock, return_value=not_found) as mock_get:
+            before = client.get("/openlibrary/cache").json()
+            first = client.post("/books", json={"isbn": "9780123456786"})
+            second = client.post("/books", json={"isbn": "9780123456786"})
+        library.openlibrary.cache.clear()
+        assert first.status_code == second.status_code == 400
+        assert first.json() == second.json()
+        # İkinci istek Open Library'ye gitmeden önbellekten yanıtlanır
+        assert mock_get.call_count == 1
+        stats = client.get("/openlibrary/cache").json()
+        assert stats["negative_hits"] == before["negative_hits"] + 1
+        assert stats["negative_ttl"] < stats["ttl"]
+
+@pytest.fixture
+def job_queue(tmp_path):
+    original_jobs_file = import_queue.jobs_file
+    import_queue.jobs_file = str(tmp_path / "jobs.jsonl")
+    import_queue.load_jobs()
+    yield import_queue
+    import_queue.jobs_file = original_jobs_file
+    import_queue.load_jobs()
+
+class TestBackgroundImport:
+    def test_background_import_returns_202_and_completes(self, empty_library, job_queue):
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            mock_add_book_from_api.return_value = Book("Mocked Test Book", "Mocked Author", "9780123456786")
+            with TestClient(app) as client:
+                response = client.post("/books", params={"background": "true"}, json={"isbn": "978-0-12-345678-6"})
+                assert response.status_code == 202
+                job = response.json()
+                assert job["isbn"] == "9780123456786"
+                assert response.headers["Location"] == f"/jobs/{job['id']}"
+
+                for _ in range(100):
+                    job = client.get(f"/jobs/{job['id']}").json()
+                    if job["status"] == "succeeded":
+                        break
+                    time.sleep(0.01)
+            assert job["status"] == "succeeded"
+            assert job["book"]["title"] == "Mocked Test Book"
+
+    def test_background_import_invalid_isbn(self, client, job_queue):
+        response = client.post("/books", params={"background": "true"}, json={"isbn": "978-0451524936"})
+        assert response.status_code == 422
+        assert job_queue.pending_count() == 0
+
+    def test_background_import_queue_full(self, client, job_queue):
+        with patch.object(job_queue, 'enqueue', return_value=None):
+            response = client.post("/books", params={"background": "true"}, json={"isbn": "9780123456786"})
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    def test_get_job_not_found(self, client, job_queue):
+        response = client.get("/jobs/yok")
+        assert response.status_code == 404
+
+class TestBatch:
+    def test_batch_applied(self, client, setup_test_library):
+        response = client.post("/books/batch", json={"operations": [
+            {"op": "remove", "isbn": "978-0451524935"},
+            {"op": "add", "title": "Yeni Kitap", "author": "Yeni Yazar", "isbn": "0306406152"},
+        ]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["applied"] is True
+        assert [r["isbn"] for r in data["results"]] == ["9780451524935", "9780306406157"]
+        isbns = [b["isbn"] for b in client.get("/books").json()]
+        assert "9780451524935" not in isbns
+        assert "9780306406157" in isbns
+
+    def test_batch_rejected(self, client, setup_test_library):
+        before = client.get("/books").json()
+        response = client.post("/books/batch", json={"operations": [
+            {"op": "remove", "isbn": "9780451524935"},
+            {"op": "add", "title": "Kitap", "author": "Yazar", "isbn": "9780451524936"},
+        ]})
+        assert response.status_code == 409
+        data = response.json()
+        assert data["applied"] is False
+        assert [r["status"] for r in data["results"]] == ["ok", "error"]
+        assert client.get("/books").json() == before
+
+    def test_batch_invalid_request(self, client, empty_library):
+        assert client.post("/books/batch", json={"operations": []}).status_code == 422
+        response = client.post("/books/batch", json={"operations": [{"op": "update", "isbn": "9780451524935"}]})
+        assert response.status_code == 422
+
+class TestChanges:
+    def test_get_changes(self, client, empty_library):
+        response = client.get("/books")
+        start = int(response.headers["X-Change-Seq"])
+
+        library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        library.remove_book("9780451524935")
+
+        response = client.get("/changes", params={"since": start})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["last_seq"] == start + 2
+        assert [c["op"] for c in data["changes"]] == ["add", "remove"]
+        assert data["changes"][0]["book"]["title"] == "1984"
+
+        response = client.get("/changes", params={"since": start, "limit": 1})
+        assert len(response.json()["changes"]) == 1
+
+    def test_get_changes_gone(self, client, empty_library):
+        response = client.get("/changes", params={"since": library.changes.last_seq + 5})
+        assert response.status_code == 410
+        response = client.get("/changes/stream", params={"since": library.changes.last_seq + 5})
+        assert response.status_code == 410
+
+    @pytest.mark.asyncio
+    async def test_change_stream_events(self, empty_library):
+        events = api.change_events(library.changes.last_seq)
+        library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        first = await asyncio.wait_for(events.__anext__(), 1)
+        assert first.startswith(f"id: {library.changes.last_seq}\nevent: add\n")
+
+        # Akış yeni değişikliği beklerken eklenen kitap da anında gönderilir
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.01)
+        library.remove_book("9780451524935")
+        second = await asyncio.wait_for(pending, 1)
+        assert "event: remove" in second
+        await events.aclose()
+        assert library._change_listeners == []
+
+    @pytest.mark.asyncio
+    async def test_change_stream_heartbeat(self, empty_library, monkeypatch):
+        monkeypatch.setattr(api, "SSE_HEARTBEAT", 0.01)
+        events = api.change_events(library.changes.last_seq)
+        assert await asyncio.wait_for(events.__anext__(), 1) == ": keep-alive\n\n"
+        await events.aclose()
+
+class TestAPIIntegration:
+    @pytest.mark.asyncio
+    async def test_full_crud_cycle(self, client, empty_library):
+        response = client.get("/books")
+        assert response.status_code == 200
+        assert len(response.json()) == 0
+
+        with patch.object(library, 'add_book_from_api', new_callable=AsyncMock) as mock_add_book_from_api:
+            def mock_add_book_side_effect(isbn):
+                book = Book("Integration Test Book", "Test Author", isbn)
+                library.add_book_manual(book)
+                return book
+            mock_add_book_from_api.side_effect = mock_add_book_side_effect
+            response = client.post("/books", json={"isbn": "9780123456786"})
+            assert response.status_code == 201
+
+        response = client.get("/books")
+        assert response.status_code == 200
+        books = response.json()
+        assert len(books) == 1
+        assert books[0]["isbn"] == "9780123456786"
+
+        response = client.delete("/books/9780123456786")
+        assert response.status_code == 204
+
+        response = client.get("/books")
+        assert response.status_code == 200
+        assert len(response.json()) == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
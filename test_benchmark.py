@@ -0,0 +1,40 @@
+import json
+import random
+
+from benchmark import bench_search, bench_startup, main, percentile, synthetic_words
+
+
+def test_synthetic_words_are_unique():
+    words = synthetic_words(500, random.Random(1))
+    assert len(words) == len(set(words)) == 500
+    assert all(3 <= len(word) <= 12 for word in words)
+
+
+def test_percentile():
+    values = [i / 1000 for i in range(100, 0, -1)]
+    assert percentile(values, 50) == 0.05
+    assert percentile([], 95) == 0.0
+
+
+def test_bench_search_small_catalogue():
+    results = bench_search(books=300, vocabulary=200, queries=2, query_words=(1, 3))
+    assert results["index"]["books"] == 300
+    assert set(results) == {"index", "1_words", "3_words"}
+    assert all(results[key]["max_ms"] >= results[key]["p50_ms"] for key in ("1_words", "3_words"))
+
+
+def test_bench_startup_small_library(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    results = bench_startup(books=200, shards=4, workers=2, repeats=1)
+    assert results["library"]["books"] == 200 and results["library"]["workers"] == 2
+    assert results["read_parallel_s"] is not None and results["load_s"] > 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_prints_json(capsys):
+    main(["search", "--books", "100", "--vocabulary", "80", "--queries", "1"])
+    assert "8_words" in json.loads(capsys.readouterr().out)
+
+    main(["startup", "--books", "50", "--shards", "2", "--workers", "1", "--repeats", "1"])
+    results = json.loads(capsys.readouterr().out)
+    assert results["library"]["shards"] == 2 and results["read_parallel_s"] is None
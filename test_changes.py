@@ -0,0 +1,97 @@
+import json
+import pytest
+
+from changes import Change, ChangeLog
+from classes import Book, Library
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    return str(tmp_path / "library.json.changes.jsonl")
+
+
+def test_sequence_numbers_increase(log_file):
+    log = ChangeLog(log_file)
+    assert log.last_seq == 0
+    first = log.append(Change.ADD, "9780451524935", {"title": "1984"})
+    second = log.append(Change.REMOVE, "9780451524935")
+    assert (first.seq, second.seq) == (1, 2)
+    assert [c.seq for c in log.since(0)] == [1, 2]
+    assert [c.seq for c in log.since(1)] == [2]
+    assert log.since(2) == []
+    assert [c.seq for c in log.since(0, limit=1)] == [1]
+
+
+def test_since_out_of_range_returns_none(log_file):
+    log = ChangeLog(log_file)
+    log.append(Change.CLEAR)
+    assert log.since(5) is None
+
+
+def test_log_persists_and_loads_lazily(log_file):
+    log = ChangeLog(log_file)
+    log.append(Change.ADD, "9780451524935", {"title": "1984"})
+    log.append(Change.CLEAR)
+
+    reopened = ChangeLog(log_file)
+    assert reopened._entries is None
+    assert reopened.last_seq == 2
+    assert reopened.since(0)[0].book == {"title": "1984"}
+    assert reopened.append(Change.CLEAR).seq == 3
+
+
+def test_compaction_drops_oldest_entries(log_file):
+    log = ChangeLog(log_file, max_entries=3)
+    for _ in range(6):
+        log.append(Change.CLEAR)
+    assert log.first_seq == 4
+    assert log.since(2) is None
+    assert [c.seq for c in log.since(3)] == [4, 5, 6]
+    with open(log_file, encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+    assert ChangeLog(log_file).first_seq == 4
+
+
+def test_partial_last_line_is_repaired(log_file):
+    log = ChangeLog(log_file)
+    log.append(Change.CLEAR)
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "op": "ad')
+
+    reopened = ChangeLog(log_file)
+    assert reopened.last_seq == 1
+    reopened.append(Change.CLEAR)
+    with open(log_file, encoding="utf-8") as f:
+        assert [json.loads(line)["seq"] for line in f] == [1, 2]
+
+
+class TestLibraryChanges:
+    @pytest.fixture
+    def temp_library(self, tmp_path):
+        return Library(str(tmp_path / "library.json"))
+
+    def test_library_records_changes(self, temp_library):
+        received = []
+        temp_library.add_change_listener(received.append)
+
+        temp_library.add_book_manual(Book("1984", "George Orwell", "0451524934"))
+        temp_library.remove_book("9780451524935")
+        temp_library.remove_book("9780451524935")  # bulunamayan kitap değişiklik üretmez
+        temp_library.clear_library()
+
+        changes = temp_library.changes.since(0)
+        assert [(c.seq, c.op, c.isbn) for c in changes] == [
+            (1, "add", "9780451524935"),
+            (2, "remove", "9780451524935"),
+            (3, "clear", None),
+        ]
+        assert changes[0].book == {"title": "1984", "author": "George Orwell", "isbn": "9780451524935"}
+        assert changes[1].book is None
+        assert received == changes
+
+    def test_changes_follow_data_file(self, temp_library, tmp_path):
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        temp_library.data_file = str(tmp_path / "other.json")
+        temp_library.load_books()
+        assert temp_library.changes.last_seq == 0
+        assert temp_library.changes_file.endswith("other.json.changes.jsonl")
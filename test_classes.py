@@ -1,320 +1,707 @@
-import pytest
-import json
-import os
-import asyncio
-from unittest import mock
-from unittest.mock import patch, mock_open, AsyncMock
-import httpx
-from classes import Book, Library
-
-class TestBook:
-    """Book sınıfı için test sınıfı."""
-    
-    def test_book_init(self):
-        """Book nesnesi oluşturma testi."""
-        book = Book("1984", "George Orwell", "978-0451524935")
-        assert book.title == "1984"
-        assert book.author == "George Orwell"
-        assert book.isbn == "978-0451524935"
-    
-    def test_book_str(self):
-        """Book __str__ metodu testi."""
-        book = Book("1984", "George Orwell", "978-0451524935")
-        expected = "1984 by George Orwell (ISBN: 978-0451524935)"
-        assert str(book) == expected
-    
-    def test_book_to_dict(self):
-        """Book to_dict metodu testi."""
-        book = Book("1984", "George Orwell", "978-0451524935")
-        expected = {
-            "title": "1984",
-            "author": "George Orwell", 
-            "isbn": "978-0451524935"
-        }
-        assert book.to_dict() == expected
-    
-    def test_book_from_dict(self):
-        """Book from_dict metodu testi."""
-        data = {
-            "title": "1984",
-            "author": "George Orwell",
-            "isbn": "978-0451524935"
-        }
-        book = Book.from_dict(data)
-        assert book.title == "1984"
-        assert book.author == "George Orwell"
-        assert book.isbn == "978-0451524935"
-
-class TestLibrary:
-    """Library sınıfı için test sınıfı."""
-    
-    @pytest.fixture
-    def temp_library(self):
-        """Her test için geçici bir Library nesnesi oluşturur."""
-        test_file = "test_library.json"
-        library = Library(test_file)
-        yield library
-        if os.path.exists(test_file):
-            os.remove(test_file)
-    
-    def test_library_init(self, temp_library):
-        """Library nesnesi oluşturma testi."""
-        assert temp_library.data_file == "test_library.json"
-        assert isinstance(temp_library.books, list)
-    
-    def test_add_book_manual_success(self, temp_library):
-        """Manuel kitap ekleme başarı testi."""
-        book = Book("Test Kitap", "Test Yazar", "123456789")
-        result = temp_library.add_book_manual(book)
-        assert result == True
-        assert len(temp_library.books) == 1
-        assert temp_library.books[0].title == "Test Kitap"
-    
-    def test_add_book_manual_duplicate_isbn(self, temp_library):
-        """Aynı ISBN ile kitap ekleme testi."""
-        book1 = Book("Kitap 1", "Yazar 1", "123456789")
-        book2 = Book("Kitap 2", "Yazar 2", "123456789")
-        
-        temp_library.add_book_manual(book1)
-        result = temp_library.add_book_manual(book2)
-        
-        assert result == False
-        assert len(temp_library.books) == 1
-    
-    def test_add_book_manual_empty_fields(self, temp_library):
-        """Boş alan ile kitap ekleme testi."""
-        book = Book("", "Test Yazar", "123456789")
-        result = temp_library.add_book_manual(book)
-        assert result == False
-        assert len(temp_library.books) == 0
-    
-    def test_remove_book_success(self, temp_library):
-        """Kitap silme başarı testi."""
-        book = Book("Test Kitap", "Test Yazar", "123456789")
-        temp_library.add_book_manual(book)
-        
-        result = temp_library.remove_book("123456789")
-        assert result == True
-        assert len(temp_library.books) == 0
-    
-    def test_remove_book_not_found(self, temp_library):
-        """Olmayan kitap silme testi."""
-        result = temp_library.remove_book("nonexistent")
-        assert result == False
-    
-    def test_find_book_success(self, temp_library):
-        """Kitap bulma başarı testi."""
-        book = Book("Test Kitap", "Test Yazar", "123456789")
-        temp_library.add_book_manual(book)
-        
-        found_book = temp_library.find_book("123456789")
-        assert found_book is not None
-        assert found_book.title == "Test Kitap"
-    
-    def test_find_book_not_found(self, temp_library):
-        """Olmayan kitap bulma testi."""
-        found_book = temp_library.find_book("nonexistent")
-        assert found_book is None
-    
-    def test_search_books_by_title(self, temp_library):
-        """Başlığa göre kitap arama testi."""
-        book1 = Book("Python Programlama", "Yazar 1", "111")
-        book2 = Book("Java Programlama", "Yazar 2", "222")
-        book3 = Book("Web Tasarımı", "Yazar 3", "333")
-        
-        temp_library.add_book_manual(book1)
-        temp_library.add_book_manual(book2)
-        temp_library.add_book_manual(book3)
-        
-        results = temp_library.search_books("programlama")
-        assert len(results) == 2
-        assert any(book.title == "Python Programlama" for book in results)
-        assert any(book.title == "Java Programlama" for book in results)
-    
-    def test_search_books_by_author(self, temp_library):
-        """Yazara göre kitap arama testi."""
-        book1 = Book("Kitap 1", "George Orwell", "111")
-        book2 = Book("Kitap 2", "J.K. Rowling", "222")
-        
-        temp_library.add_book_manual(book1)
-        temp_library.add_book_manual(book2)
-        
-        results = temp_library.search_books("orwell")
-        assert len(results) == 1
-        assert results[0].author == "George Orwell"
-    
-    def test_get_book_count(self, temp_library):
-        """Kitap sayısı testi."""
-        assert temp_library.get_book_count() == 0
-        
-        book = Book("Test Kitap", "Test Yazar", "123")
-        temp_library.add_book_manual(book)
-        assert temp_library.get_book_count() == 1
-    
-    def test_get_author_statistics(self, temp_library):
-        """Yazar istatistikleri testi."""
-        book1 = Book("Kitap 1", "George Orwell", "111")
-        book2 = Book("Kitap 2", "George Orwell", "222")
-        book3 = Book("Kitap 3", "J.K. Rowling", "333")
-        
-        temp_library.add_book_manual(book1)
-        temp_library.add_book_manual(book2)
-        temp_library.add_book_manual(book3)
-        
-        stats = temp_library.get_author_statistics()
-        assert stats["George Orwell"] == 2
-        assert stats["J.K. Rowling"] == 1
-    
-    def test_clear_library(self, temp_library):
-        """Kütüphane temizleme testi."""
-        book = Book("Test Kitap", "Test Yazar", "123")
-        temp_library.add_book_manual(book)
-        
-        result = temp_library.clear_library()
-        assert result == True
-        assert len(temp_library.books) == 0
-    
-    @patch("builtins.open", mock_open(read_data='[{"title": "Test", "author": "Author", "isbn": "123"}]'))
-    def test_load_books_success(self):
-        """Kitap yükleme başarı testi."""
-        with patch("os.path.exists", return_value=True):
-            library = Library("test.json")
-            assert len(library.books) == 1
-            assert library.books[0].title == "Test"
-    
-    @patch("builtins.open", mock_open(read_data='invalid json'))
-    def test_load_books_json_error(self):
-        """Bozuk JSON ile kitap yükleme testi."""
-        with patch("os.path.exists", return_value=True):
-            library = Library("test.json")
-            assert len(library.books) == 0
-    
-    def test_load_books_file_not_exists(self):
-        """Dosya yokken kitap yükleme testi."""
-        with patch("os.path.exists", return_value=False):
-            library = Library("nonexistent.json")
-            assert len(library.books) == 0
-
-class TestLibraryAPI:
-    """Library sınıfının API metodları için test sınıfı."""
-    
-    @pytest.fixture
-    def temp_library(self):
-        """Her test için geçici bir Library nesnesi oluşturur."""
-        test_file = "test_api_library.json"
-        library = Library(test_file)
-        yield library
-        if os.path.exists(test_file):
-            os.remove(test_file)
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_success(self, temp_library):
-        """API'den kitap ekleme başarı testi."""
-        main_response_data = {
-            "title": "Test Book",
-            "authors": [{"name": "Test Author"}]
-        }
-        
-        mock_httpx_client_instance = AsyncMock()
-        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
-        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
-
-        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
-            mock_response_get = mock.Mock()
-            mock_response_get.is_success = True
-            mock_response_get.json.return_value = main_response_data
-            mock_httpx_client_instance.get.return_value = mock_response_get
-            
-            result = await temp_library.add_book_from_api("9780123456789")
-            
-            assert result is not None
-            assert result.title == "Test Book"
-            assert result.author == "Test Author"
-            assert result.isbn == "9780123456789"
-            assert len(temp_library.books) == 1
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_with_author_key(self, temp_library):
-        """API'den yazar detayı çekerek kitap ekleme testi."""
-        main_response_data = {
-            "title": "Test Book",
-            "authors": [{"key": "/authors/OL123A"}]
-        }
-        
-        author_response_data = {
-            "name": "Detailed Author Name"
-        }
-        
-        mock_httpx_client_instance = AsyncMock()
-        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
-        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
-
-        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
-            main_response_get = mock.Mock()
-            main_response_get.is_success = True
-            main_response_get.json.return_value = main_response_data
-            
-            author_response_get = mock.Mock()
-            author_response_get.is_success = True
-            author_response_get.json.return_value = author_response_data
-            
-            mock_httpx_client_instance.get.side_effect = [main_response_get, author_response_get]
-            
-            result = await temp_library.add_book_from_api("9780123456789")
-            
-            assert result is not None
-            assert result.title == "Test Book"
-            assert result.author == "Detailed Author Name"
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_not_found(self, temp_library):
-        """API'de kitap bulunamama testi."""
-        mock_httpx_client_instance = AsyncMock()
-        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
-        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
-
-        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
-            mock_response_get = mock.Mock()
-            mock_response_get.is_success = False
-            mock_response_get.status_code = 404
-            mock_httpx_client_instance.get.return_value = mock_response_get
-            
-            result = await temp_library.add_book_from_api("nonexistent")
-            
-            assert result is None
-            assert len(temp_library.books) == 0
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_network_error(self, temp_library):
-        """API ağ hatası testi."""
-        mock_httpx_client_instance = AsyncMock()
-        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
-        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
-
-        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
-            mock_httpx_client_instance.get.side_effect = httpx.RequestError("Network error")
-            
-            result = await temp_library.add_book_from_api("9780123456789")
-            
-            assert result is None
-            assert len(temp_library.books) == 0
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_empty_isbn(self, temp_library):
-        """Boş ISBN ile API'den kitap ekleme testi."""
-        result = await temp_library.add_book_from_api("")
-        assert result is None
-        assert len(temp_library.books) == 0
-    
-    @pytest.mark.asyncio
-    async def test_add_book_from_api_duplicate_isbn(self, temp_library):
-        """Aynı ISBN ile API'den kitap ekleme testi."""
-        book = Book("Existing Book", "Existing Author", "9780123456789")
-        temp_library.add_book_manual(book)
-        
-        result = await temp_library.add_book_from_api("9780123456789")
-        assert result is None
-        assert len(temp_library.books) == 1
-
-if __name__ == "__main__":
-    pytest.main([__file__])
+import pytest
+import json
+import os
+import asyncio
+from unittest import mock
+from unittest.mock import patch, mock_open, AsyncMock
+import httpx
+from classes import Book, Library, LibrarySnapshot
+from openlibrary import CircuitOpenError
+
+class TestBook:
+    """Book sınıfı için test sınıfı."""
+    
+    def test_book_init(self):
+        """Book nesnesi oluşturma testi."""
+        book = Book("1984", "George Orwell", "978-0451524935")
+        assert book.title == "1984"
+        assert book.author == "George Orwell"
+        assert book.isbn == "978-0451524935"
+    
+    def test_book_str(self):
+        """Book __str__ metodu testi."""
+        book = Book("1984", "George Orwell", "978-0451524935")
+        expected = "1984 by George Orwell (ISBN: 978-0451524935)"
+        assert str(book) == expected
+    
+    def test_book_to_dict(self):
+        """Book to_dict metodu testi."""
+        book = Book("1984", "George Orwell", "978-0451524935")
+        expected = {
+            "title": "1984",
+            "author": "George Orwell", 
+            "isbn": "978-0451524935"
+        }
+        assert book.to_dict() == expected
+    
+    def test_book_from_dict(self):
+        """Book from_dict metodu testi."""
+        data = {
+            "title": "1984",
+            "author": "George Orwell",
+            "isbn": "978-0451524935"
+        }
+        book = Book.from_dict(data)
+        assert book.title == "1984"
+        assert book.author == "George Orwell"
+        assert book.isbn == "978-0451524935"
+
+class TestLibrary:
+    """Library sınıfı için test sınıfı."""
+    
+    @pytest.fixture
+    def temp_library(self):
+        """Her test için geçici bir Library nesnesi oluşturur."""
+        test_file = "test_library.json"
+        library = Library(test_file)
+        yield library
+        for path in (test_file, f"{test_file}.changes.jsonl"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def test_library_init(self, temp_library):
+        """Library nesnesi oluşturma testi."""
+        assert temp_library.data_file == "test_library.json"
+        assert isinstance(temp_library.books, LibrarySnapshot)
+        assert len(temp_library.books) == 0
+    
+    def test_add_book_manual_success(self, temp_library):
+        """Manuel kitap ekleme başarı testi."""
+        book = Book("Test Kitap", "Test Yazar", "9780306406157")
+        result = temp_library.add_book_manual(book)
+        assert result == True
+        assert len(temp_library.books) == 1
+        assert temp_library.books[0].title == "Test Kitap"
+    
+    def test_add_book_manual_duplicate_isbn(self, temp_library):
+        """Aynı ISBN ile kitap ekleme testi."""
+        book1 = Book("Kitap 1", "Yazar 1", "9780306406157")
+        book2 = Book("Kitap 2", "Yazar 2", "9780306406157")
+        
+        temp_library.add_book_manual(book1)
+        result = temp_library.add_book_manual(book2)
+        
+        assert result == False
+        assert len(temp_library.books) == 1
+    
+    def test_add_book_manual_empty_fields(self, temp_library):
+        """Boş alan ile kitap ekleme testi."""
+        book = Book("", "Test Yazar", "9780306406157")
+        result = temp_library.add_book_manual(book)
+        assert result == False
+        assert len(temp_library.books) == 0
+    
+    def test_remove_book_success(self, temp_library):
+        """Kitap silme başarı testi."""
+        book = Book("Test Kitap", "Test Yazar", "9780306406157")
+        temp_library.add_book_manual(book)
+        
+        result = temp_library.remove_book("9780306406157")
+        assert result == True
+        assert len(temp_library.books) == 0
+    
+    def test_add_book_manual_invalid_isbn(self, temp_library):
+        """Kontrol basamağı hatalı ISBN ile kitap ekleme testi."""
+        book = Book("Test Kitap", "Test Yazar", "9780306406158")
+        result = temp_library.add_book_manual(book)
+        assert result == False
+        assert len(temp_library.books) == 0
+
+    def test_add_book_manual_duplicate_across_formats(self, temp_library):
+        """ISBN-10 ve tireli ISBN-13 aynı kitap olarak algılanmalı."""
+        assert temp_library.add_book_manual(Book("1984", "George Orwell", "0451524934")) == True
+        assert temp_library.books[0].isbn == "9780451524935"
+        assert temp_library.add_book_manual(Book("1984", "George Orwell", "978-0451524935")) == False
+        assert len(temp_library.books) == 1
+
+    def test_find_and_remove_book_any_format(self, temp_library):
+        """Kitap farklı ISBN biçimleriyle bulunup silinebilmeli."""
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        assert temp_library.find_book("0-451-52493-4") is not None
+        assert temp_library.remove_book("978-0451524935") == True
+        assert len(temp_library.books) == 0
+
+    def test_remove_book_not_found(self, temp_library):
+        """Olmayan kitap silme testi."""
+        result = temp_library.remove_book("nonexistent")
+        assert result == False
+    
+    def test_find_book_success(self, temp_library):
+        """Kitap bulma başarı testi."""
+        book = Book("Test Kitap", "Test Yazar", "9780306406157")
+        temp_library.add_book_manual(book)
+        
+        found_book = temp_library.find_book("9780306406157")
+        assert found_book is not None
+        assert found_book.title == "Test Kitap"
+    
+    def test_find_book_not_found(self, temp_library):
+        """Olmayan kitap bulma testi."""
+        found_book = temp_library.find_book("nonexistent")
+        assert found_book is None
+    
+    def test_search_books_by_title(self, temp_library):
+        """Başlığa göre kitap arama testi."""
+        book1 = Book("Python Programlama", "Yazar 1", "9789750700002")
+        book2 = Book("Java Programlama", "Yazar 2", "9786050000009")
+        book3 = Book("Web Tasarımı", "Yazar 3", "9791000000008")
+        
+        temp_library.add_book_manual(book1)
+        temp_library.add_book_manual(book2)
+        temp_library.add_book_manual(book3)
+        
+        results = temp_library.search_books("programlama")
+        assert len(results) == 2
+        assert any(book.title == "Python Programlama" for book in results)
+        assert any(book.title == "Java Programlama" for book in results)
+    
+    def test_search_books_by_author(self, temp_library):
+        """Yazara göre kitap arama testi."""
+        book1 = Book("Kitap 1", "George Orwell", "9789750700002")
+        book2 = Book("Kitap 2", "J.K. Rowling", "9786050000009")
+        
+        temp_library.add_book_manual(book1)
+        temp_library.add_book_manual(book2)
+        
+        results = temp_library.search_books("orwell")
+        assert len(results) == 1
+        assert results[0].author == "George Orwell"
+    
+    def test_search_books_turkish_case_and_accents(self, temp_library):
+        """Türkçe büyük/küçük harf ve aksan farklarına duyarsız arama testi."""
+        temp_library.add_book_manual(Book("ÇALIKUŞU", "Reşat Nuri Güntekin", "9789750700002"))
+        temp_library.add_book_manual(Book("İstanbul Hatırası", "Ahmet Ümit", "9786050000009"))
+
+        assert [b.title for b in temp_library.search_books("çalıkuşu")] == ["ÇALIKUŞU"]
+        assert [b.title for b in temp_library.search_books("calikusu")] == ["ÇALIKUŞU"]
+        assert [b.title for b in temp_library.search_books("istanbul")] == ["İstanbul Hatırası"]
+        assert [b.title for b in temp_library.search_books("ISTANBUL")] == ["İstanbul Hatırası"]
+        assert [b.title for b in temp_library.search_books("umit")] == ["İstanbul Hatırası"]
+
+    def test_search_key_migration(self, temp_library):
+        """Arama anahtarı olmayan eski dosyalar yüklenirken bir kez güncellenmeli."""
+        with open(temp_library.data_file, 'w', encoding='utf-8') as f:
+            json.dump([{"title": "Çalıkuşu", "author": "Reşat Nuri", "isbn": "9789750700002"}], f)
+
+        temp_library.load_books()
+        assert temp_library.books[0].search_key == "calikusu\nresat nuri"
+        with open(temp_library.data_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert data[0]["search_key"] == "calikusu\nresat nuri"
+
+        # Güncel anahtarlar yeniden hesaplanmadan kullanılır
+        with patch("classes.fold") as mock_fold:
+            temp_library.load_books()
+            mock_fold.assert_not_called()
+        assert len(temp_library.search_books("calikusu")) == 1
+
+    def test_fuzzy_search_books(self, temp_library):
+        """Yazım hatalı yazar adıyla bulanık arama testi."""
+        temp_library.add_book_manual(Book("Animal Farm", "George Orwell", "9789750700002"))
+        temp_library.add_book_manual(Book("Emma", "Jane Austen", "9786050000009"))
+
+        results = temp_library.fuzzy_search_books("goerge orwel")
+        assert len(results) == 1
+        book, score = results[0]
+        assert book.title == "Animal Farm"
+        assert 0 < score <= 1
+
+    def test_fuzzy_search_after_remove(self, temp_library):
+        """Silinen kitaplar bulanık aramada dönmemeli."""
+        temp_library.add_book_manual(Book("Animal Farm", "George Orwell", "9789750700002"))
+        temp_library.remove_book("9789750700002")
+        assert temp_library.fuzzy_search_books("orwell") == []
+
+    def test_get_book_count(self, temp_library):
+        """Kitap sayısı testi."""
+        assert temp_library.get_book_count() == 0
+        
+        book = Book("Test Kitap", "Test Yazar", "9780451524935")
+        temp_library.add_book_manual(book)
+        assert temp_library.get_book_count() == 1
+    
+    def test_get_author_statistics(self, temp_library):
+        """Yazar istatistikleri testi."""
+        book1 = Book("Kitap 1", "George Orwell", "9789750700002")
+        book2 = Book("Kitap 2", "George Orwell", "9786050000009")
+        book3 = Book("Kitap 3", "J.K. Rowling", "9791000000008")
+        
+        temp_library.add_book_manual(book1)
+        temp_library.add_book_manual(book2)
+        temp_library.add_book_manual(book3)
+        
+        stats = temp_library.get_author_statistics()
+        assert stats["George Orwell"] == 2
+        assert stats["J.K. Rowling"] == 1
+    
+    def test_clear_library(self, temp_library):
+        """Kütüphane temizleme testi."""
+        book = Book("Test Kitap", "Test Yazar", "9780451524935")
+        temp_library.add_book_manual(book)
+        
+        result = temp_library.clear_library()
+        assert result == True
+        assert len(temp_library.books) == 0
+    
+    def test_apply_batch_success(self, temp_library):
+        """Toplu ekleme/silme işleminin tek seferde uygulanması testi."""
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        temp_library.add_book_manual(Book("Çalıkuşu", "Reşat Nuri Güntekin", "9789750700002"))
+        temp_library.fuzzy_search_books("orwell")  # Arama dizinini kur
+
+        with patch.object(temp_library, "save_books", wraps=temp_library.save_books) as save_books:
+            applied, results = temp_library.apply_batch([
+                {"op": "add", "title": "Yeni Kitap", "author": "Yeni Yazar", "isbn": "0306406152"},
+                {"op": "remove", "isbn": "978-0451524935"},
+                {"op": "add", "title": "1984 (Yeni Baskı)", "author": "George Orwell", "isbn": "9780451524935"},
+                {"op": "add", "title": "Geçici", "author": "Yazar", "isbn": "9791000000008"},
+                {"op": "remove", "isbn": "9791000000008"},
+            ])
+        assert applied == True
+        assert save_books.call_count == 1
+        assert [r["status"] for r in results] == ["ok"] * 5
+        assert results[0]["isbn"] == "9780306406157"
+        assert [b.isbn for b in temp_library.books] == ["9789750700002", "9780306406157", "9780451524935"]
+        assert temp_library.find_book("9780451524935").title == "1984 (Yeni Baskı)"
+        assert temp_library.find_book("9791000000008") is None
+        assert [b.isbn for b, _ in temp_library.fuzzy_search_books("yeni yazar")][:1] == ["9780306406157"]
+        assert [c.op for c in temp_library.changes.since(2)] == ["add", "remove", "add", "add", "remove"]
+
+        reloaded = Library(temp_library.data_file)
+        assert [b.isbn for b in reloaded.books] == ["9789750700002", "9780306406157", "9780451524935"]
+
+    def test_apply_batch_all_or_nothing(self, temp_library):
+        """Geçersiz bir işlem varsa hiçbir işlemin uygulanmaması testi."""
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        applied, results = temp_library.apply_batch([
+            {"op": "remove", "isbn": "9780451524935"},
+            {"op": "add", "title": "Kitap", "author": "Yazar", "isbn": "9780451524936"},
+            {"op": "remove", "isbn": "9780306406157"},
+            {"op": "add", "title": "", "author": "Yazar", "isbn": "9780306406157"},
+            {"op": "update", "isbn": "9780451524935"},
+        ])
+        assert applied == False
+        assert [r["status"] for r in results] == ["ok", "error", "error", "error", "error"]
+        assert "Geçersiz ISBN" in results[1]["error"]
+        assert "bulunamadı" in results[2]["error"]
+        assert [b.isbn for b in temp_library.books] == ["9780451524935"]
+        assert temp_library.changes.last_seq == 1
+
+    def test_apply_batch_duplicate_in_batch(self, temp_library):
+        """Aynı toplu işlemde aynı ISBN'in iki kez eklenmesinin reddedilmesi testi."""
+        applied, results = temp_library.apply_batch([
+            {"op": "add", "title": "A", "author": "X", "isbn": "9780451524935"},
+            {"op": "add", "title": "B", "author": "Y", "isbn": "0451524934"},
+        ])
+        assert applied == False
+        assert "zaten mevcut" in results[1]["error"]
+        assert len(temp_library.books) == 0
+
+    def test_apply_batch_save_failure_rolls_back(self, temp_library):
+        """Dosya kaydedilemezse bellekteki değişikliklerin geri alınması testi."""
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        with patch.object(temp_library, "save_books", return_value=False):
+            applied, _ = temp_library.apply_batch([{"op": "remove", "isbn": "9780451524935"}])
+        assert applied == False
+        assert temp_library.find_book("9780451524935") is not None
+        assert temp_library.changes.last_seq == 1
+
+    def test_snapshot_unchanged_by_writes(self, temp_library):
+        """Alınan sürümün sonraki ekleme, silme ve temizlemelerden etkilenmemesi testi."""
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        snapshot = temp_library.snapshot()
+        assert snapshot is temp_library.snapshot()
+
+        temp_library.add_book_manual(Book("Test Kitap", "Test Yazar", "9780306406157"))
+        temp_library.remove_book("9780451524935")
+        assert [b.isbn for b in snapshot] == ["9780451524935"]
+        assert snapshot.get("9780451524935").title == "1984"
+        assert [b.isbn for b in temp_library.books] == ["9780306406157"]
+
+        temp_library.clear_library()
+        assert len(snapshot) == 1
+        assert len(temp_library.books) == 0
+
+    def test_snapshot_version_is_change_seq(self, temp_library):
+        """Sürüm numarasının sürüme yansımış son değişikliğin sıra numarası olması testi."""
+        assert temp_library.snapshot().version == 0
+        temp_library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+        temp_library.apply_batch([
+            {"op": "add", "title": "Kitap", "author": "Yazar", "isbn": "9780306406157"},
+            {"op": "remove", "isbn": "9780451524935"},
+        ])
+        assert temp_library.snapshot().version == temp_library.changes.last_seq == 3
+        assert Library(temp_library.data_file).snapshot().version == 3
+
+    def test_snapshot_after_many_removals(self, temp_library):
+        """Çok sayıda silmeden sonra sıra, konuma göre erişim ve ISBN dizininin doğru kalması testi."""
+        isbns = [f"979100000{i:03d}" for i in range(200)]
+        isbns = [isbn + str((10 - sum(int(d) * (3 if j % 2 else 1) for j, d in enumerate(isbn)) % 10) % 10) for isbn in isbns]
+        temp_library.bulk_load(Book(f"Kitap {i}", "Yazar", isbn) for i, isbn in enumerate(isbns))
+        for isbn in isbns[::3] + isbns[1::3]:
+            temp_library.remove_book(isbn)
+
+        remaining = isbns[2::3]
+        snapshot = temp_library.snapshot()
+        assert [b.isbn for b in snapshot] == remaining
+        assert len(snapshot) == len(remaining)
+        assert snapshot[5].isbn == remaining[5]
+        assert snapshot[-1].isbn == remaining[-1]
+        assert snapshot.get(isbns[0]) is None
+        assert temp_library.find_book(remaining[10]) is not None
+
+    @patch("builtins.open", mock_open(read_data='[{"title": "Test", "author": "Author", "isbn": "123"}]'))
+    def test_load_books_success(self):
+        """Kitap yükleme başarı testi."""
+        with patch("os.path.exists", return_value=True):
+            library = Library("test.json")
+            assert len(library.books) == 1
+            assert library.books[0].title == "Test"
+    
+    @patch("builtins.open", mock_open(read_data='[{"title": "A", "author": "X", "isbn": "978-0451524935"}, {"title": "B", "author": "Y", "isbn": "0451524934"}, {"title": "C", "author": "Z", "isbn": "987456"}]'))
+    def test_load_books_normalizes_and_dedupes(self):
+        """Yüklenen ISBN'ler kanonikleştirilmeli, eski kimlikler korunmalı."""
+        with patch("os.path.exists", return_value=True):
+            library = Library("test.json")
+            assert [book.isbn for book in library.books] == ["9780451524935", "987456"]
+            assert library.find_book("987456") is not None
+
+    @patch("builtins.open", mock_open(read_data='invalid json'))
+    def test_load_books_json_error(self):
+        """Bozuk JSON ile kitap yükleme testi."""
+        with patch("os.path.exists", return_value=True):
+            library = Library("test.json")
+            assert len(library.books) == 0
+    
+    def test_load_books_file_not_exists(self):
+        """Dosya yokken kitap yükleme testi."""
+        with patch("os.path.exists", return_value=False):
+            library = Library("nonexistent.json")
+            assert len(library.books) == 0
+
+class TestShardedLibrary:
+    """Parçalı veri düzeni testleri."""
+
+    ISBNS = ["9780451524935", "9780306406157", "9789750700002", "9780140449136", "9780199535675"]
+
+    @pytest.fixture
+    def data_file(self, tmp_path):
+        return str(tmp_path / "library.json")
+
+    def add_books(self, library):
+        for i, isbn in enumerate(self.ISBNS):
+            library.add_book_manual(Book(f"Kitap {i}", f"Yazar {i}", isbn))
+
+    def test_roundtrip_keeps_order(self, data_file):
+        """Kitapların parçalara bölünüp eklenme sırasıyla geri yüklenmesi testi."""
+        library = Library(data_file, shards=4)
+        self.add_books(library)
+        library.remove_book(self.ISBNS[1])
+        library.add_book_manual(Book("Yeni", "Yazar", self.ISBNS[1]))
+
+        assert os.path.exists(os.path.join(f"{data_file}.shards", "manifest.json"))
+        assert not os.path.exists(data_file)
+        reloaded = Library(data_file)
+        assert reloaded.shards == 4
+        expected = self.ISBNS[:1] + self.ISBNS[2:] + self.ISBNS[1:2]
+        assert [b.isbn for b in reloaded.books] == expected
+        assert reloaded.find_book(self.ISBNS[1]).title == "Yeni"
+
+    def test_write_touches_only_changed_shard(self, data_file):
+        """Bir değişiklikte yalnızca değişen kitabın parçasının yazılması testi."""
+        library = Library(data_file, shards=4)
+        self.add_books(library)
+        with patch("classes.write_shards", return_value=True) as write_shards:
+            library.remove_book(self.ISBNS[0])
+            library.apply_batch([{"op": "remove", "isbn": self.ISBNS[2]},
+                                 {"op": "add", "title": "A", "author": "B", "isbn": "9791000000008"}])
+        from storage import shard_of
+        assert list(write_shards.call_args_list[0].args[2]) == [shard_of(self.ISBNS[0], 4)]
+        assert set(write_shards.call_args_list[1].args[2]) == {shard_of(self.ISBNS[2], 4), shard_of("9791000000008", 4)}
+
+    def test_write_does_not_scan_library(self, data_file):
+        """İlk kayıttan sonra bir değişikliğin tüm kitapları dolaşmadan yazılması testi."""
+        library = Library(data_file, shards=4)
+        self.add_books(library)
+        with patch.object(LibrarySnapshot, "__iter__", side_effect=AssertionError("tüm sürüm dolaşıldı")):
+            library.remove_book(self.ISBNS[0])
+            library.add_book_manual(Book("Yeni", "Yazar", "9791000000008"))
+        reloaded = Library(data_file)
+        assert [b.isbn for b in reloaded.books] == self.ISBNS[1:] + ["9791000000008"]
+
+    def test_removed_books_leave_shard_members(self, data_file):
+        """Silinen kitapların parça üyeliklerinden çıkarılması testi."""
+        library = Library(data_file, shards=4)
+        self.add_books(library)
+        for isbn in self.ISBNS[:3]:
+            library.remove_book(isbn)
+        members = [key for shard in library._shard_members for key in shard]
+        assert sorted(members) == sorted(self.ISBNS[3:])
+
+        with patch("classes.write_shards", return_value=False):
+            library.remove_book(self.ISBNS[3])
+        assert library._shard_members is None
+        library.add_book_manual(Book("Yeni", "Yazar", "9791000000008"))
+        assert sorted(key for shard in library._shard_members for key in shard) == [self.ISBNS[4], "9791000000008"]
+
+    def test_convert_between_layouts(self, data_file):
+        """Tek dosyalı düzenin parçalı düzene ve geri dönüştürülmesi testi."""
+        library = Library(data_file)
+        self.add_books(library)
+        assert library.shards == 1
+
+        sharded = Library(data_file, shards=3)
+        assert [b.isbn for b in sharded.books] == self.ISBNS
+        assert os.path.exists(f"{data_file}.bak") and not os.path.exists(data_file)
+
+        Library(data_file, shards=2)
+        assert [b.isbn for b in Library(data_file).books] == self.ISBNS
+        assert Library(data_file).shards == 2
+        assert not os.path.exists(os.path.join(f"{data_file}.shards", "002.json"))
+
+        single = Library(data_file, shards=1)
+        assert single.shards == 1
+        assert not os.path.exists(f"{data_file}.shards")
+        with open(data_file, encoding="utf-8") as f:
+            assert [book["isbn"] for book in json.load(f)] == self.ISBNS
+
+    def test_clear_library(self, data_file):
+        """Parçalı düzende kütüphanenin temizlenmesi testi."""
+        library = Library(data_file, shards=2)
+        self.add_books(library)
+        library.clear_library()
+        assert len(Library(data_file).books) == 0
+
+class TestLibraryAPI:
+    """Library sınıfının API metodları için test sınıfı."""
+    
+    @pytest.fixture
+    def temp_library(self):
+        """Her test için geçici bir Library nesnesi oluşturur."""
+        test_file = "test_api_library.json"
+        library = Library(test_file)
+        yield library
+        for path in (test_file, f"{test_file}.changes.jsonl"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_success(self, temp_library):
+        """API'den kitap ekleme başarı testi."""
+        main_response_data = {
+            "title": "Test Book",
+            "authors": [{"name": "Test Author"}]
+        }
+        
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            mock_response_get = mock.Mock()
+            mock_response_get.is_success = True
+            mock_response_get.json.return_value = main_response_data
+            mock_httpx_client_instance.get.return_value = mock_response_get
+            
+            result = await temp_library.add_book_from_api("9780123456786")
+            
+            assert result is not None
+            assert result.title == "Test Book"
+            assert result.author == "Test Author"
+            assert result.isbn == "9780123456786"
+            assert len(temp_library.books) == 1
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_with_author_key(self, temp_library):
+        """API'den yazar detayı çekerek kitap ekleme testi."""
+        main_response_data = {
+            "title": "Test Book",
+            "authors": [{"key": "/authors/OL123A"}]
+        }
+        
+        author_response_data = {
+            "name": "Detailed Author Name"
+        }
+        
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            main_response_get = mock.Mock()
+            main_response_get.is_success = True
+            main_response_get.json.return_value = main_response_data
+            
+            author_response_get = mock.Mock()
+            author_response_get.is_success = True
+            author_response_get.json.return_value = author_response_data
+            
+            mock_httpx_client_instance.get.side_effect = [main_response_get, author_response_get]
+            
+            result = await temp_library.add_book_from_api("9780123456786")
+            
+            assert result is not None
+            assert result.title == "Test Book"
+            assert result.author == "Detailed Author Name"
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_not_found(self, temp_library):
+        """API'de kitap bulunamama testi."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            mock_response_get = mock.Mock()
+            mock_response_get.is_success = False
+            mock_response_get.status_code = 404
+            mock_httpx_client_instance.get.return_value = mock_response_get
+            
+            result = await temp_library.add_book_from_api("9780140328721")
+            
+            assert result is None
+            assert len(temp_library.books) == 0
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_network_error(self, temp_library):
+        """API ağ hatası testi."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            mock_httpx_client_instance.get.side_effect = httpx.RequestError("Network error")
+            
+            result = await temp_library.add_book_from_api("9780123456786")
+            
+            assert result is None
+            assert len(temp_library.books) == 0
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_circuit_open(self, temp_library):
+        """Devre kesici açıkken Open Library'ye istek gönderilmemeli."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = False
+
+        for _ in range(temp_library.openlibrary.breaker.failure_threshold):
+            temp_library.openlibrary.breaker.record_failure()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            # "Bulunamadı" sonucundan ayrılsın diye devre kesici hatası çağırana iletilir
+            with pytest.raises(CircuitOpenError):
+                await temp_library.add_book_from_api("9780123456786")
+
+            mock_httpx_client_instance.get.assert_not_called()
+            assert len(temp_library.books) == 0
+
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_empty_isbn(self, temp_library):
+        """Boş ISBN ile API'den kitap ekleme testi."""
+        result = await temp_library.add_book_from_api("")
+        assert result is None
+        assert len(temp_library.books) == 0
+    
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_invalid_isbn_no_request(self, temp_library):
+        """Geçersiz ISBN için hiç ağ isteği yapılmamalı."""
+        with patch("classes.httpx.AsyncClient") as mock_client:
+            result = await temp_library.add_book_from_api("9780123456789")
+            assert result is None
+            mock_client.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_isbn10_canonical(self, temp_library):
+        """ISBN-10 ile eklenen kitap kanonik ISBN-13 ile sorgulanmalı ve saklanmalı."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            mock_response_get = mock.Mock()
+            mock_response_get.is_success = True
+            mock_response_get.json.return_value = {"title": "1984", "authors": [{"name": "George Orwell"}]}
+            mock_httpx_client_instance.get.return_value = mock_response_get
+
+            result = await temp_library.add_book_from_api("0-451-52493-4")
+
+            assert result.isbn == "9780451524935"
+            called_url = mock_httpx_client_instance.get.call_args[0][0]
+            assert called_url == "https://openlibrary.org/isbn/9780451524935.json"
+
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_duplicate_isbn(self, temp_library):
+        """Aynı ISBN ile API'den kitap ekleme testi."""
+        book = Book("Existing Book", "Existing Author", "9780123456786")
+        temp_library.add_book_manual(book)
+        
+        result = await temp_library.add_book_from_api("9780123456786")
+        assert result is None
+        assert len(temp_library.books) == 1
+
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_not_found_cached(self, temp_library):
+        """Bulunamayan ISBN, olumsuz önbellek kaydı geçerliyken Open Library'ye yeniden sorulmamalı."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+        mock_response_get = mock.Mock()
+        mock_response_get.is_success = False
+        mock_response_get.status_code = 404
+        mock_httpx_client_instance.get.return_value = mock_response_get
+        cache = temp_library.openlibrary.cache
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            assert await temp_library.add_book_from_api("9780140328721") is None
+            assert await temp_library.add_book_from_api("0-14-032872-6") is None
+            assert mock_httpx_client_instance.get.call_count == 1
+            assert cache.negative_hits == 1
+
+            # Kayıt silindiğinde (ör. süresi dolduğunda) ISBN yeniden sorgulanır
+            cache.discard("/isbn/9780140328721")
+            assert await temp_library.add_book_from_api("9780140328721") is None
+            assert mock_httpx_client_instance.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_add_book_from_api_missing_title_cached(self, temp_library):
+        """Başlığı olmayan baskılar da olumsuz sonuç olarak önbelleğe alınmalı."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+        mock_response_get = mock.Mock()
+        mock_response_get.is_success = True
+        mock_response_get.json.return_value = {"authors": [{"name": "Test Author"}]}
+        mock_httpx_client_instance.get.return_value = mock_response_get
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            assert await temp_library.add_book_from_api("9780123456786") is None
+            assert await temp_library.add_book_from_api("9780123456786") is None
+        assert mock_httpx_client_instance.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_author_name_cached(self, temp_library):
+        """Aynı yazarın ikinci kitabında yazar detayları yeniden çekilmemeli."""
+        mock_httpx_client_instance = AsyncMock()
+        mock_httpx_client_instance.__aenter__.return_value = mock_httpx_client_instance
+        mock_httpx_client_instance.__aexit__.return_value = AsyncMock()
+
+        def book_response(title):
+            response = mock.Mock()
+            response.is_success = True
+            response.json.return_value = {"title": title, "authors": [{"key": "/authors/OL123A"}]}
+            return response
+
+        author_response = mock.Mock()
+        author_response.is_success = True
+        author_response.json.return_value = {"name": "Detailed Author Name"}
+        mock_httpx_client_instance.get.side_effect = [book_response("Birinci"), author_response, book_response("İkinci")]
+
+        with patch("classes.httpx.AsyncClient", return_value=mock_httpx_client_instance):
+            first = await temp_library.add_book_from_api("9780123456786")
+            second = await temp_library.add_book_from_api("9780451524935")
+        assert first.author == second.author == "Detailed Author Name"
+        assert mock_httpx_client_instance.get.call_count == 3
+        assert temp_library.openlibrary.cache.hits == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,147 @@
+import gzip
+import json
+import pytest
+
+from classes import Book, Library
+from dump_import import AuthorTable, DumpImporter, main, parse_author_lines, parse_edition_lines
+
+
+def dump_line(record_type: str, key: str, data: dict) -> bytes:
+    return f"{record_type}\t{key}\t1\t2024-01-01T00:00:00\t{json.dumps(data)}\n".encode("utf-8")
+
+
+AUTHOR_LINES = [
+    dump_line("/type/author", "/authors/OL1A", {"key": "/authors/OL1A", "name": "George Orwell"}),
+    dump_line("/type/author", "/authors/OL2A", {"key": "/authors/OL2A", "name": "Reşat Nuri Güntekin"}),
+    dump_line("/type/redirect", "/authors/OL3A", {"key": "/authors/OL3A", "location": "/authors/OL1A"}),
+]
+
+EDITION_LINES = [
+    dump_line("/type/edition", "/books/OL1M", {
+        "title": "1984", "isbn_10": ["0451524934"], "authors": [{"key": "/authors/OL1A"}]}),
+    dump_line("/type/edition", "/books/OL2M", {
+        "title": "Çalıkuşu", "isbn_13": ["978-975-07-0000-2"], "authors": [{"key": "/authors/OL2A"}]}),
+    dump_line("/type/edition", "/books/OL3M", {
+        "title": "Yazarı Bilinmeyen", "isbn_13": ["9780306406157"], "authors": [{"key": "/authors/OL9A"}]}),
+    dump_line("/type/edition", "/books/OL4M", {"title": "Yazarsız", "isbn_13": ["9791000000008"]}),
+    dump_line("/type/edition", "/books/OL5M", {"title": "ISBN'siz"}),
+    dump_line("/type/edition", "/books/OL6M", {"title": "Hatalı ISBN", "isbn_13": ["9780451524936"]}),
+    b"/type/edition\t/books/OL7M\tbozuk satir\n",
+]
+
+
+@pytest.fixture
+def dumps(tmp_path):
+    authors = tmp_path / "ol_dump_authors.txt.gz"
+    editions = tmp_path / "ol_dump_editions.txt.gz"
+    with gzip.open(authors, "wb") as f:
+        f.writelines(AUTHOR_LINES)
+    with gzip.open(editions, "wb") as f:
+        f.writelines(EDITION_LINES)
+    return str(authors), str(editions)
+
+
+@pytest.fixture
+def temp_library(tmp_path):
+    return Library(str(tmp_path / "library.json"))
+
+
+def test_parse_author_lines():
+    assert parse_author_lines(AUTHOR_LINES) == [
+        ("/authors/OL1A", "George Orwell"),
+        ("/authors/OL2A", "Reşat Nuri Güntekin"),
+    ]
+
+
+def test_parse_edition_lines():
+    assert parse_edition_lines(EDITION_LINES) == [
+        ("9780451524935", "1984", ["/authors/OL1A"]),
+        ("9789750700002", "Çalıkuşu", ["/authors/OL2A"]),
+        ("9780306406157", "Yazarı Bilinmeyen", ["/authors/OL9A"]),
+        ("9791000000008", "Yazarsız", []),
+    ]
+
+
+def test_author_table_lookup(tmp_path):
+    table = AuthorTable(str(tmp_path / "authors.sqlite3"))
+    table.add_many([(f"/authors/OL{i}A", f"Yazar {i}") for i in range(1200)])
+    table.commit()
+    names = table.lookup([f"/authors/OL{i}A" for i in range(0, 1200, 2)] + ["/authors/yok"])
+    assert len(names) == 600
+    assert names["/authors/OL10A"] == "Yazar 10"
+    table.close()
+
+
+def test_import_dumps(dumps, temp_library):
+    authors, editions = dumps
+    temp_library.add_book_manual(Book("1984", "Başka Yazar", "9780451524935"))
+
+    stats = DumpImporter(temp_library, workers=2, batch_size=2).run(editions, authors)
+
+    assert stats["authors"] == 2
+    assert stats["editions"] == 4
+    assert stats["added"] == 3  # 1984 zaten kütüphanede
+    assert stats["unresolved_authors"] == 1
+    assert temp_library.find_book("9789750700002").author == "Reşat Nuri Güntekin"
+    assert temp_library.find_book("9780306406157").author == "Bilinmeyen Yazar (Detay Yok)"
+    assert temp_library.find_book("9791000000008").author == "Bilinmiyor"
+    assert temp_library.find_book("9780451524935").author == "Başka Yazar"
+    assert [b.title for b in temp_library.search_books("calikusu")] == ["Çalıkuşu"]
+
+    # Tek seferde kaydedilir ve her kitap için değişiklik günlüğüne bir kayıt eklenir
+    reloaded = Library(temp_library.data_file)
+    assert reloaded.get_book_count() == 4
+    assert [c.op for c in reloaded.changes.since(1)] == ["add"] * 3
+
+
+def test_reuse_author_db_and_limit(dumps, temp_library, tmp_path):
+    authors, editions = dumps
+    author_db = str(tmp_path / "authors.sqlite3")
+    DumpImporter(Library(str(tmp_path / "first.json")), workers=1, author_db=author_db).run(editions, authors)
+
+    stats = DumpImporter(temp_library, workers=1, author_db=author_db).run(editions, limit=2)
+    assert stats["added"] == 2
+    assert temp_library.find_book("9780451524935").author == "George Orwell"
+
+
+def test_limit_counts_only_added_books(dumps, tmp_path):
+    authors, editions = dumps
+    library = Library(str(tmp_path / "library.json"))
+    # Dökümdeki ilk baskı zaten kütüphanede; sınır yalnızca eklenen kitapları saymalı
+    library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+    stats = DumpImporter(library, workers=1).run(editions, authors, limit=2)
+    assert stats["added"] == 2
+    assert library.get_book_count() == 3
+
+
+def test_main(dumps, tmp_path, capsys):
+    authors, editions = dumps
+    data_file = str(tmp_path / "library.json")
+    main(["--editions", editions, "--authors", authors, "--data-file", data_file, "--workers", "1"])
+    assert "Eklenen kitap: 4" in capsys.readouterr().out
+    assert Library(data_file).get_book_count() == 4
+
+
+class TestBulkLoad:
+    def test_bulk_load_skips_invalid_and_duplicates(self, temp_library):
+        received = []
+        temp_library.add_change_listener(received.append)
+        added = temp_library.bulk_load(iter([
+            Book("1984", "George Orwell", "0451524934"),
+            Book("1984 (tekrar)", "George Orwell", "9780451524935"),
+            Book("Hatalı", "Yazar", "9780451524936"),
+            Book("", "Yazar", "9780306406157"),
+        ]))
+        assert added == 1
+        assert temp_library.find_book("9780451524935").title == "1984"
+        assert [c.op for c in received] == ["add"]
+        assert temp_library.fuzzy_search_books("orwel")[0][0].isbn == "9780451524935"
+
+    def test_bulk_load_compacts_change_log(self, temp_library):
+        temp_library.changes.max_entries = 2
+        books = [Book(f"Kitap {i}", "Yazar", isbn) for i, isbn in
+                 enumerate(["9780451524935", "9780306406157", "9789750700002", "9791000000008", "9780123456786"])]
+        assert temp_library.bulk_load(books) == 5
+        assert temp_library.changes.last_seq == 5
+        assert temp_library.changes.since(0) is None
+        assert len(temp_library.changes.since(temp_library.changes.first_seq - 1)) <= 3
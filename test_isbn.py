@@ -0,0 +1,40 @@
+import pytest
+
+from isbn import is_valid_isbn, isbn10_check_digit, isbn13_check_digit, normalize_isbn
+
+class TestNormalizeISBN:
+    @pytest.mark.parametrize("raw", [
+        "9780451524935",
+        "978-0451524935",
+        "978 0 451 52493 5",
+        "0451524934",
+        "0-451-52493-4",
+    ])
+    def test_formats_share_canonical_key(self, raw):
+        assert normalize_isbn(raw) == "9780451524935"
+
+    def test_isbn10_with_x_check_digit(self):
+        assert isbn10_check_digit("080442957") == "X"
+        assert normalize_isbn("080442957x") == "9780804429573"
+
+    def test_isbn13_979_prefix(self):
+        assert normalize_isbn("979-10-00000-00-8") == "9791000000008"
+
+    @pytest.mark.parametrize("raw", [
+        "",
+        "nonexistent",
+        "987456",
+        "9780451524936",   # hatalı kontrol basamağı
+        "0451524935",      # hatalı kontrol basamağı
+        "9770451524937",   # 978/979 dışı önek
+        "04515249X4",
+        "978045152493X",
+        "²451524934",      # ASCII olmayan rakam
+        "٩٧٨٠٤٥١٥٢٤٩٣٥",   # Arapça-Hint rakamları
+    ])
+    def test_invalid_inputs(self, raw):
+        assert normalize_isbn(raw) is None
+        assert not is_valid_isbn(raw)
+
+    def test_isbn13_check_digit(self):
+        assert isbn13_check_digit("978030640615") == "7"
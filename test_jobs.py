@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import pytest
+from unittest.mock import AsyncMock
+
+from classes import Book
+from jobs import ImportJob, ImportJobQueue
+from openlibrary import CircuitOpenError, OpenLibraryClient
+
+
+class FakeLibrary:
+    """add_book_from_api çağrılarını taklit eden, ağa çıkmayan kütüphane."""
+    def __init__(self, result=None, reset_timeout=30.0):
+        self.openlibrary = OpenLibraryClient(failure_threshold=1, reset_timeout=reset_timeout)
+        self.add_book_from_api = AsyncMock(return_value=result)
+
+
+@pytest.fixture
+def jobs_file(tmp_path):
+    return str(tmp_path / "jobs.jsonl")
+
+
+async def wait_finished(queue, job, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not job.finished:
+        assert loop.time() < deadline, "iş zamanında tamamlanmadı"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_and_succeed(jobs_file):
+    library = FakeLibrary(Book("1984", "George Orwell", "9780451524935"))
+    queue = ImportJobQueue(library, jobs_file, workers=2)
+    await queue.start()
+
+    job = queue.enqueue("978-0-451-52493-5")
+    assert job.isbn == "9780451524935"
+    await wait_finished(queue, job)
+    await queue.stop()
+
+    assert job.status == ImportJob.SUCCEEDED
+    assert job.attempts == 1
+    assert job.book == {"title": "1984", "author": "George Orwell", "isbn": "9780451524935"}
+    library.add_book_from_api.assert_awaited_once_with("9780451524935")
+
+
+@pytest.mark.asyncio
+async def test_failed_import(jobs_file):
+    library = FakeLibrary(None)
+    queue = ImportJobQueue(library, jobs_file)
+    job = queue.enqueue("9780451524935")
+    await wait_finished(queue, job)
+    await queue.stop()
+
+    assert job.status == ImportJob.FAILED
+    assert job.error
+
+
+@pytest.mark.asyncio
+async def test_unexpected_exception_does_not_kill_worker(jobs_file):
+    library = FakeLibrary()
+    library.add_book_from_api.side_effect = [RuntimeError("boom"), Book("A", "B", "9780306406157")]
+    queue = ImportJobQueue(library, jobs_file, workers=1)
+    first = queue.enqueue("9780451524935")
+    second = queue.enqueue("9780306406157")
+    await wait_finished(queue, second)
+    await queue.stop()
+
+    assert first.status == ImportJob.FAILED
+    assert second.status == ImportJob.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_duplicate_pending_isbn_returns_same_job(jobs_file):
+    library = FakeLibrary(None)
+    queue = ImportJobQueue(library, jobs_file)
+    first = queue.enqueue("9780451524935")
+    second = queue.enqueue("0451524934")
+    assert first is second
+    assert queue.position(first) == 1
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_queue_full_returns_none(jobs_file):
+    queue = ImportJobQueue(FakeLibrary(None), jobs_file, max_pending=1)
+    assert queue.enqueue("9780451524935") is not None
+    assert queue.enqueue("9780306406157") is None
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_circuit_open_requeues_job(jobs_file):
+    library = FakeLibrary(None, reset_timeout=0.05)
+    queue = ImportJobQueue(library, jobs_file, max_attempts=3, min_retry_delay=0.01)
+
+    async def open_circuit(isbn):
+        library.openlibrary.breaker.record_failure()
+        raise CircuitOpenError(library.openlibrary.breaker.retry_after())
+    library.add_book_from_api.side_effect = open_circuit
+
+    job = queue.enqueue("9780451524935")
+    await wait_finished(queue, job)
+    await queue.stop()
+
+    # Her denemede devre açık kaldığı için iş max_attempts kez denenip başarısız olur
+    assert job.attempts == 3
+    assert job.status == ImportJob.FAILED
+
+
+@pytest.mark.asyncio
+async def test_jobs_waiting_for_half_open_probe_are_retried(jobs_file):
+    library = FakeLibrary(reset_timeout=0.01)
+    breaker = library.openlibrary.breaker
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    async def add_book(isbn):
+        # Yarı açık devrede tek deneme isteğine izin verilir; diğerleri CircuitOpenError(0) alır
+        if not breaker.allow_request():
+            raise CircuitOpenError(breaker.retry_after())
+        await asyncio.sleep(0.05)
+        breaker.record_success()
+        return Book("Kitap", "Yazar", isbn)
+    library.add_book_from_api.side_effect = add_book
+
+    queue = ImportJobQueue(library, jobs_file, workers=4, min_retry_delay=0.01)
+    jobs = [queue.enqueue(isbn) for isbn in
+            ("9780451524935", "9780306406157", "9789750700002", "9780140449136")]
+    for job in jobs:
+        await wait_finished(queue, job)
+    await queue.stop()
+
+    assert [job.status for job in jobs] == [ImportJob.SUCCEEDED] * 4
+
+
+def test_jobs_persist_and_running_jobs_are_requeued(jobs_file):
+    queued = ImportJob("9780451524935")
+    running = ImportJob("9780306406157", status=ImportJob.RUNNING)
+    done = ImportJob("9789750700002", status=ImportJob.SUCCEEDED)
+    # Eski biçimdeki jobs.json (tek JSON dizisi) okunur ve günlük biçimine taşınır
+    legacy_file = jobs_file[:-1]
+    with open(legacy_file, "w", encoding="utf-8") as f:
+        json.dump([queued.to_dict(), running.to_dict(), done.to_dict()], f, indent=4)
+
+    queue = ImportJobQueue(FakeLibrary(), jobs_file)
+    assert queue.get(queued.id).status == ImportJob.QUEUED
+    assert queue.get(running.id).status == ImportJob.QUEUED
+    assert queue.get(done.id).status == ImportJob.SUCCEEDED
+    assert queue.pending_count() == 2
+    with open(jobs_file, encoding="utf-8") as f:
+        assert [json.loads(line)["id"] for line in f] == [queued.id, running.id, done.id]
+
+
+def test_default_journal_is_next_to_data_file(tmp_path, monkeypatch):
+    library = FakeLibrary()
+    library.data_file = str(tmp_path / "library.json")
+    # Önceki sürümün veri dosyasıyla aynı dizindeki jobs.jsonl günlüğü taşınır
+    legacy = ImportJob("9780451524935")
+    (tmp_path / "jobs.jsonl").write_text(json.dumps(legacy.to_dict()) + "\n", encoding="utf-8")
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    queue = ImportJobQueue(library)
+    assert queue.jobs_file == f"{library.data_file}.jobs.jsonl"
+    assert queue.get(legacy.id).status == ImportJob.QUEUED
+    assert os.path.exists(queue.jobs_file)
+    assert os.listdir(elsewhere) == []
+
+
+@pytest.mark.asyncio
+async def test_journal_appends_and_replays(jobs_file):
+    library = FakeLibrary(Book("1984", "George Orwell", "9780451524935"))
+    queue = ImportJobQueue(library, jobs_file, workers=1, max_finished=1)
+    first = queue.enqueue("9780451524935")
+    await wait_finished(queue, first)
+    second = queue.enqueue("9780306406157")
+    await wait_finished(queue, second)
+    await queue.stop()
+
+    # Her durum değişikliği günlüğe tek satır olarak eklenir; budanan iş silme kaydıyla işaretlenir
+    reloaded = ImportJobQueue(library, jobs_file)
+    assert reloaded.get(first.id) is None
+    assert reloaded.get(second.id).status == ImportJob.SUCCEEDED
+    assert reloaded.pending_count() == 0
+
+
+def test_journal_is_compacted(jobs_file):
+    queue = ImportJobQueue(FakeLibrary(), jobs_file)
+    job = ImportJob("9780451524935")
+    queue._jobs[job.id] = job
+    for _ in range(1500):
+        queue._append([job.to_dict()])
+    with open(jobs_file, encoding="utf-8") as f:
+        assert len(f.readlines()) < 1000
+    assert ImportJobQueue(FakeLibrary(), jobs_file).get(job.id) is not None
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_pending_jobs(jobs_file):
+    library = FakeLibrary(Book("1984", "George Orwell", "9780451524935"))
+    job = ImportJob("9780451524935")
+    with open(jobs_file, "w", encoding="utf-8") as f:
+        f.write(json.dumps(job.to_dict()) + "\n")
+
+    queue = ImportJobQueue(library, jobs_file)
+    await queue.start()
+    resumed = queue.get(job.id)
+    await wait_finished(queue, resumed)
+    await queue.stop()
+
+    assert resumed.status == ImportJob.SUCCEEDED
+    with open(jobs_file, encoding="utf-8") as f:
+        assert json.loads(f.readlines()[-1])["status"] == ImportJob.SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_pruned(jobs_file):
+    queue = ImportJobQueue(FakeLibrary(None), jobs_file, workers=1, max_finished=2)
+    jobs = [queue.enqueue(isbn) for isbn in ("9780451524935", "9780306406157", "9789750700002")]
+    await wait_finished(queue, jobs[-1])
+    await queue.stop()
+
+    assert queue.get(jobs[0].id) is None
+    assert queue.get(jobs[2].id) is not None
+
+
+def test_corrupt_jobs_file(jobs_file):
+    with open(jobs_file, "w", encoding="utf-8") as f:
+        f.write("{bozuk")
+    queue = ImportJobQueue(FakeLibrary(), jobs_file)
+    assert queue.pending_count() == 0
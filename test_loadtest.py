@@ -0,0 +1,79 @@
+import json
+import os
+import pytest
+import random
+import socket
+
+import api
+from api import library
+from jobs import ImportJob, ImportJobQueue
+from loadtest import LoadReport, parse_mix, random_isbn13, run
+
+class TestLoadTestHelpers:
+    def test_random_isbn13_checksum(self):
+        rng = random.Random(42)
+        for _ in range(20):
+            isbn = random_isbn13(rng)
+            assert len(isbn) == 13 and isbn.startswith("978")
+            total = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(isbn))
+            assert total % 10 == 0
+
+    def test_parse_mix(self):
+        mix = parse_mix("get=60, post=40")
+        assert mix == {"get": 60, "post": 40, "delete": 0, "search": 0}
+
+    def test_parse_mix_invalid(self):
+        with pytest.raises(ValueError):
+            parse_mix("get=1,patch=2")
+        with pytest.raises(ValueError):
+            parse_mix("get=0")
+
+    def test_percentile(self):
+        values = [i / 1000 for i in range(1, 101)]
+        assert LoadReport.percentile(values, 50) == 0.05
+        assert LoadReport.percentile(values, 99) == 0.099
+        assert LoadReport.percentile([], 50) == 0.0
+
+class TestLoadRun:
+    @pytest.mark.asyncio
+    async def test_in_process_run(self):
+        original_data_file = library.data_file
+        report = await run(mode="inprocess", concurrency=4, duration=0.3, latency=0.001,
+                           not_found_ratio=0.2, seed_books=20, seed=1)
+        summary = report.summary()
+        assert summary["total"]["count"] > 0
+        assert summary["total"]["errors"] == 0
+        assert set(summary) - {"elapsed_s", "total"} <= {"get", "post", "delete", "search"}
+        # Geçici veri dosyası test sonunda geri alınmalı
+        assert library.data_file == original_data_file
+        assert library.transport is None
+
+    @pytest.mark.asyncio
+    async def test_upstream_errors_are_retried(self):
+        original_openlibrary = library.openlibrary
+        report = await run(mode="inprocess", mix={"post": 1}, concurrency=2, duration=0.3,
+                           latency=0.0, error_ratio=0.3, upstream_rate=1000, seed=2)
+        assert report.summary()["post"]["count"] > 0
+        assert library.openlibrary is original_openlibrary
+
+    @pytest.mark.asyncio
+    async def test_uvicorn_run_leaves_import_queue_alone(self, tmp_path, monkeypatch):
+        # Gerçek kuyrukta bekleyen iş, uvicorn modunda başlayan işçilerce sahte sunucuya karşı çalıştırılmamalı
+        monkeypatch.chdir(tmp_path)
+        jobs_file = str(tmp_path / "jobs.jsonl")
+        job = ImportJob("9780451524935")
+        with open(jobs_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(job.to_dict()) + "\n")
+        queue = ImportJobQueue(library, jobs_file)
+        monkeypatch.setattr(api, "import_queue", queue)
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        report = await run(mode="uvicorn", mix={"get": 1}, concurrency=2, duration=0.2, latency=0.0,
+                           seed_books=5, port=port, seed=3)
+        assert report.summary()["total"]["count"] > 0
+        assert api.import_queue is queue
+        assert queue.get(job.id).status == ImportJob.QUEUED
+        assert ImportJobQueue(library, jobs_file).get(job.id).status == ImportJob.QUEUED
+        assert os.listdir(tmp_path) == ["jobs.jsonl"]
@@ -0,0 +1,152 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import main
+from classes import Book, Library
+
+
+@pytest.fixture
+def data_file(tmp_path, capsys):
+    path = str(tmp_path / "library.json")
+    library = Library(path)
+    library.add_book_manual(Book("1984", "George Orwell", "9780451524935"))
+    library.add_book_manual(Book("Çalıkuşu", "Reşat Nuri Güntekin", "9789750700002"))
+    capsys.readouterr()
+    return path
+
+
+def run(capsys, *argv):
+    code = main.cli(list(argv))
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+
+def test_list_json(capsys, data_file):
+    code, out, err = run(capsys, "--data-file", data_file, "list")
+    assert code == 0
+    assert [book["isbn"] for book in json.loads(out)] == ["9780451524935", "9789750700002"]
+
+
+def test_list_csv(capsys, data_file):
+    code, out, _ = run(capsys, "--data-file", data_file, "list", "--format", "csv")
+    assert out.splitlines()[0] == "title,author,isbn"
+    assert out.splitlines()[2] == "Çalıkuşu,Reşat Nuri Güntekin,9789750700002"
+
+
+def test_search_messages_go_to_stderr(capsys, data_file):
+    code, out, err = run(capsys, "--data-file", data_file, "search", "CALIKUSU", "--format", "jsonl")
+    assert code == 0
+    assert json.loads(out)["title"] == "Çalıkuşu"
+    assert "Çalıkuşu" in err  # Library'nin sonuç mesajı stdout'taki JSON'u bozmaz
+
+
+def test_search_fuzzy_quiet(capsys, data_file):
+    code, out, err = run(capsys, "--data-file", data_file, "-q", "search", "goerge orwel", "--fuzzy")
+    results = json.loads(out)
+    assert results[0]["isbn"] == "9780451524935"
+    assert 0 < results[0]["score"] <= 1
+    assert err == ""
+
+
+def test_add_manual_and_remove(capsys, data_file):
+    code, out, _ = run(capsys, "--data-file", data_file, "add", "0306406152", "--title", "Kitap", "--author", "Yazar")
+    assert code == 0
+    assert json.loads(out)[0]["book"]["isbn"] == "9780306406157"
+
+    code, out, _ = run(capsys, "--data-file", data_file, "remove", "9780306406157", "9791000000008")
+    assert code == 1
+    assert [r["status"] for r in json.loads(out)] == ["removed", "not_found"]
+
+
+def test_add_from_api(capsys, data_file):
+    with patch.object(Library, "add_book_from_api", new_callable=AsyncMock) as add_book_from_api:
+        add_book_from_api.side_effect = [Book("A", "B", "9780306406157"), None]
+        code, out, _ = run(capsys, "--data-file", data_file, "add", "9780306406157", "9791000000008")
+    assert code == 1
+    assert [r["status"] for r in json.loads(out)] == ["added", "failed"]
+
+
+def test_export_import_roundtrip(capsys, data_file, tmp_path):
+    exported = str(tmp_path / "books.jsonl")
+    assert run(capsys, "--data-file", data_file, "export", "-o", exported)[0] == 0
+    with open(exported, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+    target = str(tmp_path / "copy.json")
+    code, out, _ = run(capsys, "--data-file", target, "import", exported)
+    assert code == 0
+    assert json.loads(out) == {"added": 2, "skipped": 0}
+    assert Library(target).get_book_count() == 2
+
+
+@pytest.mark.parametrize("name, content", [
+    ("books.json", '[{"title": "A", "author": "B", "isbn": "9780306406157"'),
+    ("books.jsonl", '{"title": "A", "author": "B", "isbn": "9780306406157"}\n{"title": \n'),
+    ("books.csv", 'title,author,isbn\n"A,B,9780306406157\n'),
+    ("isbns.txt", None),
+])
+def test_import_unreadable_file(capsys, data_file, tmp_path, name, content):
+    path = tmp_path / name
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    code, out, err = run(capsys, "--data-file", data_file, "import", str(path))
+    assert code == 2
+    assert out == ""
+    assert len(err.strip().splitlines()) == 1 and err.startswith("Hata:")
+    assert Library(data_file).get_book_count() == 2
+
+
+@pytest.mark.parametrize("target", ["yok/books.json", "dizin"])
+def test_export_unwritable_file(capsys, data_file, tmp_path, target):
+    (tmp_path / "dizin").mkdir()
+    path = str(tmp_path / target)
+    code, out, err = run(capsys, "--data-file", data_file, "export", "-o", path)
+    assert code == 2
+    assert out == ""
+    assert len(err.strip().splitlines()) == 1 and err.startswith("Hata:")
+    # Yarım kalan geçici dosya silinmeli
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_interactive_menu_uses_shards(data_file):
+    with patch.object(main, "main", new_callable=AsyncMock) as menu:
+        assert main.cli(["--data-file", data_file, "--shards", "4"]) == 0
+    menu.assert_awaited_once_with(data_file, 4)
+
+
+def test_import_isbn_list(capsys, data_file, tmp_path):
+    isbns = tmp_path / "isbns.txt"
+    isbns.write_text("# yorum\n9780306406157\n\n", encoding="utf-8")
+    with patch.object(Library, "add_book_from_api", new_callable=AsyncMock) as add_book_from_api:
+        add_book_from_api.return_value = Book("A", "B", "9780306406157")
+        code, out, _ = run(capsys, "--data-file", data_file, "import", str(isbns))
+    assert code == 0
+    assert json.loads(out) == {"added": 1, "failed": 0}
+    add_book_from_api.assert_awaited_once_with("9780306406157")
+
+
+def test_stats(capsys, data_file):
+    code, out, _ = run(capsys, "--data-file", data_file, "stats", "--top", "1")
+    stats = json.loads(out)
+    assert stats["books"] == 2
+    assert stats["authors"] == 2
+    assert len(stats["top_authors"]) == 1
+
+
+def test_shards_converts_layout(capsys, data_file):
+    code, out, _ = run(capsys, "--data-file", data_file, "--shards", "4", "stats")
+    assert code == 0 and json.loads(out)["books"] == 2
+    assert os.path.isdir(f"{data_file}.shards")
+    code, out, _ = run(capsys, "--data-file", data_file, "list")
+    assert [book["isbn"] for book in json.loads(out)] == ["9780451524935", "9789750700002"]
+
+
+def test_local_commands_do_not_import_httpx():
+    code = "import sys, main; main.cli(['--data-file', 'yok.json', '-q', 'stats']); print('httpx' in sys.modules, 'asyncio' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(main.__file__)))
+    assert result.stdout.strip().splitlines()[-1] == "False False"
@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import pytest
+from unittest import mock
+from unittest.mock import AsyncMock, patch
+import httpx
+
+from openlibrary import CircuitBreaker, CircuitOpenError, LookupCache, OpenLibraryClient, RateLimiter
+
+def make_response(status_code, headers=None):
+    response = mock.Mock()
+    response.status_code = status_code
+    response.is_success = 200 <= status_code < 300
+    response.headers = headers or {}
+    return response
+
+class TestRateLimiter:
+    def test_burst_then_wait(self):
+        limiter = RateLimiter(rate=10, burst=2)
+        with patch("openlibrary.time.monotonic", return_value=100.0):
+            limiter._updated = 100.0
+            assert limiter.reserve() == 0
+            assert limiter.reserve() == 0
+            assert limiter.reserve() == pytest.approx(0.1)
+            assert limiter.reserve() == pytest.approx(0.2)
+
+    def test_pause(self):
+        limiter = RateLimiter(rate=10, burst=5)
+        with patch("openlibrary.time.monotonic", return_value=100.0):
+            limiter._updated = 100.0
+            limiter.pause(2.0)
+            assert limiter.reserve() == pytest.approx(2.1)
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        with patch("openlibrary.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.OPEN
+            assert not breaker.allow_request()
+            assert breaker.retry_after() == 30
+        with patch("openlibrary.time.monotonic", return_value=31.0):
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request()
+            # Yarı açık durumda yalnızca tek bir deneme isteğine izin verilir
+            assert not breaker.allow_request()
+            breaker.record_success()
+            assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with patch("openlibrary.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+        with patch("openlibrary.time.monotonic", return_value=11.0):
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state == CircuitBreaker.OPEN
+
+    def test_allow_request_reports_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        assert breaker.allow_request() == CircuitBreaker.CLOSED
+        with patch("openlibrary.time.monotonic", return_value=0.0):
+            breaker.record_failure()
+            assert breaker.allow_request() is None
+        with patch("openlibrary.time.monotonic", return_value=11.0):
+            assert breaker.allow_request() == CircuitBreaker.HALF_OPEN
+            # Devre kapalıyken kabul edilmiş bir isteğin hatası deneme hakkını bırakmaz
+            breaker.record_failure(probe=False)
+        with patch("openlibrary.time.monotonic", return_value=22.0):
+            assert breaker.allow_request() is None
+
+class TestLookupCache:
+    def test_negative_entries_expire_first(self):
+        cache = LookupCache(maxsize=10, ttl=100, negative_ttl=10)
+        with patch("openlibrary.time.monotonic", return_value=0.0):
+            cache.put("/authors/OL1A", "George Orwell")
+            cache.put_negative("/isbn/9780123456786", "bulunamadı")
+            assert cache.get("/authors/OL1A") == (False, "George Orwell")
+            assert cache.get("/isbn/9780123456786") == (True, "bulunamadı")
+        with patch("openlibrary.time.monotonic", return_value=10.0):
+            assert cache.get("/isbn/9780123456786") is None
+            assert cache.get("/authors/OL1A") == (False, "George Orwell")
+        stats = cache.stats()
+        assert (stats["hits"], stats["negative_hits"], stats["misses"], stats["expirations"]) == (2, 1, 1, 1)
+        assert stats["size"] == 1 and stats["negative_size"] == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = LookupCache(maxsize=2)
+        cache.put_negative("a", "1")
+        cache.put_negative("b", "2")
+        cache.get("a")
+        cache.put_negative("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == (True, "1")
+        assert len(cache) == 2 and cache.evictions == 1
+
+    def test_disabled(self):
+        cache = LookupCache(maxsize=0)
+        cache.put_negative("a", "1")
+        assert cache.get("a") is None
+
+class TestOpenLibraryClient:
+    @pytest.fixture
+    def client(self):
+        return OpenLibraryClient(rate=1000, burst=1000, max_attempts=3, failure_threshold=3)
+
+    @pytest.mark.asyncio
+    async def test_retries_retryable_status(self, client):
+        http = AsyncMock()
+        http.get.side_effect = [make_response(503), make_response(200)]
+        with patch("openlibrary.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            response = await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert response.status_code == 200
+        assert http.get.call_count == 2
+        sleep.assert_awaited_once()
+        assert client.breaker.failures == 0
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_not_found(self, client):
+        http = AsyncMock()
+        http.get.return_value = make_response(404)
+        response = await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert response.status_code == 404
+        assert http.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_limiter(self, client):
+        http = AsyncMock()
+        http.get.side_effect = [make_response(429, {"Retry-After": "2"}), make_response(200)]
+        with patch.object(client.limiter, "pause") as pause, \
+             patch("openlibrary.asyncio.sleep", new_callable=AsyncMock):
+            response = await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert response.status_code == 200
+        pause.assert_called_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_network_errors_exhaust_attempts(self, client):
+        http = AsyncMock()
+        http.get.side_effect = httpx.ConnectError("boom")
+        with patch("openlibrary.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(httpx.RequestError):
+                await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert http.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_circuit_open_fails_fast(self, client):
+        http = AsyncMock()
+        http.get.side_effect = httpx.ConnectError("boom")
+        with patch("openlibrary.asyncio.sleep", new_callable=AsyncMock):
+            with pytest.raises(httpx.RequestError):
+                await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        http.get.reset_mock()
+        with pytest.raises(CircuitOpenError):
+            await client.get(http, "https://openlibrary.org/isbn/x.json")
+        http.get.assert_not_called()
+
+    @staticmethod
+    def half_open(client):
+        client.breaker._state = CircuitBreaker.OPEN
+        client.breaker._opened_at = time.monotonic() - client.breaker.reset_timeout - 1
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_slot(self, client):
+        self.half_open(client)
+        http = AsyncMock()
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        http.get.side_effect = slow_get
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.get(http, "https://openlibrary.org/isbn/x.json"), 0.05)
+
+        # Deneme iptal edildi; sıradaki istek yeni deneme isteği olarak gönderilebilmeli
+        http.get.side_effect = None
+        http.get.return_value = make_response(200)
+        response = await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert response.status_code == 200
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_releases_probe(self, client):
+        self.half_open(client)
+        http = AsyncMock()
+        http.get.side_effect = ValueError("beklenmeyen")
+        with pytest.raises(ValueError):
+            await client.get(http, "https://openlibrary.org/isbn/x.json")
+        assert client.breaker.allow_request()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_non_probe_keeps_probe_slot(self, client):
+        http = AsyncMock()
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        http.get.side_effect = slow_get
+        # Devre kapalıyken kabul edilen istek yanıt beklerken devre yarı açık hale gelir
+        request = asyncio.create_task(client.get(http, "https://openlibrary.org/isbn/x.json"))
+        while not http.get.called:
+            await asyncio.sleep(0.01)
+        self.half_open(client)
+        assert client.breaker.allow_request() == CircuitBreaker.HALF_OPEN
+
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        # Deneme hakkı hâlâ diğer isteğe ait; ikinci bir deneme isteğine izin verilmemeli
+        assert client.breaker.allow_request() is None
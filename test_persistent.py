@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from persistent import PersistentMap, PersistentVector
+
+
+class CollidingKey:
+    """Hash değeri seçilebilen anahtar; çakışma düğümlerini sınamak için kullanılır."""
+
+    def __init__(self, value, hash_value):
+        self.value = value
+        self.hash_value = hash_value
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.value == self.value
+
+
+@pytest.mark.parametrize("size", [0, 1, 32, 33, 1024, 1025, 1057, 40000])
+def test_vector_from_iterable_and_append(size):
+    vector = PersistentVector.from_iterable(range(size))
+    assert len(vector) == size
+    assert list(vector) == list(range(size))
+
+    appended = PersistentVector()
+    for i in range(size):
+        appended = appended.append(i)
+    assert list(appended) == list(range(size))
+    for i in range(0, size, max(1, size // 50)):
+        assert vector[i] == appended[i] == i
+
+
+def test_vector_versions_are_independent():
+    vector = PersistentVector.from_iterable(range(2000))
+    longer = vector
+    for i in range(2000, 3000):
+        longer = longer.append(i)
+    changed = longer.set(10, "x").set(2999, "y")
+
+    assert list(vector) == list(range(2000))
+    assert list(longer) == list(range(3000))
+    assert changed[10] == "x" and changed[2999] == "y" and changed[-1] == "y"
+    with pytest.raises(IndexError):
+        vector[2000]
+
+
+def test_map_matches_dict():
+    rnd = random.Random(1)
+    keys = [str(i) for i in range(300)] + [CollidingKey(i, i % 3) for i in range(50)]
+    current, expected = PersistentMap(), {}
+    versions = []
+    for _ in range(3000):
+        key = rnd.choice(keys)
+        if rnd.random() < 0.6:
+            value = rnd.random()
+            current = current.set(key, value)
+            expected[key] = value
+        else:
+            current = current.delete(key)
+            expected.pop(key, None)
+        versions.append((current, dict(expected)))
+
+    # Eski sürümler, sonraki değişikliklerden etkilenmeden kendi içeriklerini korur
+    for version, contents in versions[::100]:
+        assert len(version) == len(contents)
+        assert dict(version.items()) == contents
+        for key in keys:
+            assert version.get(key, "yok") == contents.get(key, "yok")
+            assert (key in version) == (key in contents)
+
+
+def test_map_from_items():
+    items = [(f"978{i:010d}", i) for i in range(5000)] + [("9780000000001", "son")]
+    mapping = PersistentMap.from_items(items)
+    assert len(mapping) == 5000
+    assert mapping["9780000000001"] == "son"
+    assert mapping.get("yok") is None
+    assert mapping.delete("yok") is mapping
+    with pytest.raises(KeyError):
+        mapping["yok"]
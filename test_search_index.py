@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from search_index import CANDIDATE_RATIO, FuzzyIndex, TrigramIndex, edit_similarity, trigrams
+
+class TestHelpers:
+    def test_trigrams_padding(self):
+        assert trigrams("ali") == {"  a", " al", "ali", "li "}
+
+    def test_edit_similarity_transposition(self):
+        assert edit_similarity("goerge", "george") == pytest.approx(1 - 1 / 6)
+        assert edit_similarity("kafka", "kafka") == 1.0
+        assert edit_similarity("", "kafka") == 0.0
+
+    def test_edit_similarity_above(self):
+        # Eşiği geçemeyecek benzerlik hesaplanmaz; geçebilecek olan aynen döner
+        assert edit_similarity("goerge", "george", above=0.5) == pytest.approx(1 - 1 / 6)
+        assert edit_similarity("kafka", "orwell", above=0.5) == 0.0
+
+class TestTrigramIndex:
+    def test_similar_words(self):
+        index = TrigramIndex()
+        for word in ["orwell", "owen", "orhan", "tolstoy"]:
+            index.add(word)
+        results = index.similar("orwel")
+        assert results[0][0] == "orwell"
+        assert all(word != "tolstoy" for word, _ in results)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(2)
+        words = {"".join(rng.choice("abcde") for _ in range(rng.randint(1, 8))) for _ in range(3000)}
+        index = TrigramIndex()
+        for word in words:
+            index.add(word)
+        for query in ["abc", "badcead", "eeaab", "a", "dcbaedcb"]:
+            grams = trigrams(query)
+            expected = set()
+            for word in words:
+                shared = len(grams & trigrams(word))
+                dice = 2 * shared / (len(grams) + len(trigrams(word)))
+                if dice >= 0.4 * CANDIDATE_RATIO and (shared > 1 or len(grams) <= 2):
+                    if max(dice, edit_similarity(query, word)) >= 0.4:
+                        expected.add(word)
+            assert {word for word, _ in index.similar(query, limit=len(words))} == expected
+
+    def test_merge_limit_keeps_close_matches(self):
+        # "  k" ve " ka" listeleri tüm dağarcığı içerir; yalnızca doğrulamada kullanılmalı
+        rng = random.Random(3)
+        index = TrigramIndex(merge_limit=50)
+        for _ in range(2000):
+            index.add("ka" + "".join(rng.choice("lmnoprstuvyz") for _ in range(5)))
+        index.add("kafkaesk")
+        assert index.similar("kafkasek")[0][0] == "kafkaesk"
+
+    def test_remove_word(self):
+        index = TrigramIndex()
+        index.add("orwell")
+        index.remove("orwell")
+        assert "orwell" not in index
+        assert index.similar("orwell") == []
+
+class TestFuzzyIndex:
+    @pytest.fixture
+    def index(self):
+        index = FuzzyIndex()
+        index.add("1", "Animal Farm George Orwell")
+        index.add("2", "Nineteen Eighty-Four George Orwell")
+        index.add("3", "Murder on the Orient Express Agatha Christie")
+        index.add("4", "Kuyucaklı Yusuf Sabahattin Ali")
+        return index
+
+    def test_misspelled_author(self, index):
+        results = index.search("goerge orwel")
+        assert {key for key, _ in results[:2]} == {"1", "2"}
+        # Eşit puanda daha kısa kayıt önce gelir
+        assert results[0][0] == "1"
+        assert results[0][1] > 0.7
+
+    def test_limit_and_order(self, index):
+        results = index.search("agata christi", limit=1)
+        assert len(results) == 1
+        assert results[0][0] == "3"
+
+    def test_min_score_filters(self, index):
+        assert index.search("zzzz qqqq") == []
+        assert index.search("sabahatin", min_score=0.99) == []
+
+    def test_incremental_remove(self, index):
+        assert index.remove("4")
+        assert not index.remove("4")
+        assert index.search("sabahattin ali") == []
+        # Artık hiçbir belgede geçmeyen kelimeler dağarcıktan da silinmeli
+        assert "sabahattin" not in index._vocabulary
+
+    def test_readd_replaces_text(self, index):
+        index.add("1", "Homage to Catalonia George Orwell")
+        results = dict(index.search("catalonia"))
+        assert "1" in results
+        assert index.search("animal farm", min_score=0.9) == []
+
+    def test_rare_words_outweigh_common_words(self):
+        index = FuzzyIndex()
+        for i in range(50):
+            index.add(f"the-{i}", f"The {i}")
+        index.add("orwell", "Down and Out Orwell")
+        results = index.search("the orwell", limit=3)
+        assert results[0][0] == "orwell"
+
+    def test_bucket_limit(self):
+        index = FuzzyIndex(bucket_limit=5)
+        for i in range(100):
+            index.add(str(i), f"the book {i}")
+        results = index.search("the", limit=3)
+        assert len(results) == 3
+        assert all(score == 1.0 for _, score in results)
+
+class CountingDict(dict):
+    """Okunan anahtar sayısını tutan sözlük; aramada puanlanan belge sayısını ölçmek için."""
+    reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return super().__getitem__(key)
+
+
+class TestFuzzyIndexPerformance:
+    COMMON = ["the", "a", "of", "and", "in", "history", "to", "new", "life", "world"]
+
+    @pytest.fixture(scope="class")
+    def large_index(self):
+        # Başlık kelimelerinin yaklaşık %40'ı yaygın kelimelerden oluşan sentetik katalog
+        rng = random.Random(1)
+        letters = "abcdefghijklmnoprstuvyz"
+        rare = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(10000)]
+        index = FuzzyIndex()
+        for i in range(60000):
+            words = [rng.choice(self.COMMON) if rng.random() < 0.4 else rng.choice(rare)
+                     for _ in range(rng.randint(2, 6))]
+            index.add(str(i), " ".join(words))
+        return index
+
+    @pytest.mark.parametrize("query", ["the", "a", "the history", "histroy of the"])
+    def test_common_word_queries_score_few_documents(self, large_index, query):
+        documents = large_index._documents
+        large_index._documents = counting = CountingDict(documents)
+        try:
+            results = large_index.search(query)
+        finally:
+            large_index._documents = documents
+        assert results
+        # Yaygın kelimelerin tüm belge listesi gezilmez; puanlanan belge sayısı katalog boyutuyla artmaz
+        assert counting.reads <= large_index.bucket_limit
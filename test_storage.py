@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+from storage import read_manifest, read_shard, read_shards, shard_dir, shard_of, shard_path, write_shards
+from textfold import FOLD_VERSION
+
+
+def record(order, isbn, title="Kitap", author="Yazar"):
+    return {"title": title, "author": author, "isbn": isbn, "order": order,
+            "search_key": f"{title.lower()}\n{author.lower()}", "search_key_version": FOLD_VERSION}
+
+
+def test_shard_of_is_stable():
+    # CRC32 tabanlı olduğu için çalıştırmalar arasında değişmez
+    assert shard_of("9780451524935", 16) == 12
+    assert {shard_of(f"97800000{i:05d}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_write_and_read_shards(tmp_path):
+    directory = str(tmp_path / "library.json.shards")
+    assert write_shards(directory, 2, {0: [record(2, "B"), record(0, "A")], 1: [record(1, "C")]}) == True
+    assert read_manifest(directory) == 2
+    assert os.path.exists(shard_path(directory, 0)) and os.path.exists(shard_path(directory, 1))
+
+    records, outdated, errors = read_shards(directory, 2)
+    assert [r[0] for r in records] == [0, 1, 2]
+    assert [r[3] for r in records] == ["A", "C", "B"]
+    assert outdated == 0 and errors == []
+
+
+def test_read_shards_in_process_pool(tmp_path):
+    directory = str(tmp_path / "shards")
+    contents = {i: [record(j, f"{j}") for j in range(i, 40, 4)] for i in range(4)}
+    write_shards(directory, 4, contents)
+    records, _, errors = read_shards(directory, 4, workers=2, min_bytes=0)
+    assert [r[0] for r in records] == list(range(40))
+    assert errors == []
+
+
+
+def test_serial_read_does_not_import_process_pool(tmp_path):
+    directory = str(tmp_path / "shards")
+    write_shards(directory, 2, {0: [record(0, "A")], 1: [record(1, "B")]})
+    code = ("import sys, storage; storage.read_shards(sys.argv[1], 2); "
+            "print('concurrent.futures' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code, directory], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.stdout.strip() == "False"
+
+def test_write_shards_only_given_shards(tmp_path):
+    directory = str(tmp_path / "shards")
+    write_shards(directory, 2, {0: [record(0, "A")], 1: [record(1, "B")]})
+    write_shards(directory, 2, {1: []})
+    records, _, _ = read_shards(directory, 2)
+    assert [r[3] for r in records] == ["A"]
+
+
+def test_read_shard_outdated_and_errors(tmp_path):
+    path = tmp_path / "000.json"
+    path.write_text(json.dumps([{"title": "Çalıkuşu", "author": "Reşat Nuri", "isbn": "X", "order": 0}]), encoding="utf-8")
+    records, outdated, error = read_shard(str(path))
+    assert records[0][4] == "calikusu\nresat nuri"
+    assert outdated == 1 and error is None
+
+    path.write_text("bozuk", encoding="utf-8")
+    records, outdated, error = read_shard(str(path))
+    assert records == [] and "okunamadı" in error
+    assert read_shard(str(tmp_path / "yok.json")) == ([], 0, None)
+
+
+def test_shard_dir():
+    assert shard_dir("library.json") == "library.json.shards"
@@ -0,0 +1,21 @@
+import pytest
+
+from textfold import fold
+
+class TestFold:
+    @pytest.mark.parametrize("text", ["İSTANBUL", "İstanbul", "Istanbul", "ıstanbul", "istanbul"])
+    def test_turkish_dotted_and_dotless_i(self, text):
+        assert fold(text) == "istanbul"
+
+    def test_turkish_letters_and_accents(self):
+        assert fold("Çalıkuşu") == "calikusu"
+        assert fold("ŞEKER PORTAKALI") == "seker portakali"
+        assert fold("Gabriel García Márquez") == "gabriel garcia marquez"
+
+    def test_no_combining_dot_left(self):
+        assert "̇" not in fold("İ")
+        assert len(fold("İ")) == 1
+
+    def test_idempotent(self):
+        text = "Kuyucaklı Yusuf — Sabahattin Ali"
+        assert fold(fold(text)) == fold(text)
@@ -0,0 +1,29 @@
+import unicodedata
+
+# Anahtar üretim kuralları değiştiğinde artırılır; kayıtlı anahtarı eski sürümde
+# olan kitapların anahtarları yüklenirken yeniden hesaplanır.
+FOLD_VERSION = 1
+
+# Türkçe noktalı/noktasız i harfleri. Python'un .lower() metodu "İ" harfini
+# "i" + birleşik nokta (U+0307) yapar ve "I" harfini Türkçe kurala aykırı olarak
+# "i" yapar. Aramada Türkçe ve Türkçe olmayan yazımların birbirini bulabilmesi
+# için dört harf de düz "i" harfine indirgenir.
+_TURKISH_I = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+
+
+def fold(text: str) -> str:
+    """
+    Metni aramada karşılaştırılacak normalleştirilmiş biçime çevirir.
+    Türkçe i/ı/İ/I harfleri "i" yapılır, büyük/küçük harf farkı kaldırılır
+    (casefold) ve aksan/çengel işaretleri atılır; böylece "İSTANBUL", "istanbul"
+    ve "Istanbul" ile "Çalıkuşu" ve "calikusu" birbirine eşlenir.
+    Args:
+        text (str): Normalleştirilecek metin.
+    Returns:
+        str: Normalleştirilmiş metin.
+    """
+    text = text.translate(_TURKISH_I).casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))